@@ -8,24 +8,89 @@ repository organization for scalable collaboration.
 """
 
 import argparse
+import hashlib
+import io
 import json
 import os
+import signal
+import socket
+import socketserver
+import sqlite3
+import stat
+import struct
+import sys
+import tempfile
+import threading
 import time
-import yaml
 from collections import defaultdict
 from dataclasses import dataclass, asdict, field
+from enum import IntEnum
 from pathlib import Path
-from typing import Dict, List, Optional, Set, Union, Any, Tuple
+from typing import Dict, FrozenSet, Iterator, List, Optional, Set, Union, Any, Tuple
 import logging
 
 # Local imports
-from .bsr_auth import BSRAuthenticator, BSRCredentials, BSRAuthenticationError
-from .bsr_client import BSRClient, BSRClientError
+from .bsr_auth import BSRAuthenticator
 
 # Configure logging
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
+def _load_yaml(stream) -> Any:
+    """Parse YAML, preferring the libyaml C bindings when available."""
+    # PyYAML is imported on demand: warm runs load the registry from the
+    # SQLite cache and never need it
+    import yaml
+    return yaml.load(stream, Loader=getattr(yaml, "CSafeLoader", yaml.SafeLoader))
+
+
+def _dump_yaml(data: Any, stream) -> None:
+    """Serialize YAML, preferring the libyaml C bindings when available."""
+    import yaml
+    yaml.dump(
+        data, stream,
+        Dumper=getattr(yaml, "CSafeDumper", yaml.SafeDumper),
+        default_flow_style=False,
+        indent=2
+    )
+
+
+def _replacement_mode(path: Path) -> int:
+    """
+    Return the permission bits a file replacing path should get.
+    
+    An existing file keeps its mode; a new one gets the mode open() would
+    give it under the current umask. mkstemp files start out as 0600.
+    """
+    try:
+        return os.stat(path).st_mode & 0o7777
+    except FileNotFoundError:
+        umask = os.umask(0)
+        os.umask(umask)
+        return 0o666 & ~umask
+
+
+class AccessLevel(IntEnum):
+    """Ordered permission levels; an action is allowed at any level at or above its own."""
+    READ = 0
+    WRITE = 1
+    MANAGE = 2
+    ADMIN = 3
+
+    @classmethod
+    def parse(cls, name: Optional[str]) -> Optional["AccessLevel"]:
+        """Convert an action or access level name to a level, or None if unknown."""
+        return cls.__members__.get(name.upper()) if name else None
+
+
+# Level granted by each member role
+ROLE_ACCESS_LEVELS = {
+    "viewer": AccessLevel.READ,
+    "contributor": AccessLevel.WRITE,
+    "maintainer": AccessLevel.MANAGE,
+    "admin": AccessLevel.ADMIN,
+}
+
 
 @dataclass
 class TeamMember:
@@ -183,6 +248,81 @@ class TeamConfigurationError(Exception):
     pass
 
 
+class TeamsCache:
+    """
+    SQLite sidecar caching the parsed team registry.
+    
+    Entries are keyed by the registry file's modification time and size, so
+    repeat runs against an unchanged teams.yaml skip YAML parsing entirely.
+    The cache is best effort: any failure falls back to the YAML file.
+    """
+    
+    def __init__(self, db_path: Union[str, Path]):
+        self.db_path = Path(db_path)
+        self._init_database()
+    
+    def _init_database(self) -> None:
+        """Initialize the cache database in WAL mode."""
+        with sqlite3.connect(self.db_path) as conn:
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            conn.execute("""
+                CREATE TABLE IF NOT EXISTS cache_meta (
+                    key TEXT PRIMARY KEY,
+                    value TEXT NOT NULL
+                )
+            """)
+            conn.execute("""
+                CREATE TABLE IF NOT EXISTS teams (
+                    name TEXT PRIMARY KEY,
+                    data TEXT NOT NULL
+                )
+            """)
+    
+    @staticmethod
+    def stamp(path: Path) -> str:
+        """Build the freshness key for a registry file."""
+        with open(path, 'rb') as f:
+            return TeamsCache.content_stamp(os.fstat(f.fileno()), f.read())
+    
+    @staticmethod
+    def content_stamp(file_stat: os.stat_result, content: bytes) -> str:
+        """
+        Build the freshness key from a file's stat data and contents.
+        
+        The digest catches rewrites that keep the size within the
+        filesystem's timestamp granularity.
+        """
+        digest = hashlib.blake2b(content, digest_size=16).hexdigest()
+        return f"{file_stat.st_mtime_ns}:{file_stat.st_size}:{digest}"
+    
+    def load(self, stamp: str) -> Optional[Dict[str, Any]]:
+        """Return cached registry data if it matches the given stamp."""
+        with sqlite3.connect(self.db_path) as conn:
+            row = conn.execute(
+                "SELECT value FROM cache_meta WHERE key = 'stamp'"
+            ).fetchone()
+            if not row or row[0] != stamp:
+                return None
+            
+            return {
+                name: json.loads(data)
+                for name, data in conn.execute("SELECT name, data FROM teams")
+            }
+    
+    def store(self, stamp: str, teams_data: Dict[str, Any]) -> None:
+        """Replace the cached registry data."""
+        rows = [(name, json.dumps(data)) for name, data in teams_data.items()]
+        
+        with sqlite3.connect(self.db_path) as conn:
+            conn.execute("DELETE FROM teams")
+            conn.executemany("INSERT INTO teams (name, data) VALUES (?, ?)", rows)
+            conn.execute(
+                "INSERT OR REPLACE INTO cache_meta (key, value) VALUES ('stamp', ?)",
+                (stamp,)
+            )
+
+
 class BSRTeamManager:
     """
     BSR team management and collaboration system.
@@ -204,7 +344,7 @@ class BSRTeamManager:
             verbose: Enable verbose logging
         """
         if config_dir is None:
-            config_dir = Path.home() / '.cache' / 'buck2-protobuf' / 'team-config'
+            config_dir = default_config_dir()
         
         self.config_dir = Path(config_dir)
         self.config_dir.mkdir(parents=True, exist_ok=True)
@@ -212,9 +352,29 @@ class BSRTeamManager:
         self.verbose = verbose
         self.teams: Dict[str, Team] = {}
         
+        # Precomputed team hierarchy closure (team -> ancestors nearest-first,
+        # team -> all transitive descendants)
+        self._ancestors: Dict[str, Tuple[str, ...]] = {}
+        self._descendants: Dict[str, FrozenSet[str]] = {}
+        
+        # Flat (team, repository, username) -> role override index; the nested
+        # team_permissions dicts remain authoritative for serialization
+        self._override_index: Dict[Tuple[str, str, str], str] = {}
+        
+        # Lookup indexes: username -> teams, repository -> {team: access level}
+        self._user_index: Dict[str, Set[str]] = defaultdict(set)
+        self._repo_index: Dict[str, Dict[str, AccessLevel]] = defaultdict(dict)
+        
         # Team configuration file
         self.teams_config_file = self.config_dir / "teams.yaml"
         
+        # Parsed registry cache alongside the configuration file
+        try:
+            self._cache: Optional[TeamsCache] = TeamsCache(self.config_dir / "teams-cache.sqlite")
+        except sqlite3.Error as e:
+            logger.warning(f"Team registry cache unavailable: {e}")
+            self._cache = None
+        
         # BSR authentication
         self.bsr_authenticator = bsr_authenticator or BSRAuthenticator(verbose=verbose)
         
@@ -229,8 +389,16 @@ class BSRTeamManager:
             return
         
         try:
-            with open(self.teams_config_file, 'r') as f:
-                teams_data = yaml.safe_load(f) or {}
+            # Stamp and parse the same read so a concurrent save cannot pair
+            # one version's stamp with another version's data
+            with open(self.teams_config_file, 'rb') as f:
+                content = f.read()
+                stamp = TeamsCache.content_stamp(os.fstat(f.fileno()), content)
+            teams_data = self._load_cached_registry(stamp)
+            
+            if teams_data is None:
+                teams_data = _load_yaml(content) or {}
+                self._store_cached_registry(stamp, teams_data)
             
             for team_name, team_data in teams_data.items():
                 # Convert member data to TeamMember objects
@@ -254,6 +422,104 @@ class BSRTeamManager:
             
         except Exception as e:
             logger.error(f"Failed to load team configurations: {e}")
+        
+        self._rebuild_hierarchy_index()
+        self._override_index = {
+            (team_name, repo_name, username): role
+            for team_name, team in self.teams.items()
+            for repo_name, repo in team.repositories.items()
+            for username, role in repo.team_permissions.items()
+        }
+        for team_name in self.teams:
+            self._index_team(team_name)
+
+    def _index_team(self, team: str) -> None:
+        """Add a team's members and repositories to the lookup indexes."""
+        team_obj = self.teams[team]
+        for username in team_obj.members:
+            self._user_index[username].add(team)
+        for repo_name, repo in team_obj.repositories.items():
+            self._repo_index[repo_name][team] = AccessLevel.parse(repo.access_level)
+
+    def _unindex_team(self, team: str) -> None:
+        """Remove a team's members and repositories from the lookup indexes."""
+        team_obj = self.teams[team]
+        for username in team_obj.members:
+            self._unindex_member(team, username)
+        for repo_name in team_obj.repositories:
+            repo_teams = self._repo_index.get(repo_name)
+            if repo_teams is not None:
+                repo_teams.pop(team, None)
+                if not repo_teams:
+                    del self._repo_index[repo_name]
+
+    def _unindex_member(self, team: str, username: str) -> None:
+        """Remove a single team membership from the user index."""
+        user_teams = self._user_index.get(username)
+        if user_teams is not None:
+            user_teams.discard(team)
+            if not user_teams:
+                del self._user_index[username]
+
+    def _rebuild_hierarchy_index(self) -> None:
+        """Compute ancestor and descendant closures for all teams."""
+        ancestors: Dict[str, Tuple[str, ...]] = {}
+        
+        def resolve(name: str, seen: Tuple[str, ...] = ()) -> Tuple[str, ...]:
+            if name in ancestors:
+                return ancestors[name]
+            parent = self.teams[name].parent_team
+            if not parent or parent not in self.teams or parent in seen:
+                chain: Tuple[str, ...] = ()
+            else:
+                chain = (parent,) + resolve(parent, seen + (name,))
+            ancestors[name] = chain
+            return chain
+        
+        for team_name in self.teams:
+            resolve(team_name)
+        
+        descendants: Dict[str, Set[str]] = {name: set() for name in self.teams}
+        for team_name, chain in ancestors.items():
+            for ancestor in chain:
+                descendants[ancestor].add(team_name)
+        
+        self._ancestors = ancestors
+        self._descendants = {name: frozenset(desc) for name, desc in descendants.items()}
+
+    def _load_cached_registry(self, stamp: str) -> Optional[Dict[str, Any]]:
+        """Load registry data from the sidecar cache if it is fresh."""
+        if self._cache is None:
+            return None
+        
+        try:
+            return self._cache.load(stamp)
+        except (sqlite3.Error, ValueError) as e:
+            logger.warning(f"Ignoring unreadable team registry cache: {e}")
+            return None
+
+    def _store_cached_registry(self, stamp: str, teams_data: Dict[str, Any]) -> None:
+        """Record registry data in the sidecar cache."""
+        if self._cache is None:
+            return
+        
+        try:
+            self._cache.store(stamp, teams_data)
+        except (sqlite3.Error, TypeError, ValueError) as e:
+            logger.warning(f"Failed to update team registry cache: {e}")
+
+    def _reindex_team_overrides(self, team: str) -> None:
+        """Refresh the flat role override index for a single team."""
+        for key in [k for k in self._override_index if k[0] == team]:
+            del self._override_index[key]
+        
+        team_obj = self.teams.get(team)
+        if team_obj is None:
+            return
+        
+        for repo_name, repo in team_obj.repositories.items():
+            for username, role in repo.team_permissions.items():
+                self._override_index[(team, repo_name, username)] = role
 
     def _save_teams_config(self) -> None:
         """Save team configurations to storage."""
@@ -279,8 +545,29 @@ class BSRTeamManager:
                 
                 teams_data[team_name] = team_data
             
-            with open(self.teams_config_file, 'w') as f:
-                yaml.dump(teams_data, f, default_flow_style=False, indent=2)
+            buffer = io.StringIO()
+            _dump_yaml(teams_data, buffer)
+            content = buffer.getvalue().encode('utf-8')
+            
+            # Write to a temporary file and swap it in so readers never see a
+            # partially written configuration. The stamp is taken from the
+            # temporary file, which the rename keeps, because by the time the
+            # rename returns another writer may already have replaced it.
+            fd, temp_path = tempfile.mkstemp(
+                dir=self.config_dir, prefix=".teams-", suffix=".yaml.tmp"
+            )
+            try:
+                os.fchmod(fd, _replacement_mode(self.teams_config_file))
+                with os.fdopen(fd, 'wb') as f:
+                    f.write(content)
+                    f.flush()
+                    stamp = TeamsCache.content_stamp(os.fstat(f.fileno()), content)
+                os.replace(temp_path, self.teams_config_file)
+            except BaseException:
+                Path(temp_path).unlink(missing_ok=True)
+                raise
+            
+            self._store_cached_registry(stamp, teams_data)
             
             logger.info(f"Saved {len(self.teams)} team configurations")
             
@@ -327,6 +614,13 @@ class BSRTeamManager:
         if parent_team:
             self.teams[parent_team].child_teams.add(name)
         
+        # Extend hierarchy closure with the new leaf
+        chain = (parent_team,) + self._ancestors.get(parent_team, ()) if parent_team else ()
+        self._ancestors[name] = chain
+        self._descendants[name] = frozenset()
+        for ancestor in chain:
+            self._descendants[ancestor] = self._descendants.get(ancestor, frozenset()) | {name}
+        
         self._save_teams_config()
         logger.info(f"Created team '{name}' with parent '{parent_team}'")
         
@@ -352,7 +646,7 @@ class BSRTeamManager:
         team = self.teams[name]
         
         # Check for child teams
-        if team.child_teams and not force:
+        if self._descendants.get(name) and not force:
             raise TeamConfigurationError(
                 f"Team '{name}' has child teams: {list(team.child_teams)}. "
                 "Use force=True to delete anyway."
@@ -369,7 +663,20 @@ class BSRTeamManager:
                 if team.parent_team:
                     self.teams[team.parent_team].child_teams.add(child_team_name)
         
+        self._unindex_team(name)
         del self.teams[name]
+        
+        # Patch hierarchy closure: descendants lose this ancestor, ancestors
+        # lose this descendant
+        for descendant in self._descendants.pop(name, frozenset()):
+            self._ancestors[descendant] = tuple(
+                a for a in self._ancestors.get(descendant, ()) if a != name
+            )
+        for ancestor in self._ancestors.pop(name, ()):
+            if ancestor in self._descendants:
+                self._descendants[ancestor] = self._descendants[ancestor] - {name}
+        
+        self._reindex_team_overrides(name)
         self._save_teams_config()
         logger.info(f"Deleted team '{name}'")
         
@@ -402,7 +709,9 @@ class BSRTeamManager:
                 description=f"Repository access for team {team}"
             )
             team_obj.add_repository(repo_config)
+            self._repo_index[repository][team] = AccessLevel.parse(access_level)
         
+        self._reindex_team_overrides(team)
         self._save_teams_config()
         logger.info(f"Configured access to {len(repositories)} repositories for team '{team}'")
 
@@ -440,9 +749,11 @@ class BSRTeamManager:
                     email=member_config.get('email')
                 )
                 team_obj.add_member(member)
+                self._user_index[username].add(team)
                 
             elif action == "remove":
-                team_obj.remove_member(username)
+                if team_obj.remove_member(username):
+                    self._unindex_member(team, username)
                 
             elif action == "update":
                 team_obj.update_member_role(username, role)
@@ -487,6 +798,7 @@ class BSRTeamManager:
                 
                 repo.last_updated = time.strftime('%Y-%m-%dT%H:%M:%SZ')
         
+        self._reindex_team_overrides(team)
         self._save_teams_config()
         logger.info(f"Organized {len(organization)} repositories for team '{team}'")
 
@@ -507,47 +819,36 @@ class BSRTeamManager:
         Returns:
             True if permission is valid
         """
-        if team not in self.teams:
+        required = AccessLevel.parse(action)
+        if required is None:
             return False
         
-        team_obj = self.teams[team]
-        
-        # Check if repository is accessible to team
-        if repository not in team_obj.repositories:
+        # Cheap team-level check first; member resolution only runs when the
+        # team itself is allowed the action
+        if not self._has_direct_repo_access(team, repository, required):
             return False
         
-        # If username specified, check specific member permissions
-        if username:
-            if username not in team_obj.members:
-                return False
-            
-            # Check both team access level and user permissions
-            repo_config = team_obj.repositories[repository]
-            team_access_permissions = {
-                "read": ["read"],
-                "write": ["read", "write"],
-                "admin": ["read", "write", "manage", "admin"]
-            }
-            
-            # Team must have sufficient access level for the action
-            team_allowed_actions = team_access_permissions.get(repo_config.access_level, [])
-            if action not in team_allowed_actions:
-                return False
-            
-            # User must also have sufficient role permissions
-            permissions = team_obj.get_effective_permissions(username, repository)
-            return action in permissions
-        
-        # Check team-level access
-        repo_config = team_obj.repositories[repository]
-        access_level_permissions = {
-            "read": ["read"],
-            "write": ["read", "write"],
-            "admin": ["read", "write", "manage", "admin"]
-        }
+        if not username:
+            return True
         
-        allowed_actions = access_level_permissions.get(repo_config.access_level, [])
-        return action in allowed_actions
+        role = self._resolve_user_role(team, repository, username)
+        return role is not None and ROLE_ACCESS_LEVELS.get(role, -1) >= required
+
+    def _has_direct_repo_access(self, team: str, repository: str, required: AccessLevel) -> bool:
+        """Check whether a team's repository access level permits a required level."""
+        granted = self._repo_index.get(repository, {}).get(team)
+        return granted is not None and granted >= required
+
+    def _resolve_user_role(self, team: str, repository: str, username: str) -> Optional[str]:
+        """Resolve a member's effective role on a repository, or None if not a member."""
+        if team not in self._user_index.get(username, ()):
+            return None
+        
+        # A repository override takes precedence over the member's team role
+        role = self._override_index.get((team, repository, username))
+        if role is None:
+            role = self.teams[team].members[username].role
+        return role
 
     def propagate_permission_changes(self, 
                                    team: str, 
@@ -607,6 +908,7 @@ class BSRTeamManager:
                         if 'access_level' in repo_changes:
                             old_access = repo.access_level
                             repo.access_level = repo_changes['access_level']
+                            self._repo_index[repo_name][team] = AccessLevel.parse(repo.access_level)
                             propagation_result["changes_applied"].append({
                                 "type": "repository_access_change",
                                 "repository": repo_name,
@@ -624,6 +926,7 @@ class BSRTeamManager:
             
             # Update team timestamp
             team_obj.last_updated = propagation_result["timestamp"]
+            self._reindex_team_overrides(team)
             
             # Save changes
             self._save_teams_config()
@@ -675,29 +978,447 @@ class BSRTeamManager:
             }
         }
 
+    def get_team_ancestors(self, team: str) -> Tuple[str, ...]:
+        """Get a team's ancestors, nearest parent first."""
+        return self._ancestors.get(team, ())
+
+    def get_team_descendants(self, team: str) -> FrozenSet[str]:
+        """Get all transitive child teams of a team."""
+        return self._descendants.get(team, frozenset())
+
     def list_teams(self) -> List[str]:
         """List all configured teams."""
         return list(self.teams.keys())
 
+    def get_team_counts(self, team: str) -> Tuple[int, int]:
+        """Get (member_count, repository_count) for a team without building team info."""
+        team_obj = self.teams.get(team)
+        if team_obj is None:
+            return (0, 0)
+        return (len(team_obj.members), len(team_obj.repositories))
+
+    def iter_team_counts(self) -> Iterator[Tuple[str, int, int]]:
+        """Yield (name, member_count, repository_count) for every team."""
+        for team_name, team in self.teams.items():
+            yield team_name, len(team.members), len(team.repositories)
+
     def get_user_teams(self, username: str) -> List[str]:
         """Get teams that a user belongs to."""
-        user_teams = []
-        
-        for team_name, team in self.teams.items():
-            if username in team.members:
-                user_teams.append(team_name)
-        
-        return user_teams
+        return sorted(self._user_index.get(username, ()))
 
     def get_repository_teams(self, repository: str) -> List[str]:
         """Get teams that have access to a repository."""
-        repo_teams = []
+        return sorted(self._repo_index.get(repository, ()))
+
+
+# CLI exit codes
+EXIT_OK = 0
+EXIT_DENY = 1
+EXIT_ERR = 2
+
+# Precomputed validate messages: (action, team, repository, user suffix)
+_VALIDATE_OK_TMPL = "✅ Permission '%s' valid for team '%s' on repository '%s'%s\n"
+_VALIDATE_DENY_TMPL = "❌ Permission '%s' denied for team '%s' on repository '%s'%s\n"
+
+
+def default_config_dir() -> Path:
+    """Get the default team configuration directory."""
+    return Path.home() / '.cache' / 'buck2-protobuf' / 'team-config'
+
+
+def default_daemon_socket_path(config_dir: Union[str, Path]) -> Path:
+    """
+    Get the default UNIX socket path for the validation daemon.
+    
+    The socket lives in a per-user directory: the session's runtime
+    directory when there is one, otherwise a directory under the config
+    directory. A shared temporary directory would let other users plant
+    or hijack the socket.
+    """
+    runtime_dir = os.environ.get("XDG_RUNTIME_DIR")
+    if runtime_dir:
+        return Path(runtime_dir) / "buck2-protobuf" / "bsr-teams.sock"
+    return Path(config_dir) / "run" / "bsr-teams.sock"
+
+
+def _peer_uid(sock: socket.socket) -> Optional[int]:
+    """Return the user id of a UNIX socket's peer, or None where unsupported."""
+    if not hasattr(socket, "SO_PEERCRED"):
+        return None
+    creds = sock.getsockopt(socket.SOL_SOCKET, socket.SO_PEERCRED, struct.calcsize("3i"))
+    _pid, uid, _gid = struct.unpack("3i", creds)
+    return uid
+
+
+def _is_own_socket(path: Union[str, Path]) -> bool:
+    """Check that path is a UNIX socket owned by the current user."""
+    try:
+        path_stat = os.lstat(path)
+    except OSError:
+        return False
+    return stat.S_ISSOCK(path_stat.st_mode) and path_stat.st_uid == os.getuid()
+
+
+# Fields of a daemon validation request and whether each may be null
+_VALIDATION_REQUEST_FIELDS = {
+    "team": False,
+    "repository": False,
+    "username": True,
+    "action": True,
+    "config_dir": True,
+}
+
+
+def _check_validation_request(check: Any) -> None:
+    """Raise ValueError unless check is a well-formed validation request."""
+    if not isinstance(check, dict):
+        raise ValueError(f"request must be a JSON object, got {type(check).__name__}")
+    for name, nullable in _VALIDATION_REQUEST_FIELDS.items():
+        value = check.get(name)
+        if value is None and nullable:
+            continue
+        if not isinstance(value, str):
+            raise ValueError(f"request field '{name}' must be a string")
+
+
+class TeamValidationService:
+    """
+    Long-lived permission validation backed by a single team manager.
+    
+    The registry stays loaded between requests and is reloaded only when
+    teams.yaml changes on disk.
+    """
+    
+    def __init__(self, team_manager: BSRTeamManager):
+        self.team_manager = team_manager
+        self._lock = threading.Lock()
+        self._stamp = self._current_stamp()
+    
+    def _current_stamp(self) -> Optional[str]:
+        try:
+            return TeamsCache.stamp(self.team_manager.teams_config_file)
+        except FileNotFoundError:
+            return None
+    
+    def validate(self, check: Any) -> bool:
+        """
+        Validate a permission check, reloading the registry if it changed.
         
-        for team_name, team in self.teams.items():
-            if repository in team.repositories:
-                repo_teams.append(team_name)
+        Raises:
+            ValueError: If the check is malformed or targets another config dir
+        """
+        _check_validation_request(check)
+        config_dir = check.get("config_dir")
+        served_dir = self.team_manager.config_dir
+        if config_dir is not None and Path(config_dir).resolve() != served_dir.resolve():
+            raise ValueError(
+                f"request for config dir {config_dir}, "
+                f"daemon serves {served_dir}"
+            )
+        
+        with self._lock:
+            stamp = self._current_stamp()
+            if stamp != self._stamp:
+                self.team_manager = BSRTeamManager(
+                    config_dir=self.team_manager.config_dir,
+                    bsr_authenticator=self.team_manager.bsr_authenticator,
+                    verbose=self.team_manager.verbose
+                )
+                self._stamp = stamp
+            team_manager = self.team_manager
+        
+        return team_manager.validate_team_permissions(
+            team=check["team"],
+            repository=check["repository"],
+            username=check.get("username"),
+            action=check.get("action", "read")
+        )
+
+
+class _ValidationRequestHandler(socketserver.StreamRequestHandler):
+    """Answer JSON-line permission checks with an exit code per line."""
+    
+    def handle(self) -> None:
+        peer_uid = _peer_uid(self.connection)
+        if peer_uid is not None and peer_uid != os.getuid():
+            logger.warning(f"Refusing validation requests from uid {peer_uid}")
+            return
         
-        return repo_teams
+        for line in self.rfile:
+            if not line.strip():
+                continue
+            try:
+                allowed = self.server.service.validate(json.loads(line))
+                reply = EXIT_OK if allowed else EXIT_DENY
+            except (ValueError, KeyError, TypeError) as e:
+                logger.warning(f"Invalid validation request: {e}")
+                reply = EXIT_ERR
+            self.wfile.write(b"%d\n" % reply)
+
+
+def create_validation_server(team_manager: BSRTeamManager,
+                             socket_path: Union[str, Path]) -> socketserver.BaseServer:
+    """
+    Create a threaded UNIX socket server answering validation requests.
+    
+    A stale socket file left by a dead daemon is removed; a live daemon on
+    the same path, or a file that is not our own socket, is reported as an
+    error. The socket is only accessible to the current user.
+    """
+    socket_path = Path(socket_path)
+    socket_path.parent.mkdir(mode=0o700, parents=True, exist_ok=True)
+    if os.path.lexists(socket_path):
+        if not _is_own_socket(socket_path):
+            raise TeamConfigurationError(f"Refusing to replace {socket_path}: not our own socket")
+        if validate_via_daemon(socket_path, team="", repository="") is not None:
+            raise TeamConfigurationError(f"Validation daemon already running on {socket_path}")
+        socket_path.unlink()
+    
+    server = socketserver.ThreadingUnixStreamServer(str(socket_path), _ValidationRequestHandler)
+    os.chmod(socket_path, 0o600)
+    server.daemon_threads = True
+    server.service = TeamValidationService(team_manager)
+    return server
+
+
+def validate_via_daemon(socket_path: Union[str, Path],
+                        team: str,
+                        repository: str,
+                        username: Optional[str] = None,
+                        action: str = "read",
+                        timeout: float = 5.0,
+                        config_dir: Union[str, Path, None] = None) -> Optional[bool]:
+    """
+    Validate a permission through a running daemon.
+    
+    Args:
+        config_dir: Configuration directory the answer must come from; a
+            daemon serving a different directory refuses the request
+    
+    Returns:
+        True/False for the permission, or None if no daemon answered. A
+        socket that is not owned by the current user, or a daemon running
+        as another user, is never asked.
+    """
+    if not hasattr(socket, "AF_UNIX") or not _is_own_socket(socket_path):
+        return None
+    
+    request = json.dumps({
+        "team": team,
+        "repository": repository,
+        "username": username,
+        "action": action,
+        "config_dir": str(Path(config_dir).resolve()) if config_dir is not None else None
+    }).encode() + b"\n"
+    
+    try:
+        with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as sock:
+            sock.settimeout(timeout)
+            sock.connect(str(socket_path))
+            peer_uid = _peer_uid(sock)
+            if peer_uid is not None and peer_uid != os.getuid():
+                logger.warning(f"Ignoring validation daemon on {socket_path} run by uid {peer_uid}")
+                return None
+            sock.sendall(request)
+            sock.shutdown(socket.SHUT_WR)
+            reply = sock.makefile("rb").readline().strip()
+    except OSError:
+        return None
+    
+    if reply == b"%d" % EXIT_OK:
+        return True
+    if reply == b"%d" % EXIT_DENY:
+        return False
+    return None
+
+
+
+def _cmd_create(args: argparse.Namespace, team_manager: BSRTeamManager) -> int:
+    """Create a new team."""
+    team = team_manager.create_team(
+        name=args.name,
+        description=args.description,
+        parent_team=args.parent
+    )
+    print(f"✅ Created team '{team.name}'")
+    return EXIT_OK
+
+
+def _cmd_add_member(args: argparse.Namespace, team_manager: BSRTeamManager) -> int:
+    """Add a member to a team."""
+    members = [{
+        "username": args.username,
+        "role": args.role,
+        "email": args.email
+    }]
+    team_manager.manage_team_members(args.team, members, action="add")
+    print(f"✅ Added {args.username} to team '{args.team}' as {args.role}")
+    return EXIT_OK
+
+
+def _cmd_add_members(args: argparse.Namespace, team_manager: BSRTeamManager) -> int:
+    """Add many members to a team with a single configuration save."""
+    with open(args.file, 'r') as f:
+        members = json.load(f)
+    
+    team_manager.manage_team_members(args.team, members, action="add")
+    print(f"✅ Added {len(members)} members to team '{args.team}'")
+    return EXIT_OK
+
+
+def _cmd_add_repo(args: argparse.Namespace, team_manager: BSRTeamManager) -> int:
+    """Grant a team access to one or more repositories."""
+    if args.repositories:
+        repositories = [r.strip() for r in args.repositories.split(",") if r.strip()]
+    else:
+        repositories = [args.repository]
+    
+    team_manager.configure_team_access(
+        team=args.team,
+        repositories=repositories,
+        access_level=args.access
+    )
+    
+    if len(repositories) == 1:
+        print(f"✅ Added repository '{repositories[0]}' to team '{args.team}' with {args.access} access")
+    else:
+        print(f"✅ Added {len(repositories)} repositories to team '{args.team}' with {args.access} access")
+    return EXIT_OK
+
+
+def _cmd_list(args: argparse.Namespace, team_manager: BSRTeamManager) -> int:
+    """List configured teams with member and repository counts."""
+    if team_manager.teams:
+        print(f"Configured teams ({len(team_manager.teams)}):")
+        print(*(
+            f"  {name}: {member_count} members, {repository_count} repositories"
+            for name, member_count, repository_count in team_manager.iter_team_counts()
+        ), sep="\n")
+    else:
+        print("No teams configured")
+    return EXIT_OK
+
+
+def _cmd_info(args: argparse.Namespace, team_manager: BSRTeamManager) -> int:
+    """Show detailed team information."""
+    team_info = team_manager.get_team_info(args.team)
+    if not team_info:
+        print(f"Team '{args.team}' not found")
+        return EXIT_OK
+    
+    out = [
+        f"Team: {team_info['name']}",
+        f"Description: {team_info['description']}",
+        f"Members: {team_info['member_count']}",
+        f"Repositories: {team_info['repository_count']}",
+        f"Created: {team_info['created_at']}",
+        f"Last Updated: {team_info['last_updated']}",
+    ]
+    
+    if team_info['members']:
+        out.append("\nMembers:")
+        out.extend(
+            f"  {username} ({member['role']})"
+            for username, member in team_info['members'].items()
+        )
+    
+    if team_info['repositories']:
+        out.append("\nRepositories:")
+        out.extend(
+            f"  {repo} ({config['access_level']})"
+            for repo, config in team_info['repositories'].items()
+        )
+    
+    # Emit the whole report with a single write
+    sys.stdout.write("\n".join(out) + "\n")
+    return EXIT_OK
+
+
+def _cmd_validate(args: argparse.Namespace, team_manager: BSRTeamManager) -> int:
+    """Validate a single permission."""
+    is_valid = team_manager.validate_team_permissions(
+        team=args.team,
+        repository=args.repository,
+        username=args.username,
+        action=args.action
+    )
+    
+    return _report_validation(args, is_valid)
+
+
+def _report_validation(args: argparse.Namespace, is_valid: bool) -> int:
+    """Print a validate result and return its exit code."""
+    user_part = f" for user {args.username}" if args.username else ""
+    template = _VALIDATE_OK_TMPL if is_valid else _VALIDATE_DENY_TMPL
+    sys.stdout.write(template % (args.action, args.team, args.repository, user_part))
+    return EXIT_OK if is_valid else EXIT_DENY
+
+
+def _cmd_validate_batch(args: argparse.Namespace, team_manager: BSRTeamManager) -> int:
+    """Validate permissions read as JSON lines from stdin."""
+    results = []
+    for line in sys.stdin:
+        if not line.strip():
+            continue
+        check = json.loads(line)
+        results.append(team_manager.validate_team_permissions(
+            team=check["team"],
+            repository=check["repository"],
+            username=check.get("username"),
+            action=check.get("action", "read")
+        ))
+    
+    if results:
+        sys.stdout.write("\n".join("ok" if r else "deny" for r in results) + "\n")
+    return EXIT_OK if all(results) else EXIT_DENY
+
+
+def _cmd_daemon(args: argparse.Namespace, team_manager: BSRTeamManager) -> int:
+    """Serve validation requests on a UNIX socket until interrupted."""
+    socket_path = Path(args.socket or default_daemon_socket_path(team_manager.config_dir))
+    server = create_validation_server(team_manager, socket_path)
+    print(f"Serving team validation on {socket_path}")
+    sys.stdout.flush()
+    
+    def _stop(signum, frame):
+        raise KeyboardInterrupt
+    
+    # Service managers stop daemons with SIGTERM; shut down cleanly on it too
+    signal.signal(signal.SIGTERM, _stop)
+    
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+        socket_path.unlink(missing_ok=True)
+    
+    return EXIT_OK
+
+
+COMMAND_HANDLERS = {
+    "create": _cmd_create,
+    "add-member": _cmd_add_member,
+    "add-members": _cmd_add_members,
+    "add-repo": _cmd_add_repo,
+    "list": _cmd_list,
+    "info": _cmd_info,
+    "validate": _cmd_validate,
+    "validate-batch": _cmd_validate_batch,
+    "daemon": _cmd_daemon,
+}
+
+
+def _finish(exit_code: int) -> int:
+    """Return a CLI exit code, exiting immediately on denials if requested."""
+    # Wrapper scripts that spawn many checks can opt out of interpreter
+    # shutdown (atexit handlers, final GC) on denials
+    if exit_code == EXIT_DENY and os.environ.get("BSR_FAST_EXIT"):
+        sys.stdout.flush()
+        sys.stderr.flush()
+        os._exit(EXIT_DENY)
+    return exit_code
 
 
 def main():
@@ -705,6 +1426,11 @@ def main():
     parser = argparse.ArgumentParser(description="BSR Team Management System")
     parser.add_argument("--config-dir", help="Configuration directory")
     parser.add_argument("--verbose", "-v", action="store_true", help="Enable verbose output")
+    parser.add_argument("--socket", help="Validation daemon socket path")
+    parser.add_argument(
+        "--client", action="store_true",
+        help="Send validate requests to a running daemon, falling back to in-process validation"
+    )
     
     subparsers = parser.add_subparsers(dest="command", help="Available commands")
     
@@ -721,10 +1447,20 @@ def main():
     member_parser.add_argument("--role", default="contributor", help="Member role")
     member_parser.add_argument("--email", help="Member email")
     
+    # Add members in bulk
+    members_parser = subparsers.add_parser("add-members", help="Add members to team from a JSON file")
+    members_parser.add_argument("--team", required=True, help="Team name")
+    members_parser.add_argument(
+        "--file", required=True,
+        help='JSON list of members ([{"username": ..., "role": ..., "email": ...}])'
+    )
+    
     # Configure repository access
     repo_parser = subparsers.add_parser("add-repo", help="Add repository access")
     repo_parser.add_argument("--team", required=True, help="Team name")
-    repo_parser.add_argument("--repository", required=True, help="Repository reference")
+    repo_target = repo_parser.add_mutually_exclusive_group(required=True)
+    repo_target.add_argument("--repository", help="Repository reference")
+    repo_target.add_argument("--repositories", help="Comma-separated repository references")
     repo_parser.add_argument("--access", default="read", help="Access level")
     
     # List teams
@@ -741,97 +1477,50 @@ def main():
     validate_parser.add_argument("--username", help="Username to check")
     validate_parser.add_argument("--action", default="read", help="Action to validate")
     
+    # Long-running validation daemon
+    subparsers.add_parser("daemon", help="Serve validate requests on a UNIX socket")
+    
+    # Validate many permissions in one invocation
+    subparsers.add_parser(
+        "validate-batch",
+        help="Validate permissions read as JSON lines from stdin "
+             '({"team": ..., "repository": ..., "username": ..., "action": ...})'
+    )
+    
     args = parser.parse_args()
     
     if not args.command:
         parser.print_help()
         return
     
+    # Answer from a running daemon without loading the registry in-process
+    if args.client and args.command == "validate":
+        config_dir = args.config_dir or default_config_dir()
+        is_valid = validate_via_daemon(
+            args.socket or default_daemon_socket_path(config_dir),
+            team=args.team,
+            repository=args.repository,
+            username=args.username,
+            action=args.action,
+            config_dir=config_dir
+        )
+        if is_valid is not None:
+            return _finish(_report_validation(args, is_valid))
+    
     try:
         team_manager = BSRTeamManager(
             config_dir=args.config_dir,
             verbose=args.verbose
         )
         
-        if args.command == "create":
-            team = team_manager.create_team(
-                name=args.name,
-                description=args.description,
-                parent_team=args.parent
-            )
-            print(f"✅ Created team '{team.name}'")
-        
-        elif args.command == "add-member":
-            members = [{
-                "username": args.username,
-                "role": args.role,
-                "email": args.email
-            }]
-            team_manager.manage_team_members(args.team, members, action="add")
-            print(f"✅ Added {args.username} to team '{args.team}' as {args.role}")
-        
-        elif args.command == "add-repo":
-            team_manager.configure_team_access(
-                team=args.team,
-                repositories=[args.repository],
-                access_level=args.access
-            )
-            print(f"✅ Added repository '{args.repository}' to team '{args.team}' with {args.access} access")
-        
-        elif args.command == "list":
-            teams = team_manager.list_teams()
-            if teams:
-                print(f"Configured teams ({len(teams)}):")
-                for team_name in teams:
-                    team_info = team_manager.get_team_info(team_name)
-                    print(f"  {team_name}: {team_info['member_count']} members, {team_info['repository_count']} repositories")
-            else:
-                print("No teams configured")
-        
-        elif args.command == "info":
-            team_info = team_manager.get_team_info(args.team)
-            if team_info:
-                print(f"Team: {team_info['name']}")
-                print(f"Description: {team_info['description']}")
-                print(f"Members: {team_info['member_count']}")
-                print(f"Repositories: {team_info['repository_count']}")
-                print(f"Created: {team_info['created_at']}")
-                print(f"Last Updated: {team_info['last_updated']}")
-                
-                if team_info['members']:
-                    print("\nMembers:")
-                    for username, member in team_info['members'].items():
-                        print(f"  {username} ({member['role']})")
-                
-                if team_info['repositories']:
-                    print("\nRepositories:")
-                    for repo, config in team_info['repositories'].items():
-                        print(f"  {repo} ({config['access_level']})")
-            else:
-                print(f"Team '{args.team}' not found")
-        
-        elif args.command == "validate":
-            is_valid = team_manager.validate_team_permissions(
-                team=args.team,
-                repository=args.repository,
-                username=args.username,
-                action=args.action
-            )
-            
-            if is_valid:
-                user_part = f" for user {args.username}" if args.username else ""
-                print(f"✅ Permission '{args.action}' valid for team '{args.team}' on repository '{args.repository}'{user_part}")
-            else:
-                user_part = f" for user {args.username}" if args.username else ""
-                print(f"❌ Permission '{args.action}' denied for team '{args.team}' on repository '{args.repository}'{user_part}")
-                return 1
+        exit_code = COMMAND_HANDLERS[args.command](args, team_manager)
     
     except Exception as e:
         print(f"ERROR: {e}")
-        return 1
-
-    return 0
+        return EXIT_ERR
+    
+    return _finish(exit_code)
 
 
 if __name__ == "__main__":
-    exit(main())
+    sys.exit(main())
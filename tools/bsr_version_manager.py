@@ -8,20 +8,33 @@ breaking change detection, and multi-registry version consistency.
 """
 
 import argparse
+import functools
 import hashlib
 import json
 import os
 import re
+import shutil
+import string
 import subprocess
 import sys
 import tempfile
+import threading
 import time
-from dataclasses import dataclass, asdict
+from collections import Counter, defaultdict
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, asdict, fields
 from enum import Enum
 from pathlib import Path
 from typing import Dict, List, Optional, Set, Tuple, Union
 import logging
 
+try:
+    import orjson
+    ORJSON_AVAILABLE = True
+except ImportError:
+    ORJSON_AVAILABLE = False
+    orjson = None
+
 # Import existing tools
 from bsr_auth import BSRAuthenticator
 from bsr_client import BSRClient
@@ -31,6 +44,56 @@ logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
 
+def _json_default(obj):
+    """Serialize enum members by value for the stdlib JSON encoder."""
+    if isinstance(obj, Enum):
+        return obj.value
+    raise TypeError(f"Object of type {obj.__class__.__name__} is not JSON serializable")
+
+
+# Filename sanitizing: ASCII names go through a translate table, anything else
+# through the equivalent Unicode-aware regex
+_SAFE_FILENAME_CHARS = frozenset(string.ascii_letters + string.digits + "-_.")
+_FILENAME_SANITIZE_TABLE = str.maketrans(
+    {chr(c): "_" for c in range(128) if chr(c) not in _SAFE_FILENAME_CHARS}
+)
+_UNSAFE_FILENAME_PATTERN = re.compile(r'[^\w\-_.]')
+
+
+def _safe_filename(name: str) -> str:
+    """Replace characters that are unsafe in file names with underscores."""
+    if name.isascii():
+        return name.translate(_FILENAME_SANITIZE_TABLE)
+    return _UNSAFE_FILENAME_PATTERN.sub('_', name)
+
+
+SEMVER_PATTERN = re.compile(r'^v?(\d+)\.(\d+)\.(\d+)(?:-([a-zA-Z0-9\-\.]+))?(?:\+([a-zA-Z0-9\-\.]+))?$')
+
+
+@functools.lru_cache(maxsize=4096)
+def _parse_semantic_version(version: str) -> Optional[Tuple[int, int, int, str, str]]:
+    """Parse a semantic version string, memoized across calls."""
+    # Fast path for the common plain release shape (v)MAJOR.MINOR.PATCH
+    core = version[1:] if version.startswith('v') else version
+    if '-' not in core and '+' not in core:
+        parts = core.split('.')
+        if len(parts) == 3 and all(part.isdecimal() for part in parts):
+            return (int(parts[0]), int(parts[1]), int(parts[2]), "", "")
+    
+    match = SEMVER_PATTERN.match(version)
+    if not match:
+        return None
+    
+    major, minor, patch, prerelease, build = match.groups()
+    return (
+        int(major),
+        int(minor), 
+        int(patch),
+        prerelease or "",
+        build or ""
+    )
+
+
 class VersionIncrement(Enum):
     """Types of version increments."""
     MAJOR = "major"
@@ -48,7 +111,11 @@ class ChangeType(Enum):
     STYLE = "style"
 
 
-@dataclass
+# Slotted dataclasses drop the per-instance __dict__ (Python 3.10+)
+_DATACLASS_SLOTS = {'slots': True} if sys.version_info >= (3, 10) else {}
+
+
+@dataclass(**_DATACLASS_SLOTS)
 class SchemaChange:
     """Represents a change in protobuf schema."""
     change_type: ChangeType
@@ -61,7 +128,7 @@ class SchemaChange:
     new_value: Optional[str] = None
 
 
-@dataclass
+@dataclass(**_DATACLASS_SLOTS)
 class VersionInfo:
     """Version information with metadata."""
     version: str
@@ -107,8 +174,16 @@ class BSRVersionManager:
         self.bsr_auth = BSRAuthenticator(verbose=verbose)
         self.bsr_client = BSRClient(registry, verbose=verbose)
         
+        # Repository info is cached in memory and on disk for a short TTL
+        self.repo_info_ttl = 300
+        self._repo_info_cache: Dict[str, Tuple[float, Dict]] = {}
+        
+        # buf results keyed by the stat signatures of both proto sets, so
+        # repeated comparisons of unchanged inputs skip the subprocess
+        self._buf_results: Dict[Tuple[bytes, bytes], List[SchemaChange]] = {}
+        
         # Version patterns
-        self.semver_pattern = re.compile(r'^v?(\d+)\.(\d+)\.(\d+)(?:-([a-zA-Z0-9\-\.]+))?(?:\+([a-zA-Z0-9\-\.]+))?$')
+        self.semver_pattern = SEMVER_PATTERN
         
         # Breaking change patterns (field removal, type changes, etc.)
         self.breaking_patterns = [
@@ -119,6 +194,10 @@ class BSRVersionManager:
             r'changed\s+field\s+number',
             r'removed\s+enum\s+value',
         ]
+        self._breaking_regex = re.compile(
+            "|".join(f"(?:{pattern})" for pattern in self.breaking_patterns),
+            re.IGNORECASE
+        )
         
         if self.verbose:
             logger.info(f"BSR version manager initialized for registry: {self.registry}")
@@ -138,18 +217,7 @@ class BSRVersionManager:
         Returns:
             Tuple of (major, minor, patch, prerelease, build) or None if invalid
         """
-        match = self.semver_pattern.match(version)
-        if not match:
-            return None
-        
-        major, minor, patch, prerelease, build = match.groups()
-        return (
-            int(major),
-            int(minor), 
-            int(patch),
-            prerelease or "",
-            build or ""
-        )
+        return _parse_semantic_version(version)
 
     def format_semantic_version(self, major: int, minor: int, patch: int, 
                                prerelease: str = "", build: str = "") -> str:
@@ -166,6 +234,10 @@ class BSRVersionManager:
         Returns:
             Formatted semantic version string
         """
+        # Common case: a plain release version
+        if not prerelease and not build:
+            return f"v{major}.{minor}.{patch}"
+        
         version = f"v{major}.{minor}.{patch}"
         
         if prerelease:
@@ -176,6 +248,39 @@ class BSRVersionManager:
         
         return version
 
+    def _get_repository_info(self, repository: str) -> Optional[Dict]:
+        """Get repository info from BSR, served from cache within the TTL."""
+        now = time.time()
+        
+        cached = self._repo_info_cache.get(repository)
+        if cached and now - cached[0] < self.repo_info_ttl:
+            return cached[1]
+        
+        key = hashlib.blake2b(f"{self.registry}|{repository}".encode(), digest_size=16).hexdigest()
+        cache_path = self.cache_dir / f"repoinfo_{key}.json"
+        
+        try:
+            fetched_at = cache_path.stat().st_mtime
+            if now - fetched_at < self.repo_info_ttl:
+                with open(cache_path) as f:
+                    repo_info = json.load(f)
+                self._repo_info_cache[repository] = (fetched_at, repo_info)
+                return repo_info
+        except (OSError, json.JSONDecodeError):
+            pass
+        
+        repo_info = self.bsr_client.get_repository_info(repository)
+        
+        if repo_info:
+            self._repo_info_cache[repository] = (now, repo_info)
+            try:
+                with open(cache_path, 'w') as f:
+                    json.dump(repo_info, f)
+            except (OSError, TypeError) as e:
+                self.log(f"Failed to cache repository info for {repository}: {e}")
+        
+        return repo_info
+
     def get_latest_version(self, repository: str) -> Optional[str]:
         """
         Get the latest published version for a repository.
@@ -190,20 +295,21 @@ class BSRVersionManager:
             self.log(f"Querying latest version for {repository}")
             
             # Use BSR client to get repository information
-            repo_info = self.bsr_client.get_repository_info(repository)
+            repo_info = self._get_repository_info(repository)
             
             if repo_info and 'tags' in repo_info:
-                versions = []
+                # Single pass selecting the highest (major, minor, patch);
+                # ties keep the first tag seen
+                latest = None
+                latest_key = None
                 
                 for tag in repo_info['tags']:
                     parsed = self.parse_semantic_version(tag)
-                    if parsed:
-                        versions.append((tag, parsed))
+                    if parsed and (latest_key is None or parsed[:3] > latest_key):
+                        latest = tag
+                        latest_key = parsed[:3]
                 
-                if versions:
-                    # Sort by semantic version (major, minor, patch)
-                    versions.sort(key=lambda x: x[1][:3], reverse=True)
-                    latest = versions[0][0]
+                if latest:
                     self.log(f"Latest version found: {latest}")
                     return latest
             
@@ -269,6 +375,16 @@ class BSRVersionManager:
                                    baseline_protos: List[Path]) -> List[SchemaChange]:
         """Use buf CLI to detect breaking changes."""
         changes = []
+        returncode = None
+        
+        key = (self._proto_set_digest(current_protos), self._proto_set_digest(baseline_protos))
+        if key[0] == key[1]:
+            # The same unchanged files cannot break each other
+            return changes
+        cached = self._buf_results.get(key)
+        if cached is not None:
+            self.log("Reusing buf breaking change results for unchanged inputs")
+            return list(cached)
         
         try:
             with tempfile.TemporaryDirectory() as temp_dir:
@@ -280,16 +396,9 @@ class BSRVersionManager:
                 current_dir.mkdir()
                 baseline_dir.mkdir()
                 
-                # Copy proto files
-                for proto in current_protos:
-                    if proto.exists():
-                        target = current_dir / proto.name
-                        target.write_text(proto.read_text())
-                
-                for proto in baseline_protos:
-                    if proto.exists():
-                        target = baseline_dir / proto.name
-                        target.write_text(proto.read_text())
+                # Stage proto files
+                self._stage_protos(current_protos, current_dir)
+                self._stage_protos(baseline_protos, baseline_dir)
                 
                 # Run buf breaking change detection
                 cmd = [
@@ -299,31 +408,62 @@ class BSRVersionManager:
                     "--format", "json"
                 ]
                 
-                result = subprocess.run(
-                    cmd, 
-                    capture_output=True, 
-                    text=True, 
-                    timeout=60
-                )
+                # Stream buf's JSON-lines output so issues are converted as
+                # they arrive instead of buffering the whole report
+                unparsed_lines = []
+                with tempfile.TemporaryFile(mode='w+') as stderr_file:
+                    proc = subprocess.Popen(
+                        cmd,
+                        stdout=subprocess.PIPE,
+                        stderr=stderr_file,
+                        text=True
+                    )
+                    
+                    timed_out = threading.Event()
+                    
+                    def _kill_on_timeout():
+                        timed_out.set()
+                        proc.kill()
+                    
+                    watchdog = threading.Timer(60, _kill_on_timeout)
+                    watchdog.start()
+                    try:
+                        for line in proc.stdout:
+                            line = line.strip()
+                            if not line:
+                                continue
+                            try:
+                                issue = json.loads(line)
+                            except json.JSONDecodeError:
+                                unparsed_lines.append(line)
+                                continue
+                            
+                            if not isinstance(issue, dict):
+                                continue
+                            # Older buf releases wrap all issues in one document
+                            for item in issue.get('issues', [issue]):
+                                changes.append(self._breaking_change_from_issue(item))
+                        
+                        returncode = proc.wait()
+                    finally:
+                        watchdog.cancel()
+                        proc.stdout.close()
+                    
+                    if timed_out.is_set():
+                        raise subprocess.TimeoutExpired(cmd, 60)
+                    
+                    stderr_file.seek(0)
+                    stderr = stderr_file.read()
                 
-                if result.returncode == 0:
+                if returncode == 0:
+                    changes.clear()
                     self.log("No breaking changes detected by buf")
-                elif result.returncode == 1:
-                    # Breaking changes found
-                    try:
-                        breaking_data = json.loads(result.stdout)
-                        for issue in breaking_data.get('issues', []):
-                            changes.append(SchemaChange(
-                                change_type=ChangeType.BREAKING,
-                                severity="major",
-                                description=issue.get('message', 'Breaking change detected'),
-                                file_path=issue.get('path', 'unknown'),
-                                line_number=issue.get('start_line'),
-                            ))
-                    except json.JSONDecodeError:
-                        # Fallback to stderr parsing
-                        for line in result.stderr.split('\n'):
-                            if any(pattern in line.lower() for pattern in self.breaking_patterns):
+                elif returncode == 1:
+                    # Breaking changes found; fall back to pattern matching
+                    # when buf's output was not machine readable
+                    if unparsed_lines or not changes:
+                        for line in unparsed_lines + stderr.split('\n'):
+                            if self._breaking_regex.search(line):
                                 changes.append(SchemaChange(
                                     change_type=ChangeType.BREAKING,
                                     severity="major", 
@@ -331,7 +471,8 @@ class BSRVersionManager:
                                     file_path="unknown"
                                 ))
                 else:
-                    self.log(f"buf breaking command failed: {result.stderr}")
+                    changes.clear()
+                    self.log(f"buf breaking command failed: {stderr}")
                     
         except subprocess.TimeoutExpired:
             self.log("buf breaking change detection timed out")
@@ -340,17 +481,54 @@ class BSRVersionManager:
         except Exception as e:
             self.log(f"Error running buf breaking change detection: {e}")
         
+        # Only remember conclusive runs
+        if returncode in (0, 1):
+            self._buf_results[key] = list(changes)
+        
         return changes
 
+    def _stage_protos(self, protos: List[Path], target_dir: Path) -> None:
+        """Place proto files into a staging directory for buf."""
+        for proto in self._stat_protos(protos):
+            target = target_dir / proto.name
+            # buf only reads the staged files, so a hardlink is enough; fall
+            # back to a byte copy across filesystems
+            try:
+                os.link(proto, target)
+            except OSError:
+                shutil.copyfile(proto, target)
+
+    def _breaking_change_from_issue(self, issue: Dict) -> SchemaChange:
+        """Convert a buf breaking issue into a schema change."""
+        return SchemaChange(
+            change_type=ChangeType.BREAKING,
+            severity="major",
+            description=issue.get('message', 'Breaking change detected'),
+            file_path=issue.get('path', 'unknown'),
+            line_number=issue.get('start_line'),
+        )
+
     def _detect_file_changes(self, 
                            current_protos: List[Path],
                            baseline_protos: List[Path]) -> List[SchemaChange]:
         """Detect file-level changes (additions, removals, modifications)."""
         changes = []
         
-        # Create sets of file names for comparison
-        current_files = {p.name for p in current_protos if p.exists()}
-        baseline_files = {p.name for p in baseline_protos if p.exists()}
+        # Map file names to their first existing path; the key views double as
+        # the name sets for comparison
+        current_stats = self._stat_protos(current_protos)
+        baseline_stats = self._stat_protos(baseline_protos)
+        
+        current_map: Dict[str, Path] = {}
+        for p in current_stats:
+            current_map.setdefault(p.name, p)
+        
+        baseline_map: Dict[str, Path] = {}
+        for p in baseline_stats:
+            baseline_map.setdefault(p.name, p)
+        
+        current_files = current_map.keys()
+        baseline_files = baseline_map.keys()
         
         # New files (feature addition)
         new_files = current_files - baseline_files
@@ -373,22 +551,80 @@ class BSRVersionManager:
             ))
         
         # Modified files
-        common_files = current_files & baseline_files
-        for file_name in common_files:
-            current_file = next((p for p in current_protos if p.name == file_name), None)
-            baseline_file = next((p for p in baseline_protos if p.name == file_name), None)
-            
-            if current_file and baseline_file and current_file.exists() and baseline_file.exists():
-                if current_file.read_text() != baseline_file.read_text():
-                    changes.append(SchemaChange(
-                        change_type=ChangeType.FIX,  # Default to fix, buf will detect breaking
-                        severity="patch",
-                        description=f"Modified proto file: {file_name}",
-                        file_path=file_name
-                    ))
+        common_files = list(current_files & baseline_files)
+        
+        def _differs(file_name: str) -> bool:
+            current_file = current_map[file_name]
+            baseline_file = baseline_map[file_name]
+            # Different sizes settle it without reading either file
+            if current_stats[current_file].st_size != baseline_stats[baseline_file].st_size:
+                return True
+            return self._file_digest(current_file) != self._file_digest(baseline_file)
+        
+        # Hashing is I/O bound and releases the GIL, so threads scale here
+        max_workers = min(32, (os.cpu_count() or 1) * 4, max(1, len(common_files)))
+        with ThreadPoolExecutor(max_workers=max_workers) as executor:
+            differs = list(executor.map(_differs, common_files))
+        
+        for file_name, modified in zip(common_files, differs):
+            if modified:
+                changes.append(SchemaChange(
+                    change_type=ChangeType.FIX,  # Default to fix, buf will detect breaking
+                    severity="patch",
+                    description=f"Modified proto file: {file_name}",
+                    file_path=file_name
+                ))
         
         return changes
 
+    @staticmethod
+    def _file_digest(path: Path) -> bytes:
+        """Compute a streaming BLAKE2b digest of a file's contents."""
+        digest = hashlib.blake2b(digest_size=16)
+        with open(path, 'rb') as f:
+            for chunk in iter(lambda: f.read(65536), b''):
+                digest.update(chunk)
+        return digest.digest()
+
+    def _proto_set_digest(self, protos: List[Path]) -> bytes:
+        """
+        Digest the paths, sizes and modification times of a proto set.
+        
+        Only the stat results are used, so checking an unchanged set for a
+        memoized buf result reads no file contents.
+        """
+        digest = hashlib.blake2b(digest_size=16)
+        stats = self._stat_protos(protos)
+        for proto in sorted(stats, key=str):
+            stat = stats[proto]
+            digest.update(os.fsencode(proto))
+            digest.update(b'\0%d\0%d\0%d\0' % (stat.st_ino, stat.st_size, stat.st_mtime_ns))
+        return digest.digest()
+
+    @staticmethod
+    def _stat_protos(protos: List[Path]) -> Dict[Path, os.stat_result]:
+        """
+        Stat existing proto files, scanning each parent directory once.
+        
+        Returns:
+            Mapping of existing files to their stat results, in input order
+        """
+        wanted: Dict[Path, Set[str]] = defaultdict(set)
+        for proto in protos:
+            wanted[proto.parent].add(proto.name)
+        
+        found: Dict[Path, os.stat_result] = {}
+        for parent, names in wanted.items():
+            try:
+                with os.scandir(parent) as entries:
+                    for entry in entries:
+                        if entry.name in names and entry.is_file():
+                            found[parent / entry.name] = entry.stat()
+            except OSError:
+                continue
+        
+        return {proto: found[proto] for proto in protos if proto in found}
+
     def _download_baseline_protos(self, version: str) -> Optional[List[Path]]:
         """Download baseline proto files for comparison."""
         # This would integrate with BSR client to download specific version
@@ -409,14 +645,16 @@ class BSRVersionManager:
         if not changes:
             return VersionIncrement.NONE
         
-        # Check for breaking changes (major version)
-        has_breaking = any(c.change_type == ChangeType.BREAKING for c in changes)
-        if has_breaking:
-            self.log("Breaking changes detected - recommending MAJOR version increment")
-            return VersionIncrement.MAJOR
+        # Single pass: a breaking change settles it (major version), a new
+        # feature means at least a minor version
+        has_features = False
+        for change in changes:
+            if change.change_type is ChangeType.BREAKING:
+                self.log("Breaking changes detected - recommending MAJOR version increment")
+                return VersionIncrement.MAJOR
+            if change.change_type is ChangeType.FEATURE:
+                has_features = True
         
-        # Check for new features (minor version)
-        has_features = any(c.change_type == ChangeType.FEATURE for c in changes)
         if has_features:
             self.log("New features detected - recommending MINOR version increment")
             return VersionIncrement.MINOR
@@ -547,12 +785,13 @@ class BSRVersionManager:
         
         # Get current latest version
         if repositories:
-            current_version = None
-            for repository in repositories.values():
-                version = self.get_latest_version(repository)
-                if version:
-                    current_version = version
-                    break
+            # Query each distinct repository at most once and stop at the
+            # first one that reports a version
+            unique_repositories = dict.fromkeys(repositories.values())
+            current_version = next(
+                (version for version in map(self.get_latest_version, unique_repositories) if version),
+                None
+            )
         else:
             current_version = baseline_version
         
@@ -577,8 +816,7 @@ class BSRVersionManager:
         change_summary = self._create_change_summary(changes)
         
         # Get git information if available
-        git_commit = self._get_git_commit()
-        git_tag = self._get_git_tag()
+        git_commit, git_tag = self._get_git_info()
         
         version_info = VersionInfo(
             version=next_version,
@@ -599,50 +837,42 @@ class BSRVersionManager:
         if not changes:
             return "No changes detected"
         
-        breaking = [c for c in changes if c.change_type == ChangeType.BREAKING]
-        features = [c for c in changes if c.change_type == ChangeType.FEATURE]
-        fixes = [c for c in changes if c.change_type == ChangeType.FIX]
+        counts = Counter(c.change_type for c in changes)
+        breaking = counts[ChangeType.BREAKING]
+        features = counts[ChangeType.FEATURE]
+        fixes = counts[ChangeType.FIX]
         
         summary_parts = []
         
         if breaking:
-            summary_parts.append(f"{len(breaking)} breaking changes")
+            summary_parts.append(f"{breaking} breaking changes")
         if features:
-            summary_parts.append(f"{len(features)} new features")
+            summary_parts.append(f"{features} new features")
         if fixes:
-            summary_parts.append(f"{len(fixes)} fixes")
+            summary_parts.append(f"{fixes} fixes")
         
         return ", ".join(summary_parts)
 
-    def _get_git_commit(self) -> Optional[str]:
-        """Get current git commit hash."""
+    def _get_git_info(self) -> Tuple[Optional[str], Optional[str]]:
+        """Get the current git commit hash and its tag, if any, in one call."""
         try:
             result = subprocess.run(
-                ["git", "rev-parse", "HEAD"],
+                ["git", "log", "-1", "--no-show-signature",
+                 "--decorate-refs=refs/tags/", "--format=%H%x00%D", "HEAD"],
                 capture_output=True,
                 text=True,
                 timeout=10
             )
             if result.returncode == 0:
-                return result.stdout.strip()
-        except Exception:
-            pass
-        return None
-
-    def _get_git_tag(self) -> Optional[str]:
-        """Get current git tag if on a tagged commit."""
-        try:
-            result = subprocess.run(
-                ["git", "describe", "--exact-match", "--tags"],
-                capture_output=True,
-                text=True,
-                timeout=10
-            )
-            if result.returncode == 0:
-                return result.stdout.strip()
+                commit, _, refs = result.stdout.strip().partition('\0')
+                tag = next(
+                    (ref[len('tag: '):] for ref in refs.split(', ') if ref.startswith('tag: ')),
+                    None
+                )
+                return commit or None, tag
         except Exception:
             pass
-        return None
+        return None, None
 
     def save_version_info(self, version_info: VersionInfo, repository: str) -> Path:
         """
@@ -656,17 +886,21 @@ class BSRVersionManager:
             Path to saved version info file
         """
         # Create safe filename from repository
-        safe_repo = re.sub(r'[^\w\-_.]', '_', repository)
+        safe_repo = _safe_filename(repository)
         filename = f"{safe_repo}_{version_info.version}_{int(version_info.created_at)}.json"
         
         file_path = self.cache_dir / filename
         
-        # Convert to serializable format
-        data = asdict(version_info)
-        data['changes'] = [asdict(change) for change in version_info.changes]
-        
-        with open(file_path, 'w') as f:
-            json.dump(data, f, indent=2)
+        if ORJSON_AVAILABLE:
+            # orjson serializes dataclasses and enum members natively
+            file_path.write_bytes(orjson.dumps(version_info, option=orjson.OPT_INDENT_2))
+        else:
+            # Shallow top-level copy; only the changes need converting
+            data = {field.name: getattr(version_info, field.name) for field in fields(version_info)}
+            data['changes'] = [asdict(change) for change in version_info.changes]
+            
+            with open(file_path, 'w') as f:
+                json.dump(data, f, indent=2, default=_json_default)
         
         self.log(f"Saved version info to {file_path}")
         return file_path
@@ -682,8 +916,11 @@ class BSRVersionManager:
             Loaded version information or None if failed
         """
         try:
-            with open(file_path) as f:
-                data = json.load(f)
+            if ORJSON_AVAILABLE:
+                data = orjson.loads(file_path.read_bytes())
+            else:
+                with open(file_path) as f:
+                    data = json.load(f)
             
             # Reconstruct change objects
             changes = []
@@ -7,11 +7,17 @@ like prost-build, tonic-build, and other Rust-based code generators.
 """
 
 import os
+import re
+import shutil
 import sys
 import json
 import subprocess
+import threading
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor, as_completed
 from pathlib import Path
-from typing import Dict, List, Optional, Any
+from types import MappingProxyType
+from typing import Dict, List, Mapping, Optional, Any, Set, Tuple
 
 from package_manager_base import (
     BasePackageManagerInstaller, 
@@ -22,76 +28,134 @@ from package_manager_base import (
 from package_manager_detector import PackageManagerInfo
 
 
+# Crate header lines in `cargo install --list` output
+_INSTALLED_CRATE_PATTERN = re.compile(r'^(\S+)\s+v([^\s:]+)[^\n]*:[ \t]*$', re.MULTILINE)
+
+# Result lines in `cargo search` output
+_CARGO_SEARCH_PATTERN = re.compile(
+    r'^(?P<name>[^\s.=][^\s=]*)\s*=\s*"(?P<version>[^"]*)"[ \t]*(?:#[ \t]*(?P<desc>[^\n]*))?$',
+    re.MULTILINE
+)
+
+
+# Trailing output lines of cargo install kept for error messages
+_OUTPUT_TAIL_LINES = 50
+
+# Errors cargo reports when --offline lacks cached crates or git checkouts
+_OFFLINE_MISS_PATTERN = re.compile(
+    r'no matching package named `[^`]+` found'
+    r'|could not find `[^`]+` in registry'
+    r'|attempting to make an HTTP request, but --offline was specified'
+)
+
+
+def _needs_registry_access(command: List[str], stderr: str) -> bool:
+    """Check whether an ``--offline`` cargo run failed for lack of cached sources."""
+    return "--offline" in command and _OFFLINE_MISS_PATTERN.search(stderr) is not None
+
+
+# Rust plugin configuration database
+RUST_PLUGINS: Mapping[str, Mapping[str, Any]] = MappingProxyType({
+    "prost-build": MappingProxyType({
+        "description": "Prost protobuf code generator for Rust",
+        "crate": "prost-build",
+        "binary": "protoc-gen-prost",
+        "default_version": "0.12.3",
+        "install_args": (),
+        "features": (),
+        "git_url": None,
+    }),
+    "tonic-build": MappingProxyType({
+        "description": "Tonic gRPC code generator for Rust",
+        "crate": "tonic-build",
+        "binary": "protoc-gen-tonic",
+        "default_version": "0.10.2",
+        "install_args": (),
+        "features": (),
+        "git_url": None,
+    }),
+    "protobuf-codegen": MappingProxyType({
+        "description": "Rust protobuf code generator",
+        "crate": "protobuf-codegen",
+        "binary": "protoc-gen-rust",
+        "default_version": "3.4.0",
+        "install_args": (),
+        "features": (),
+        "git_url": None,
+    }),
+    "protoc-gen-prost": MappingProxyType({
+        "description": "Standalone Prost protoc plugin",
+        "crate": "protoc-gen-prost",
+        "binary": "protoc-gen-prost",
+        "default_version": "0.2.3",
+        "install_args": (),
+        "features": (),
+        "git_url": None,
+    }),
+    "protoc-gen-tonic": MappingProxyType({
+        "description": "Standalone Tonic protoc plugin",
+        "crate": "protoc-gen-tonic",
+        "binary": "protoc-gen-tonic",
+        "default_version": "0.4.0",
+        "install_args": (),
+        "features": (),
+        "git_url": None,
+    }),
+    "buf-build-connect-rs": MappingProxyType({
+        "description": "Connect for Rust protoc plugin",
+        "crate": "buf-build-connect-rs",
+        "binary": "protoc-gen-connect-rs",
+        "default_version": "0.1.0",
+        "install_args": (),
+        "features": (),
+        "git_url": "https://github.com/bufbuild/connect-rust",
+    }),
+})
+
+
 class CargoPluginInstaller(BasePackageManagerInstaller):
     """Install and manage Rust protoc plugins via Cargo."""
     
-    def __init__(self, cache_dir: str, verbose: bool = False):
+    def __init__(self, cache_dir: str, verbose: bool = False, prefer_offline: bool = True,
+                 create_wrappers: bool = False):
         """
         Initialize the Cargo plugin installer.
         
         Args:
             cache_dir: Directory to store cached installations
             verbose: Enable verbose logging
+            prefer_offline: Try installs from the local registry cache before
+                updating the crates.io index
+            create_wrappers: Also write wrapper scripts into the cache
+                directory pointing at the Cargo-installed binaries
         """
+        # Plugin installs may log from worker threads
+        self._log_lock = threading.Lock()
+        
         super().__init__(cache_dir, verbose)
         
-        # Rust plugin configuration database
-        self.rust_plugins = {
-            "prost-build": {
-                "description": "Prost protobuf code generator for Rust",
-                "crate": "prost-build",
-                "binary": "protoc-gen-prost",
-                "default_version": "0.12.3",
-                "install_args": [],
-                "features": [],
-                "git_url": None,
-            },
-            "tonic-build": {
-                "description": "Tonic gRPC code generator for Rust",
-                "crate": "tonic-build", 
-                "binary": "protoc-gen-tonic",
-                "default_version": "0.10.2",
-                "install_args": [],
-                "features": [],
-                "git_url": None,
-            },
-            "protobuf-codegen": {
-                "description": "Rust protobuf code generator",
-                "crate": "protobuf-codegen",
-                "binary": "protoc-gen-rust",
-                "default_version": "3.4.0",
-                "install_args": [],
-                "features": [],
-                "git_url": None,
-            },
-            "protoc-gen-prost": {
-                "description": "Standalone Prost protoc plugin",
-                "crate": "protoc-gen-prost",
-                "binary": "protoc-gen-prost",
-                "default_version": "0.2.3",
-                "install_args": [],
-                "features": [],
-                "git_url": None,
-            },
-            "protoc-gen-tonic": {
-                "description": "Standalone Tonic protoc plugin",
-                "crate": "protoc-gen-tonic",
-                "binary": "protoc-gen-tonic",
-                "default_version": "0.4.0",
-                "install_args": [],
-                "features": [],
-                "git_url": None,
-            },
-            "buf-build-connect-rs": {
-                "description": "Connect for Rust protoc plugin",
-                "crate": "buf-build-connect-rs",
-                "binary": "protoc-gen-connect-rs",
-                "default_version": "0.1.0",
-                "install_args": [],
-                "features": [],
-                "git_url": "https://github.com/bufbuild/connect-rust",
-            },
-        }
+        self.prefer_offline = prefer_offline
+        self.create_wrappers = create_wrappers
+        
+        # Cargo locations, resolved on first use
+        self._cargo_home: Optional[Path] = None
+        self._cargo_bin_dir: Optional[Path] = None
+        
+        # Installed crate versions, reset whenever cargo installs or
+        # uninstalls something
+        self._installed_crates_cache: Optional[Dict[str, str]] = None
+        
+        # Files in the Cargo bin directory, stored with the directory path and
+        # the mtime they were listed under
+        self._cargo_bin_entries: Optional[Tuple[Path, int, Set[str]]] = None
+        
+        # Rust plugin configuration database, shared and read-only
+        self.rust_plugins = RUST_PLUGINS
+    
+    def log(self, message: str) -> None:
+        """Log a message if verbose mode is enabled, one line at a time."""
+        with self._log_lock:
+            super().log(message)
     
     def get_manager_name(self) -> str:
         """Get the name of the package manager."""
@@ -101,26 +165,28 @@ class CargoPluginInstaller(BasePackageManagerInstaller):
         """Get Cargo package manager information and availability."""
         return self.detector.detect_cargo()
     
-    def get_supported_plugins(self) -> Dict[str, Dict[str, Any]]:
+    def get_supported_plugins(self) -> Dict[str, Mapping[str, Any]]:
         """Get dictionary of supported Rust plugins and their configurations."""
-        return self.rust_plugins
+        return dict(self.rust_plugins)
     
     def get_cargo_home(self) -> Optional[Path]:
-        """Get the Cargo home directory."""
-        cargo_home = os.environ.get("CARGO_HOME")
-        if cargo_home:
-            return Path(cargo_home)
-        
-        # Default Cargo home
-        home_dir = Path.home()
-        return home_dir / ".cargo"
+        """Get the Cargo home directory (resolved once per installer)."""
+        if self._cargo_home is None:
+            cargo_home = os.environ.get("CARGO_HOME")
+            if cargo_home:
+                self._cargo_home = Path(cargo_home)
+            else:
+                # Default Cargo home
+                self._cargo_home = Path.home() / ".cargo"
+        return self._cargo_home
     
     def get_cargo_bin_dir(self) -> Optional[Path]:
         """Get the Cargo bin directory where installed binaries are placed."""
-        cargo_home = self.get_cargo_home()
-        if cargo_home:
-            return cargo_home / "bin"
-        return None
+        if self._cargo_bin_dir is None:
+            cargo_home = self.get_cargo_home()
+            if cargo_home:
+                self._cargo_bin_dir = cargo_home / "bin"
+        return self._cargo_bin_dir
     
     def find_installed_binary(self, binary_name: str) -> Optional[Path]:
         """
@@ -135,31 +201,66 @@ class CargoPluginInstaller(BasePackageManagerInstaller):
         # Check Cargo bin directory
         cargo_bin = self.get_cargo_bin_dir()
         if cargo_bin:
-            binary_path = cargo_bin / binary_name
-            if binary_path.exists() and binary_path.is_file():
-                return binary_path
+            entries = self._get_cargo_bin_entries(cargo_bin)
+            if binary_name in entries:
+                return cargo_bin / binary_name
             
             # Check for .exe extension on Windows
-            if os.name == "nt":
-                binary_path_exe = cargo_bin / f"{binary_name}.exe"
-                if binary_path_exe.exists() and binary_path_exe.is_file():
-                    return binary_path_exe
+            if os.name == "nt" and f"{binary_name}.exe" in entries:
+                return cargo_bin / f"{binary_name}.exe"
         
         # Check PATH
-        import shutil
         path_binary = shutil.which(binary_name)
         if path_binary:
             return Path(path_binary)
         
         return None
     
-    def get_installed_crates(self) -> Dict[str, str]:
+    def _get_cargo_bin_entries(self, cargo_bin: Path) -> Set[str]:
+        """List the files in the Cargo bin directory, reusing the last scan if unchanged."""
+        try:
+            bin_mtime = cargo_bin.stat().st_mtime_ns
+        except OSError:
+            return set()
+        
+        # Any install or removal in the bin directory bumps its mtime
+        cached = self._cargo_bin_entries
+        if cached and cached[0] == cargo_bin and cached[1] == bin_mtime:
+            return cached[2]
+        
+        try:
+            with os.scandir(cargo_bin) as it:
+                entries = {entry.name for entry in it if entry.is_file()}
+        except OSError:
+            return set()
+        
+        self._cargo_bin_entries = (cargo_bin, bin_mtime, entries)
+        return entries
+    
+    def _invalidate_caches(self) -> None:
+        """Forget cached crate listings and binary lookups after cargo runs."""
+        self._installed_crates_cache = None
+        self._cargo_bin_entries = None
+    
+    def get_installed_crates(self, force_refresh: bool = False) -> Dict[str, str]:
         """
         Get list of installed Cargo crates and their versions.
         
+        Args:
+            force_refresh: Re-read the installed crates even if cached
+        
         Returns:
             Dictionary mapping crate names to versions
         """
+        if self._installed_crates_cache is not None and not force_refresh:
+            return self._installed_crates_cache
+        
+        # Cargo's own install tracking file answers this without a subprocess
+        crates = self._read_crates2_json()
+        if crates is not None:
+            self._installed_crates_cache = crates
+            return crates
+        
         success, stdout, stderr = self.run_command_safely([
             "cargo", "install", "--list"
         ], timeout=30)
@@ -168,26 +269,43 @@ class CargoPluginInstaller(BasePackageManagerInstaller):
             self.log(f"Failed to list installed crates: {stderr}")
             return {}
         
-        crates = {}
-        current_crate = None
-        
-        for line in stdout.split('\n'):
-            line = line.strip()
-            if not line:
-                continue
-            
-            # Parse lines like "crate-name v1.2.3:"
-            if line.endswith(':'):
-                # Extract crate name and version
-                parts = line[:-1].split()
-                if len(parts) >= 2:
-                    crate_name = parts[0]
-                    version = parts[1].lstrip('v')
-                    crates[crate_name] = version
-                    current_crate = crate_name
+        # Crate lines look like "crate-name v1.2.3:" or, for git and path
+        # installs, "crate-name v1.2.3 (source):"; binaries are indented
+        crates = dict(_INSTALLED_CRATE_PATTERN.findall(stdout))
         
+        self._installed_crates_cache = crates
         return crates
     
+    def _read_crates2_json(self) -> Optional[Dict[str, str]]:
+        """
+        Read installed crates from Cargo's ``.crates2.json`` tracking file.
+        
+        Returns:
+            Dictionary mapping crate names to versions, or None if the file
+            is unavailable and ``cargo install --list`` should be used instead
+        """
+        # A custom install root keeps its own tracking file
+        if os.environ.get("CARGO_INSTALL_ROOT"):
+            return None
+        
+        cargo_home = self.get_cargo_home()
+        if not cargo_home:
+            return None
+        
+        try:
+            with open(cargo_home / ".crates2.json", 'rb') as f:
+                installs = json.load(f)["installs"]
+            
+            # Keys look like "crate-name 1.2.3 (registry+https://...)"
+            crates = {}
+            for key in installs:
+                name, version = key.split(" ", 2)[:2]
+                crates[name] = version
+            return crates
+        except (OSError, ValueError, KeyError, TypeError) as e:
+            self.log(f"Could not read .crates2.json, falling back to cargo: {e}")
+            return None
+    
     def is_plugin_installed(self, plugin_spec: PluginSpec) -> Optional[Path]:
         """
         Check if a plugin is already installed via Cargo.
@@ -198,30 +316,61 @@ class CargoPluginInstaller(BasePackageManagerInstaller):
         Returns:
             Path to the installed binary if found, None otherwise
         """
-        if plugin_spec.name not in self.rust_plugins:
+        if self._plan([plugin_spec]).get(plugin_spec.name) != "skip":
             return None
+        return self.find_installed_binary(self.rust_plugins[plugin_spec.name]["binary"])
+    
+    def _plan(self, plugin_specs: List[PluginSpec]) -> Dict[str, str]:
+        """
+        Decide what each supported plugin needs before running cargo.
         
-        plugin_config = self.rust_plugins[plugin_spec.name]
-        binary_name = plugin_config["binary"]
-        
-        # Check if binary is available
-        binary_path = self.find_installed_binary(binary_name)
-        if not binary_path:
-            return None
+        The crate listing is only consulted once some plugin binary has been
+        found, so plugins that are plainly missing cost no subprocess.
         
-        # Check if the crate is installed with the right version
-        installed_crates = self.get_installed_crates()
-        crate_name = plugin_config["crate"]
+        Args:
+            plugin_specs: Plugin specifications
+            
+        Returns:
+            Dictionary mapping plugin names to "skip" (requested version
+            already installed), "update" (another version installed) or
+            "install"
+        """
+        plan = {}
+        installed_crates = None
         
-        if crate_name in installed_crates:
-            installed_version = installed_crates[crate_name]
-            if installed_version == plugin_spec.version:
+        for plugin_spec in plugin_specs:
+            if plugin_spec.name not in self.rust_plugins:
+                continue
+            
+            plugin_config = self.rust_plugins[plugin_spec.name]
+            
+            # Check if binary is available
+            binary_path = self.find_installed_binary(plugin_config["binary"])
+            if not binary_path:
+                plan[plugin_spec.name] = "install"
+                continue
+            
+            # Check if the crate is installed with the right version (served
+            # from the cached listing when available)
+            if installed_crates is None:
+                installed_crates = self.get_installed_crates()
+            installed_version = installed_crates.get(plugin_config["crate"])
+            
+            if installed_version is None:
+                plan[plugin_spec.name] = "install"
+            elif installed_version == plugin_spec.version:
                 self.log(f"Plugin {plugin_spec.name} v{plugin_spec.version} already installed: {binary_path}")
-                return binary_path
+                plan[plugin_spec.name] = "skip"
             else:
                 self.log(f"Plugin {plugin_spec.name} installed but wrong version: {installed_version} != {plugin_spec.version}")
+                plan[plugin_spec.name] = "update"
         
-        return None
+        return plan
+    
+    def get_install_dir(self, plugin_spec: PluginSpec) -> Path:
+        """Get the cache directory holding the wrapper for a plugin version."""
+        cache_key = f"{plugin_spec.name}-{plugin_spec.version}"
+        return self.cache_dir / self.get_manager_name() / cache_key
     
     def install_plugin_impl(self, plugin_spec: PluginSpec, install_dir: Path) -> InstallationResult:
         """
@@ -234,53 +383,297 @@ class CargoPluginInstaller(BasePackageManagerInstaller):
         Returns:
             InstallationResult with details of the installation
         """
-        if plugin_spec.name not in self.rust_plugins:
-            return InstallationResult(
-                success=False,
-                plugin_name=plugin_spec.name,
-                error_message=f"Unsupported Rust plugin: {plugin_spec.name}",
-                method="cargo"
-            )
+        return self.install_plugins_batch([plugin_spec], [install_dir])[0]
+    
+    def install_plugins_batch(self, plugin_specs: List[PluginSpec],
+                              install_dirs: Optional[List[Path]] = None) -> List[InstallationResult]:
+        """
+        Install several Rust plugins, sharing one ``cargo install`` run.
         
-        plugin_config = self.rust_plugins[plugin_spec.name]
-        crate_name = plugin_config["crate"]
-        binary_name = plugin_config["binary"]
+        Plugins from crates.io without extra features or arguments are
+        installed together in a single ``cargo install crate@version ...``
+        command; the rest are installed one at a time.
+        
+        Args:
+            plugin_specs: Plugin specifications to install
+            install_dirs: Wrapper directory per plugin (defaults to the
+                plugin's cache directory)
+            
+        Returns:
+            InstallationResult per plugin spec, in the same order
+        """
+        if install_dirs is None:
+            install_dirs = [self.get_install_dir(spec) for spec in plugin_specs]
+        
+        results: List[Optional[InstallationResult]] = [None] * len(plugin_specs)
+        pending = []
+        
+        for index, plugin_spec in enumerate(plugin_specs):
+            if plugin_spec.name not in self.rust_plugins:
+                results[index] = InstallationResult(
+                    success=False,
+                    plugin_name=plugin_spec.name,
+                    error_message=f"Unsupported Rust plugin: {plugin_spec.name}",
+                    method="cargo"
+                )
+            else:
+                pending.append(index)
+        
+        if not pending:
+            return results
         
-        self.log(f"Installing Rust plugin {plugin_spec.name} (crate: {crate_name})")
+        # Plan all plugins against one crate listing before running cargo
+        plan = self._plan([plugin_specs[index] for index in pending])
+        self.log(f"Install plan: {', '.join(f'{name}={action}' for name, action in plan.items())}")
+        batch = []
+        individual = []
         
-        # Check if already installed with correct version
-        existing_binary = self.is_plugin_installed(plugin_spec)
-        if existing_binary:
-            # Create a symbolic link or wrapper in our cache directory
+        for index in pending:
+            plugin_spec = plugin_specs[index]
+            plugin_config = self.rust_plugins[plugin_spec.name]
+            
+            if plan[plugin_spec.name] == "skip":
+                existing_binary = self.find_installed_binary(plugin_config["binary"])
+                results[index] = self._existing_result(plugin_spec, existing_binary, install_dirs[index])
+            elif self._get_features(plugin_spec, plugin_config) or plugin_config.get("git_url") \
+                    or plugin_config.get("install_args"):
+                individual.append(index)
+            else:
+                batch.append(index)
+        
+        failures: Dict[int, str] = {}
+        
+        if batch:
+            remaining = batch
+            stderr = ""
+            
+            # Try the local registry cache first, then allow index updates
+            for offline in ([True, False] if self.prefer_offline else [False]):
+                crate_specs = []
+                for index in remaining:
+                    plugin_spec = plugin_specs[index]
+                    crate_name = self.rust_plugins[plugin_spec.name]["crate"]
+                    crate_specs.append(f"{crate_name}@{plugin_spec.version}" if plugin_spec.version else crate_name)
+                
+                # Add force flag to reinstall if different version
+                install_command = ["cargo", "install", "--force"]
+                if offline:
+                    install_command.append("--offline")
+                install_command.extend(crate_specs)
+                self.log(f"Running cargo install command: {' '.join(install_command)}")
+                
+                success, stdout, stderr = self._run_streaming(
+                    install_command,
+                    timeout=600 * len(remaining)  # 10 minutes of compilation per crate
+                )
+                self._invalidate_caches()
+                
+                if success:
+                    remaining = []
+                    break
+                
+                # Cargo keeps going after a failed crate, so find out which
+                # crates actually reached the requested version
+                installed_crates = self.get_installed_crates(force_refresh=True)
+                remaining = [
+                    index for index in remaining
+                    if not plugin_specs[index].version
+                    or installed_crates.get(self.rust_plugins[plugin_specs[index].name]["crate"])
+                    != plugin_specs[index].version
+                ]
+                
+                if not _needs_registry_access(install_command, stderr):
+                    break
+                self.log("Offline install incomplete, retrying with registry access")
+            
+            for index in remaining:
+                failures[index] = f"Cargo install failed: {stderr}"
+        
+        # Plugins needing their own flags are independent cargo processes,
+        # so compile them concurrently
+        if individual:
+            def _install_one(index: int) -> Tuple[int, bool, str]:
+                plugin_spec = plugin_specs[index]
+                install_command = self._build_install_command(plugin_spec, self.rust_plugins[plugin_spec.name])
+                self.log(f"Running cargo install command: {' '.join(install_command)}")
+                
+                success, stdout, stderr = self._run_cargo_install(
+                    install_command,
+                    timeout=600  # 10 minutes for compilation
+                )
+                return index, success, stderr
+            
+            max_workers = min(len(individual), os.cpu_count() or 1)
+            with ThreadPoolExecutor(max_workers=max_workers) as executor:
+                futures = [executor.submit(_install_one, index) for index in individual]
+                for future in as_completed(futures):
+                    index, success, stderr = future.result()
+                    if not success:
+                        failures[index] = f"Cargo install failed: {stderr}"
+            
+            self._invalidate_caches()
+        
+        for index in batch + individual:
+            plugin_spec = plugin_specs[index]
+            
+            error_msg = failures.get(index)
+            binary_name = self.rust_plugins[plugin_spec.name]["binary"]
+            binary_path = None
+            if error_msg is None:
+                # Find the installed binary
+                binary_path = self.find_installed_binary(binary_name)
+                if not binary_path:
+                    error_msg = f"Binary {binary_name} not found after installation"
+            
+            if error_msg is not None:
+                self.log(error_msg)
+                results[index] = InstallationResult(
+                    success=False,
+                    plugin_name=plugin_spec.name,
+                    error_message=error_msg,
+                    method="cargo"
+                )
+                continue
+            
+            # Cargo binaries are used in place; wrappers are opt-in
             wrapper_path = self.create_wrapper_script(
-                install_dir, 
-                binary_name, 
-                str(existing_binary)
-            )
+                install_dirs[index],
+                binary_name,
+                str(binary_path)
+            ) if self.create_wrappers else None
             
-            return InstallationResult(
+            self.log(f"Successfully installed {plugin_spec.name} via Cargo: {binary_path}")
+            
+            results[index] = InstallationResult(
                 success=True,
                 plugin_name=plugin_spec.name,
-                binary_path=existing_binary,
+                binary_path=binary_path,
                 wrapper_path=wrapper_path,
-                method="cargo_existing"
+                method="cargo"
             )
         
-        # Build cargo install command
-        install_command = ["cargo", "install"]
+        return results
+    
+    def _existing_result(self, plugin_spec: PluginSpec, binary_path: Path,
+                         install_dir: Path) -> InstallationResult:
+        """Report a plugin already installed by Cargo, wrapping it if enabled."""
+        # Optionally point a wrapper in our cache directory at it
+        wrapper_path = self.create_wrapper_script(
+            install_dir,
+            self.rust_plugins[plugin_spec.name]["binary"],
+            str(binary_path)
+        ) if self.create_wrappers else None
+        return InstallationResult(
+            success=True,
+            plugin_name=plugin_spec.name,
+            binary_path=binary_path,
+            wrapper_path=wrapper_path,
+            method="cargo_existing"
+        )
+    
+    def _run_cargo_install(self, install_command: List[str], timeout: int) -> Tuple[bool, str, str]:
+        """
+        Run a cargo install command, trying the local registry cache first.
         
-        # Add version specification
-        if plugin_spec.version:
-            install_command.extend(["--version", plugin_spec.version])
+        Returns:
+            Tuple of (success, stdout, stderr) from the last attempt
+        """
+        if self.prefer_offline:
+            offline_command = install_command + ["--offline"]
+            success, stdout, stderr = self._run_streaming(offline_command, timeout=timeout)
+            if success or not _needs_registry_access(offline_command, stderr):
+                return success, stdout, stderr
+            self.log("Offline install not possible, retrying with registry access")
+        
+        return self._run_streaming(install_command, timeout=timeout)
+    
+    def _run_streaming(self, command: List[str], timeout: int) -> Tuple[bool, str, str]:
+        """
+        Run a long cargo command, streaming its output instead of buffering it.
         
-        # Add features if specified
-        features = plugin_config.get("features", [])
+        Output lines are logged as they arrive in verbose mode and otherwise
+        discarded; only the last lines are kept for error reporting.
+        
+        Args:
+            command: Command and arguments as a list
+            timeout: Timeout in seconds
+            
+        Returns:
+            Tuple of (success, stdout, stderr), where the tail of the combined
+            output is reported as stdout on success and stderr on failure
+        """
+        self.log(f"Running command: {' '.join(command)}")
+        tail = deque(maxlen=_OUTPUT_TAIL_LINES)
+        
+        try:
+            # Absolute executable and inherited fds keep posix_spawn usable
+            executable = self._resolve_executable(command[0])
+            proc = subprocess.Popen(
+                [executable] + list(command[1:]),
+                stdout=subprocess.PIPE,
+                stderr=subprocess.STDOUT,
+                text=True,
+                errors="replace",
+                bufsize=1,
+                close_fds=False
+            )
+        except Exception as e:
+            self.log(f"Error running command: {e}")
+            return False, "", str(e)
+        
+        timed_out = threading.Event()
+        
+        def _kill_on_timeout():
+            timed_out.set()
+            proc.kill()
+        
+        watchdog = threading.Timer(timeout, _kill_on_timeout)
+        watchdog.start()
+        try:
+            for line in proc.stdout:
+                line = line.rstrip()
+                tail.append(line)
+                if self.verbose:
+                    self.log(line)
+            returncode = proc.wait()
+        finally:
+            watchdog.cancel()
+            # Don't leave cargo running if reading its output failed
+            if proc.poll() is None:
+                proc.kill()
+                proc.wait()
+            proc.stdout.close()
+        
+        if timed_out.is_set():
+            self.log(f"Command timed out after {timeout} seconds")
+            return False, "", "Command timed out"
+        
+        output = "\n".join(tail).strip()
+        if returncode != 0:
+            self.log(f"Command failed with return code {returncode}")
+            return False, "", output
+        return True, output, ""
+    
+    def _get_features(self, plugin_spec: PluginSpec, plugin_config: Mapping[str, Any]) -> List[str]:
+        """Collect crate features from the plugin config and install args."""
+        features = list(plugin_config.get("features", []))
         if plugin_spec.install_args:
             # Parse install args for features
             for i, arg in enumerate(plugin_spec.install_args):
                 if arg == "--features" and i + 1 < len(plugin_spec.install_args):
                     features.extend(plugin_spec.install_args[i + 1].split(','))
+        return features
+    
+    def _build_install_command(self, plugin_spec: PluginSpec, plugin_config: Mapping[str, Any]) -> List[str]:
+        """Build a single-crate cargo install command."""
+        install_command = ["cargo", "install"]
         
+        # Add version specification
+        if plugin_spec.version:
+            install_command.extend(["--version", plugin_spec.version])
+        
+        # Add features if specified
+        features = self._get_features(plugin_spec, plugin_config)
         if features:
             install_command.extend(["--features", ",".join(features)])
         
@@ -290,7 +683,7 @@ class CargoPluginInstaller(BasePackageManagerInstaller):
             install_command.extend(["--git", git_url])
         else:
             # Install from crates.io
-            install_command.append(crate_name)
+            install_command.append(plugin_config["crate"])
         
         # Add any additional install arguments
         install_args = plugin_config.get("install_args", [])
@@ -300,52 +693,7 @@ class CargoPluginInstaller(BasePackageManagerInstaller):
         # Add force flag to reinstall if different version
         install_command.append("--force")
         
-        self.log(f"Running cargo install command: {' '.join(install_command)}")
-        
-        # Run cargo install
-        success, stdout, stderr = self.run_command_safely(
-            install_command,
-            timeout=600  # 10 minutes for compilation
-        )
-        
-        if not success:
-            error_msg = f"Cargo install failed: {stderr}"
-            self.log(error_msg)
-            return InstallationResult(
-                success=False,
-                plugin_name=plugin_spec.name,
-                error_message=error_msg,
-                method="cargo"
-            )
-        
-        # Find the installed binary
-        binary_path = self.find_installed_binary(binary_name)
-        if not binary_path:
-            error_msg = f"Binary {binary_name} not found after installation"
-            self.log(error_msg)
-            return InstallationResult(
-                success=False,
-                plugin_name=plugin_spec.name,
-                error_message=error_msg,
-                method="cargo"
-            )
-        
-        # Create a wrapper in our cache directory for consistency
-        wrapper_path = self.create_wrapper_script(
-            install_dir,
-            binary_name,
-            str(binary_path)
-        )
-        
-        self.log(f"Successfully installed {plugin_spec.name} via Cargo: {binary_path}")
-        
-        return InstallationResult(
-            success=True,
-            plugin_name=plugin_spec.name,
-            binary_path=binary_path,
-            wrapper_path=wrapper_path,
-            method="cargo"
-        )
+        return install_command
     
     def uninstall_plugin(self, plugin_name: str, version: str) -> bool:
         """
@@ -371,6 +719,7 @@ class CargoPluginInstaller(BasePackageManagerInstaller):
         success, stdout, stderr = self.run_command_safely([
             "cargo", "uninstall", crate_name
         ], timeout=60)
+        self._invalidate_caches()
         
         if not success:
             self.log(f"Cargo uninstall failed: {stderr}")
@@ -410,11 +759,17 @@ class CargoPluginInstaller(BasePackageManagerInstaller):
             version=target_version,
             binary_name=plugin_config["binary"]
         )
+        install_dir = self.get_install_dir(plugin_spec)
         
-        # Install (which will update if needed due to --force flag)
-        cache_key = f"{plugin_name}-{target_version}"
-        install_dir = self.cache_dir / self.get_manager_name() / cache_key
+        # Nothing to rebuild if the target version is already installed;
+        # the crate listing is cached and usually read from .crates2.json
+        if self.get_installed_crates().get(plugin_config["crate"]) == target_version:
+            existing_binary = self.find_installed_binary(plugin_config["binary"])
+            if existing_binary:
+                self.log(f"Plugin {plugin_name} already at v{target_version}: {existing_binary}")
+                return self._existing_result(plugin_spec, existing_binary, install_dir)
         
+        # Install (which will update if needed due to --force flag)
         return self.install_plugin_impl(plugin_spec, install_dir)
     
     def list_available_plugins(self) -> List[Dict[str, Any]]:
@@ -438,6 +793,25 @@ class CargoPluginInstaller(BasePackageManagerInstaller):
         
         return plugins
     
+    def list_installed_plugins(self) -> List[Dict[str, Any]]:
+        """
+        List all installed plugins.
+        
+        Without wrapper scripts the cache directory holds no binary, so the
+        path Cargo installed the plugin to is reported instead.
+        
+        Returns:
+            List of dictionaries with plugin information
+        """
+        plugins = super().list_installed_plugins()
+        for plugin in plugins:
+            plugin_config = self.rust_plugins.get(plugin["name"])
+            if plugin["binary_path"] is None and plugin_config:
+                binary_path = self.find_installed_binary(plugin_config["binary"])
+                plugin["binary_path"] = str(binary_path) if binary_path else None
+        
+        return plugins
+    
     def search_crates(self, query: str) -> List[Dict[str, Any]]:
         """
         Search for Rust crates related to protoc plugins.
@@ -459,37 +833,15 @@ class CargoPluginInstaller(BasePackageManagerInstaller):
             self.log(f"Cargo search failed: {stderr}")
             return []
         
-        crates = []
-        for line in stdout.split('\n'):
-            line = line.strip()
-            if not line or line.startswith('...'):
-                continue
-            
-            # Parse lines like "crate-name = "1.2.3"    # Description"
-            if '=' in line and '"' in line:
-                try:
-                    name_part, rest = line.split('=', 1)
-                    name = name_part.strip()
-                    
-                    # Extract version
-                    version_start = rest.find('"') + 1
-                    version_end = rest.find('"', version_start)
-                    version = rest[version_start:version_end] if version_end > version_start else ""
-                    
-                    # Extract description
-                    description = ""
-                    if '#' in rest:
-                        description = rest.split('#', 1)[1].strip()
-                    
-                    crates.append({
-                        "name": name,
-                        "version": version,
-                        "description": description,
-                    })
-                    
-                except Exception as e:
-                    self.log(f"Failed to parse cargo search line: {line} - {e}")
-                    continue
+        # Result lines look like 'crate-name = "1.2.3"    # Description'
+        crates = [
+            {
+                "name": match["name"],
+                "version": match["version"],
+                "description": (match["desc"] or "").strip(),
+            }
+            for match in _CARGO_SEARCH_PATTERN.finditer(stdout)
+        ]
         
         return crates
 
@@ -507,6 +859,10 @@ def main():
     parser.add_argument("--list-available", action="store_true", help="List available plugins")
     parser.add_argument("--list-installed", action="store_true", help="List installed plugins")
     parser.add_argument("--search", help="Search for plugins")
+    parser.add_argument("--online", action="store_true",
+                        help="Always update the crates.io index instead of trying the local cache first")
+    parser.add_argument("--create-wrappers", action="store_true",
+                        help="Write wrapper scripts into the cache directory")
     parser.add_argument("--verbose", "-v", action="store_true", help="Enable verbose output")
     
     args = parser.parse_args()
@@ -514,10 +870,15 @@ def main():
     try:
         # Initialize installer
         cache_dir = args.cache_dir or os.path.expanduser("~/.cache/buck2-protobuf")
-        installer = CargoPluginInstaller(cache_dir, verbose=args.verbose)
+        installer = CargoPluginInstaller(cache_dir, verbose=args.verbose, prefer_offline=not args.online,
+                                         create_wrappers=args.create_wrappers)
         
-        # Check if Cargo is available
-        if not installer.is_available():
+        # Listing the plugin table or the local cache needs no cargo, so
+        # only probe for it when a command will actually run cargo
+        needs_cargo = bool(args.search) or (
+            bool(args.plugin) and not (args.list_available or args.list_installed)
+        )
+        if needs_cargo and not installer.is_available():
             print("ERROR: Cargo is not available", file=sys.stderr)
             sys.exit(1)
         
@@ -8,235 +8,719 @@ and potential injection attacks across different programming languages.
 
 import argparse
 import ast
+import bisect
+import functools
+import hashlib
 import json
+import mmap
+import os
 import re
 import sys
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from datetime import datetime, timezone
+from itertools import repeat
 from pathlib import Path
-from typing import Dict, List, Optional, Set
+from typing import (Any, Dict, Iterable, Iterator, List, NamedTuple, Optional,
+                    Set, Tuple, Union)
+
+try:
+    import re2
+    RE2_AVAILABLE = True
+except ImportError:
+    RE2_AVAILABLE = False
+
+try:
+    import orjson
+    ORJSON_AVAILABLE = True
+except ImportError:
+    ORJSON_AVAILABLE = False
+    orjson = None
+
+try:
+    import hyperscan
+    HYPERSCAN_AVAILABLE = True
+except ImportError:
+    HYPERSCAN_AVAILABLE = False
+
+
+VALIDATOR_VERSION = "1.0.0"
+
+# Limits the per-file result cache is pruned to after each run
+CACHE_MAX_BYTES = 64 * 1024 * 1024
+CACHE_MAX_AGE_SECONDS = 7 * 24 * 60 * 60
+
+_NEWLINE_PATTERN = re.compile(b'\n')
+
+# Files at least this large are scanned through mmap instead of read()
+_MMAP_THRESHOLD = 1024 * 1024
+
+
+def _compile_pattern(pattern: str):
+    """
+    Compile a security pattern as a case-insensitive bytes pattern.
+    
+    RE2 is used when it is installed and accepts the pattern, since it scans
+    in linear time; otherwise the stdlib engine is used.
+    
+    Args:
+        pattern: Pattern string
+        
+    Returns:
+        Compiled pattern object
+    """
+    # Inline flags so both engines read them the same way
+    source = ("(?im)" + pattern).encode('ascii')
+    if RE2_AVAILABLE:
+        try:
+            return re2.compile(source)
+        except Exception:
+            pass
+    return re.compile(source)
+
+
+def _compile_prefilter(patterns: List[str]):
+    """
+    Compile a Hyperscan database reporting which patterns occur at all.
+    
+    Pattern i is reported with id i, at most once per scan.
+    
+    Args:
+        patterns: Pattern strings
+        
+    Returns:
+        Hyperscan database, or None if Hyperscan is not installed or
+        rejects a pattern
+    """
+    if not HYPERSCAN_AVAILABLE:
+        return None
+    try:
+        db = hyperscan.Database()
+        db.compile(
+            expressions=[pattern.encode('ascii') for pattern in patterns],
+            ids=list(range(len(patterns))),
+            elements=len(patterns),
+            flags=[hyperscan.HS_FLAG_CASELESS | hyperscan.HS_FLAG_MULTILINE
+                   | hyperscan.HS_FLAG_SINGLEMATCH] * len(patterns),
+        )
+    except Exception:
+        return None
+    return db
+
+
+# Source file extensions by language, for strict extension filtering
+LANG_EXTENSIONS = {
+    "python": frozenset(['.py', '.pyi']),
+    "go": frozenset(['.go']),
+    "typescript": frozenset(['.ts', '.tsx', '.js', '.jsx', '.mjs', '.cjs']),
+    "cpp": frozenset(['.h', '.hh', '.hpp', '.hxx', '.inc', '.c', '.cc', '.cpp', '.cxx']),
+    "rust": frozenset(['.rs']),
+}
+
+# Interpreter names accepted in the shebang of an extensionless file
+_SHEBANG_INTERPRETERS = {
+    "python": (b'python',),
+    "typescript": (b'node', b'deno', b'ts-node'),
+}
+
+
+def _matches_language(file_path: str, language: str) -> bool:
+    """
+    Check whether a file can be source code of the given language.
+    
+    The extension decides; an extensionless file is opened only to read its
+    shebang. Languages without an extension table always match.
+    
+    Args:
+        file_path: Path to the file
+        language: Programming language
+        
+    Returns:
+        True if the file should be validated
+    """
+    extensions = LANG_EXTENSIONS.get(language)
+    if extensions is None:
+        return True
+    
+    suffix = os.path.splitext(file_path)[1].lower()
+    if suffix:
+        return suffix in extensions
+    
+    interpreters = _SHEBANG_INTERPRETERS.get(language, ())
+    if not interpreters:
+        return False
+    try:
+        with open(file_path, 'rb') as f:
+            first_line = f.readline(256)
+    except OSError:
+        # Let validate_file report the access error
+        return True
+    return first_line.startswith(b'#!') and any(
+        interpreter in first_line for interpreter in interpreters)
+
+
+def _newline_offsets(content: Union[bytes, mmap.mmap]) -> List[int]:
+    """Return the sorted offsets of every newline in content."""
+    return [match.start() for match in _NEWLINE_PATTERN.finditer(content)]
+
+
+# High severity patterns
+_HIGH_SEVERITY_PATTERNS = frozenset([
+    r'eval\s*\(',
+    r'exec\s*\(',
+    r'system\s*\(',
+    r'unsafe\s*\{',
+    r'innerHTML\s*=',
+])
+
+# Substrings marking file/network access patterns
+_MEDIUM_SEVERITY_KEYWORDS = ('/etc/', '/proc/', r'net\.', r'http\.')
+
+
+# Python functions that allow arbitrary code execution
+_DANGEROUS_FUNCTIONS = frozenset(['eval', 'exec', 'compile', '__import__'])
+
+# Python attributes that expose interpreter internals
+_DANGEROUS_ATTRIBUTES = frozenset(['__globals__', '__locals__', '__dict__'])
+
+# Builtin calls checked on the AST, with the regex pattern they replace
+_DANGEROUS_BUILTIN_CALLS = {
+    'globals': r'globals\s*\(\)',
+    'locals': r'locals\s*\(\)',
+    'vars': r'vars\s*\(',
+}
+
+# Literal path markers for open() calls, with the regex pattern they replace
+_SENSITIVE_OPEN_PATHS = (
+    ('/etc/', r'open\s*\([\'"][^\'"]*/etc/'),
+    ('/proc/', r'open\s*\([\'"][^\'"]*/proc/'),
+)
+
+# Network module suffixes checked on attribute access, with the regex
+# pattern they replace
+_NETWORK_MODULES = (
+    ('urllib.request', r'urllib\.request\.'),
+    ('socket', r'socket\.'),
+    ('requests', r'requests\.'),
+)
+
+# Python patterns fully handled by the AST checks when the code parses
+AST_COVERED_PATTERNS = frozenset(
+    [r'eval\s*\(', r'exec\s*\(', r'compile\s*\(', r'__import__\s*\(']
+    + list(_DANGEROUS_BUILTIN_CALLS.values())
+    + [pattern for _, pattern in _SENSITIVE_OPEN_PATHS]
+    + [pattern for _, pattern in _NETWORK_MODULES]
+)
+
+
+class Issue(NamedTuple):
+    """
+    A security issue found in a file.
+    
+    Fields that do not apply to an issue's type are None and are left out of
+    the JSON report (see _issue_to_dict).
+    """
+    type: str
+    language: Optional[str] = None
+    file_path: Optional[str] = None
+    pattern: Optional[str] = None
+    match: Optional[str] = None
+    function: Optional[str] = None
+    attribute: Optional[str] = None
+    size_bytes: Optional[int] = None
+    error: Optional[str] = None
+    line: Optional[int] = None
+    severity: Optional[str] = None
+    description: Optional[str] = None
+
+
+def _issue_to_dict(issue: Issue) -> Dict:
+    """Convert an issue to its report dict, dropping unused fields."""
+    return {key: value for key, value in zip(Issue._fields, issue) if value is not None}
+
+
+class _Rule(NamedTuple):
+    """A compiled security pattern and how its matches are reported."""
+    # Position in the language's pattern list (and Hyperscan id)
+    index: int
+    regex: Any
+    pattern: str
+    severity: str
+
+
+def _scan(rules: Iterable[_Rule], content: Union[bytes, mmap.mmap], newlines: List[int],
+          language: str, issues: List[Issue], early_exit: bool = False) -> bool:
+    """
+    Append an issue for every match of each rule.
+    
+    Every pattern is scanned on its own, so a match of one pattern never
+    hides an overlapping match of another. Issues come out grouped by rule.
+    This is the per-match hot loop, so each distinct matched snippet is
+    decoded and interned once.
+    
+    Args:
+        rules: Rules to scan for, in reporting order
+        content: Content to scan
+        newlines: Newline offsets of content
+        language: Language reported on the issues
+        issues: List the issues are appended to
+        early_exit: Stop at the first high severity match
+        
+    Returns:
+        True if the scan stopped at a high severity match
+    """
+    append = issues.append
+    bisect_left = bisect.bisect_left
+    snippets = {}
+    for _, regex, pattern, severity in rules:
+        for match in regex.finditer(content):
+            text = match.group()
+            snippet = snippets.get(text)
+            if snippet is None:
+                snippet = snippets[text] = sys.intern(text.decode('utf-8', errors='ignore'))
+            append(Issue(
+                type="dangerous_pattern",
+                language=language,
+                pattern=pattern,
+                match=snippet,
+                line=bisect_left(newlines, match.start()) + 1,
+                severity=severity,
+            ))
+            if early_exit and severity == "high":
+                return True
+    return False
+
+
+def _terminal_name(node: ast.AST) -> Optional[str]:
+    """Return the last name of a Name or Attribute chain, e.g. b for a.b."""
+    if isinstance(node, ast.Name):
+        return node.id
+    if isinstance(node, ast.Attribute):
+        return node.attr
+    return None
+
+
+def _dotted_name(node: ast.AST) -> Optional[str]:
+    """
+    Return the dotted name of a Name or Attribute chain, e.g. a.b.c.
+    
+    A chain rooted in another expression keeps only its attribute names, so
+    f().b.c gives b.c.
+    """
+    parts = []
+    while isinstance(node, ast.Attribute):
+        parts.append(node.attr)
+        node = node.value
+    if isinstance(node, ast.Name):
+        parts.append(node.id)
+    return ".".join(reversed(parts)) or None
+
+
+def _network_access(node: ast.Attribute) -> Optional[Tuple[str, str]]:
+    """
+    Match attribute access on a network module, e.g. socket.<attr>.
+    
+    Like the regex patterns it replaces, the owner only has to end with the
+    module name, so self._socket.send is reported too.
+    
+    Returns:
+        Tuple of (matched owner plus ".", regex pattern) or None
+    """
+    owner = _dotted_name(node.value)
+    if owner is None:
+        return None
+    lowered = owner.lower()
+    for module, pattern in _NETWORK_MODULES:
+        if lowered.endswith(module):
+            return owner[len(owner) - len(module):] + ".", pattern
+    return None
+
+
+def _ast_pattern_issue(pattern: str, match: str, node: ast.AST) -> Issue:
+    """Build the issue for an AST finding that replaces a regex pattern."""
+    return Issue(
+        type="dangerous_pattern",
+        language="python",
+        pattern=pattern,
+        match=match,
+        line=node.lineno,
+        severity="high",
+    )
+
+
+class _StopScan(Exception):
+    """Raised by _PythonSecurityChecker to end a fail-fast scan."""
+
+
+class _PythonSecurityChecker(ast.NodeVisitor):
+    """
+    Collect security issues from a Python AST.
+    
+    Only calls and attribute accesses are examined. Subtrees that cannot
+    hold either (imports, names, constants) are not descended into.
+    """
+    
+    def __init__(self, issues: List[Issue], early_exit: bool = False):
+        self.issues = issues
+        self.early_exit = early_exit
+    
+    def _report(self, issue: Issue) -> None:
+        self.issues.append(issue)
+        if self.early_exit and issue.severity == "high":
+            raise _StopScan()
+    
+    def visit_Call(self, node: ast.Call) -> None:
+        name = _terminal_name(node.func)
+        
+        # Check for dangerous function calls
+        if name is None:
+            pass
+        elif name in _DANGEROUS_FUNCTIONS:
+            self._report(Issue(
+                type="dangerous_function",
+                language="python",
+                function=name,
+                line=node.lineno,
+                severity="high",
+            ))
+        elif name in _DANGEROUS_BUILTIN_CALLS:
+            pattern = _DANGEROUS_BUILTIN_CALLS[name]
+            if not pattern.endswith(r'\(\)'):
+                self._report(_ast_pattern_issue(pattern, f"{name}(", node))
+            elif not (node.args or node.keywords):
+                self._report(_ast_pattern_issue(pattern, f"{name}()", node))
+        elif name.lower().endswith("open") and node.args:
+            # open() of a literal path under /etc or /proc
+            path = node.args[0]
+            if isinstance(path, ast.Constant) and isinstance(path.value, str):
+                for marker, pattern in _SENSITIVE_OPEN_PATHS:
+                    if marker in path.value:
+                        self._report(_ast_pattern_issue(
+                            pattern, f"{name}({path.value!r}", node))
+        
+        self.generic_visit(node)
+    
+    def visit_Attribute(self, node: ast.Attribute) -> None:
+        # Check for attribute access that might be dangerous
+        if node.attr in _DANGEROUS_ATTRIBUTES:
+            self._report(Issue(
+                type="dangerous_attribute",
+                language="python",
+                attribute=node.attr,
+                line=node.lineno,
+                severity="medium",
+            ))
+        
+        # Check for network module access such as socket.<attr>
+        hit = _network_access(node)
+        if hit is not None:
+            self._report(_ast_pattern_issue(hit[1], hit[0], node))
+        
+        self.generic_visit(node)
+    
+    def _prune(self, node: ast.AST) -> None:
+        """Skip a subtree that cannot contain calls or attribute access."""
+    
+    visit_Import = _prune
+    visit_ImportFrom = _prune
+    visit_Name = _prune
+    visit_Constant = _prune
+
+
+class _CompiledPatterns(NamedTuple):
+    """Compiled pattern tables shared by all validator instances."""
+    # Rules in pattern order, by language
+    rules: Dict[str, Tuple[_Rule, ...]]
+    # Rules with the high severity ones first, for fail-fast scans, by language
+    fail_fast_rules: Dict[str, Tuple[_Rule, ...]]
+    # Severity by (language, pattern string)
+    severity_by_pattern: Dict[Tuple[str, str], str]
+    # Python rules for patterns not in AST_COVERED_PATTERNS
+    ast_residual: Tuple[_Rule, ...]
+    # Hyperscan database of the patterns (or None), by language
+    prefilter: Dict[str, Any]
+    # Digest of the validator version and pattern table, for cache keys
+    rules_digest: bytes
 
 
 class CodeSecurityValidator:
     """Validates generated code for security issues."""
     
-    def __init__(self, verbose: bool = False):
+    # Security patterns for different languages
+    security_patterns = {
+        "python": [
+            # Code injection patterns
+            r'eval\s*\(',
+            r'exec\s*\(',
+            r'compile\s*\(',
+            r'__import__\s*\(',
+            
+            # File system access
+            r'open\s*\([\'"][^\'"]*/etc/',
+            r'open\s*\([\'"][^\'"]*/proc/',
+            
+            # Network access
+            r'urllib\.request\.',
+            r'socket\.',
+            r'requests\.',
+            
+            # Dangerous built-ins
+            r'globals\s*\(\)',
+            r'locals\s*\(\)',
+            r'vars\s*\(',
+        ],
+        "go": [
+            # Code execution
+            r'exec\.Command',
+            r'os\.Exec',
+            r'syscall\.Exec',
+            
+            # File system access
+            r'os\.Open\s*\(\s*[\'"][^\'"]*/etc/',
+            r'ioutil\.ReadFile\s*\(\s*[\'"][^\'"]*/proc/',
+            
+            # Network access
+            r'net\.Dial',
+            r'http\.Get',
+            r'http\.Post',
+            
+            # Unsafe operations
+            r'unsafe\.',
+            r'reflect\.UnsafeAddr',
+        ],
+        "typescript": [
+            # Code execution
+            r'eval\s*\(',
+            r'Function\s*\(',
+            r'setTimeout\s*\([\'"][^\'"]*[\'"]',
+            r'setInterval\s*\([\'"][^\'"]*[\'"]',
+            
+            # DOM manipulation (XSS)
+            r'innerHTML\s*=',
+            r'outerHTML\s*=',
+            r'document\.write',
+            
+            # Network access
+            r'XMLHttpRequest',
+            r'fetch\s*\(',
+            r'axios\.',
+            
+            # Node.js specific
+            r'require\s*\([\'"]child_process[\'"]',
+            r'require\s*\([\'"]fs[\'"]',
+        ],
+        "cpp": [
+            # Memory management issues
+            r'malloc\s*\(',
+            r'free\s*\(',
+            r'strcpy\s*\(',
+            r'strcat\s*\(',
+            r'gets\s*\(',
+            r'sprintf\s*\(',
+            
+            # System calls
+            r'system\s*\(',
+            r'exec\w+\s*\(',
+            
+            # File operations
+            r'fopen\s*\([\'"][^\'"]*/etc/',
+            r'fopen\s*\([\'"][^\'"]*/proc/',
+            
+            # Pointer arithmetic
+            r'\*\s*\([^)]*\)\s*\+',
+            r'\[\s*[^]]*\s*\+[^]]*\]',
+        ],
+        "rust": [
+            # Unsafe blocks
+            r'unsafe\s*\{',
+            
+            # FFI
+            r'extern\s+[\'"]C[\'"]',
+            
+            # File operations
+            r'std::fs::File::open\s*\([\'"][^\'"]*/etc/',
+            r'std::fs::read_to_string\s*\([\'"][^\'"]*/proc/',
+            
+            # Network
+            r'std::net::TcpStream',
+            r'std::net::UdpSocket',
+            
+            # Process
+            r'std::process::Command',
+        ],
+    }
+    
+    def __init__(self, verbose: bool = False, strict_extensions: bool = False,
+                 cache_dir: Optional[Union[str, Path]] = None):
         """
         Initialize the code security validator.
         
         Args:
             verbose: Enable verbose logging
+            strict_extensions: Skip files whose extension (or, without one,
+                shebang) does not belong to the language being validated
+            cache_dir: Directory for caching per-file results by content
+                hash; caching is disabled when None
         """
         self.verbose = verbose
+        self.strict_extensions = strict_extensions
+        self.cache_dir = Path(cache_dir) if cache_dir is not None else None
+        compiled = self._get_compiled()
+        self.rules = compiled.rules
+        self.fail_fast_rules = compiled.fail_fast_rules
+        self.severity_by_pattern = compiled.severity_by_pattern
+        self.ast_residual_rules = compiled.ast_residual
+        self.prefilter = compiled.prefilter
+        self.rules_digest = compiled.rules_digest
+    
+    @classmethod
+    @functools.lru_cache(maxsize=None)
+    def _get_compiled(cls) -> "_CompiledPatterns":
+        """
+        Compile the security patterns once per process.
         
-        # Security patterns for different languages
-        self.security_patterns = {
-            "python": [
-                # Code injection patterns
-                r'eval\s*\(',
-                r'exec\s*\(',
-                r'compile\s*\(',
-                r'__import__\s*\(',
-                
-                # File system access
-                r'open\s*\([\'"][^\'"]*/etc/',
-                r'open\s*\([\'"][^\'"]*/proc/',
-                
-                # Network access
-                r'urllib\.request\.',
-                r'socket\.',
-                r'requests\.',
-                
-                # Dangerous built-ins
-                r'globals\s*\(\)',
-                r'locals\s*\(\)',
-                r'vars\s*\(',
-            ],
-            "go": [
-                # Code execution
-                r'exec\.Command',
-                r'os\.Exec',
-                r'syscall\.Exec',
-                
-                # File system access
-                r'os\.Open\s*\(\s*[\'"][^\'"]*/etc/',
-                r'ioutil\.ReadFile\s*\(\s*[\'"][^\'"]*/proc/',
-                
-                # Network access
-                r'net\.Dial',
-                r'http\.Get',
-                r'http\.Post',
-                
-                # Unsafe operations
-                r'unsafe\.',
-                r'reflect\.UnsafeAddr',
-            ],
-            "typescript": [
-                # Code execution
-                r'eval\s*\(',
-                r'Function\s*\(',
-                r'setTimeout\s*\([\'"][^\'"]*[\'"]',
-                r'setInterval\s*\([\'"][^\'"]*[\'"]',
-                
-                # DOM manipulation (XSS)
-                r'innerHTML\s*=',
-                r'outerHTML\s*=',
-                r'document\.write',
-                
-                # Network access
-                r'XMLHttpRequest',
-                r'fetch\s*\(',
-                r'axios\.',
-                
-                # Node.js specific
-                r'require\s*\([\'"]child_process[\'"]',
-                r'require\s*\([\'"]fs[\'"]',
-            ],
-            "cpp": [
-                # Memory management issues
-                r'malloc\s*\(',
-                r'free\s*\(',
-                r'strcpy\s*\(',
-                r'strcat\s*\(',
-                r'gets\s*\(',
-                r'sprintf\s*\(',
-                
-                # System calls
-                r'system\s*\(',
-                r'exec\w+\s*\(',
-                
-                # File operations
-                r'fopen\s*\([\'"][^\'"]*/etc/',
-                r'fopen\s*\([\'"][^\'"]*/proc/',
-                
-                # Pointer arithmetic
-                r'\*\s*\([^)]*\)\s*\+',
-                r'\[\s*[^]]*\s*\+[^]]*\]',
-            ],
-            "rust": [
-                # Unsafe blocks
-                r'unsafe\s*\{',
-                
-                # FFI
-                r'extern\s+[\'"]C[\'"]',
-                
-                # File operations
-                r'std::fs::File::open\s*\([\'"][^\'"]*/etc/',
-                r'std::fs::read_to_string\s*\([\'"][^\'"]*/proc/',
-                
-                # Network
-                r'std::net::TcpStream',
-                r'std::net::UdpSocket',
-                
-                # Process
-                r'std::process::Command',
-            ],
-        }
+        Each pattern keeps its own scan: a single alternation would let one
+        pattern's match hide another pattern overlapping it. The patterns are
+        all ASCII and are compiled as bytes patterns so files can be scanned
+        without decoding them. Fail-fast scans use the same rules with the
+        high severity ones first.
+        
+        Returns:
+            The compiled pattern tables
+        """
+        rules = {}
+        fail_fast_rules = {}
+        severity_by_pattern = {}
+        prefilter = {}
+        for language, patterns in cls.security_patterns.items():
+            language_rules = []
+            for i, pattern in enumerate(patterns):
+                severity = cls._classify_pattern_severity(pattern)
+                severity_by_pattern[(language, pattern)] = severity
+                # Every Python pattern is reported as high severity
+                language_rules.append(_Rule(
+                    i, _compile_pattern(pattern), pattern,
+                    "high" if language == "python" else severity,
+                ))
+            rules[language] = tuple(language_rules)
+            fail_fast_rules[language] = tuple(sorted(
+                language_rules, key=lambda rule: rule.severity != "high"))
+            prefilter[language] = _compile_prefilter(patterns)
         
-        # Compile patterns for efficiency
-        self.compiled_patterns = {}
-        for language, patterns in self.security_patterns.items():
-            self.compiled_patterns[language] = [
-                re.compile(pattern, re.IGNORECASE | re.MULTILINE)
-                for pattern in patterns
-            ]
+        return _CompiledPatterns(
+            rules=rules,
+            fail_fast_rules=fail_fast_rules,
+            severity_by_pattern=severity_by_pattern,
+            ast_residual=tuple(
+                rule for rule in rules["python"] if rule.pattern not in AST_COVERED_PATTERNS
+            ),
+            prefilter=prefilter,
+            rules_digest=hashlib.sha256(
+                repr((VALIDATOR_VERSION, cls.security_patterns)).encode('utf-8')
+            ).digest(),
+        )
     
     def log(self, message: str) -> None:
         """Log a message if verbose mode is enabled."""
         if self.verbose:
             print(f"[code-security-validator] {message}", file=sys.stderr)
     
-    def validate_python_code(self, content: str) -> List[Dict]:
+    def validate_python_code(self, content: Union[str, bytes],
+                             newlines: Optional[List[int]] = None,
+                             early_exit: bool = False) -> List[Issue]:
         """
         Validate Python code for security issues.
         
         Args:
-            content: Python code content
+            content: Python code content, as text or UTF-8 bytes
+            newlines: Precomputed newline offsets of content, if available
+            early_exit: Stop at the first high severity issue
             
         Returns:
             List of security issues found
         """
         issues = []
+        if isinstance(content, str):
+            content = content.encode('utf-8')
         
-        # Pattern-based validation
-        for i, pattern in enumerate(self.compiled_patterns.get("python", [])):
-            matches = pattern.finditer(content)
-            for match in matches:
-                issues.append({
-                    "type": "dangerous_pattern",
-                    "language": "python",
-                    "pattern": self.security_patterns["python"][i],
-                    "match": match.group(),
-                    "line": content[:match.start()].count('\n') + 1,
-                    "severity": "high",
-                })
-        
-        # AST-based validation for more sophisticated checks
+        # The AST is the more precise detector, so when the code parses the
+        # regex pass only runs for patterns the AST checks do not cover.
         try:
             tree = ast.parse(content)
-            
-            for node in ast.walk(tree):
-                # Check for dangerous function calls
-                if isinstance(node, ast.Call):
-                    if isinstance(node.func, ast.Name):
-                        if node.func.id in ['eval', 'exec', 'compile', '__import__']:
-                            issues.append({
-                                "type": "dangerous_function",
-                                "language": "python",
-                                "function": node.func.id,
-                                "line": node.lineno,
-                                "severity": "high",
-                            })
-                
-                # Check for attribute access that might be dangerous
-                if isinstance(node, ast.Attribute):
-                    dangerous_attrs = ['__globals__', '__locals__', '__dict__']
-                    if node.attr in dangerous_attrs:
-                        issues.append({
-                            "type": "dangerous_attribute",
-                            "language": "python",
-                            "attribute": node.attr,
-                            "line": node.lineno,
-                            "severity": "medium",
-                        })
-        
         except SyntaxError:
+            tree = None
+        
+        rules = self.rules["python"] if tree is None else self.ast_residual_rules
+        if rules:
+            if newlines is None:
+                newlines = _newline_offsets(content)
+            if _scan(rules, content, newlines, "python", issues, early_exit):
+                return issues
+        
+        if tree is None:
             # If we can't parse the code, that's suspicious too
-            issues.append({
-                "type": "parse_error",
-                "language": "python",
-                "error": "Code contains syntax errors",
-                "severity": "medium",
-            })
+            issues.append(Issue(
+                type="parse_error",
+                language="python",
+                error="Code contains syntax errors",
+                severity="medium",
+            ))
+            return issues
+        
+        # AST-based validation for more sophisticated checks
+        try:
+            _PythonSecurityChecker(issues, early_exit).visit(tree)
+        except _StopScan:
+            pass
         
         return issues
     
-    def validate_generic_code(self, content: str, language: str) -> List[Dict]:
+    def validate_generic_code(self, content: Union[str, bytes, mmap.mmap], language: str,
+                              newlines: Optional[List[int]] = None,
+                              early_exit: bool = False) -> List[Issue]:
         """
         Validate code using pattern matching for non-Python languages.
         
         Args:
-            content: Code content
+            content: Code content, as text, UTF-8 bytes or a mapped file
             language: Programming language
+            newlines: Precomputed newline offsets of content, if available
+            early_exit: Stop at the first high severity issue
             
         Returns:
             List of security issues found
         """
         issues = []
         
-        patterns = self.compiled_patterns.get(language, [])
-        pattern_strings = self.security_patterns.get(language, [])
-        
-        for i, pattern in enumerate(patterns):
-            matches = pattern.finditer(content)
-            for match in matches:
-                issues.append({
-                    "type": "dangerous_pattern",
-                    "language": language,
-                    "pattern": pattern_strings[i],
-                    "match": match.group(),
-                    "line": content[:match.start()].count('\n') + 1,
-                    "severity": self._get_pattern_severity(pattern_strings[i], language),
-                })
+        if language not in self.rules:
+            return issues
+        
+        # Issue dicts share these strings; the same few matches (unsafe.,
+        # http.Get, ...) recur throughout generated code
+        language = sys.intern(language)
+        
+        if isinstance(content, str):
+            content = content.encode('utf-8')
         
+        # A fail-fast scan looks for a high severity hit first; only a
+        # passing file needs the remaining patterns scanned for its report.
+        rules = self.fail_fast_rules[language] if early_exit else self.rules[language]
+        
+        prefilter = self.prefilter[language]
+        if prefilter is not None and isinstance(content, bytes):
+            # Hyperscan finds which patterns occur in one SIMD pass; the
+            # regex engine then only rescans those patterns, if any.
+            hits = set()
+            prefilter.scan(content, match_event_handler=(
+                lambda pattern_id, start, end, flags, context: hits.add(pattern_id)))
+            if not hits:
+                return issues
+            rules = [rule for rule in rules if rule.index in hits]
+        
+        if newlines is None:
+            newlines = _newline_offsets(content)
+        
+        _scan(rules, content, newlines, language, issues, early_exit)
         return issues
     
     def _get_pattern_severity(self, pattern: str, language: str) -> str:
@@ -250,100 +734,165 @@ class CodeSecurityValidator:
         Returns:
             Severity level: "high", "medium", or "low"
         """
-        # High severity patterns
-        high_severity = [
-            r'eval\s*\(',
-            r'exec\s*\(',
-            r'system\s*\(',
-            r'unsafe\s*\{',
-            r'innerHTML\s*=',
-        ]
+        severity = self.severity_by_pattern.get((language, pattern))
+        if severity is None:
+            severity = self._classify_pattern_severity(pattern)
+        return severity
+    
+    @staticmethod
+    def _classify_pattern_severity(pattern: str) -> str:
+        """
+        Classify a pattern string by severity.
         
-        for high_pattern in high_severity:
-            if pattern == high_pattern:
-                return "high"
+        Args:
+            pattern: Regex pattern to classify
+            
+        Returns:
+            Severity level: "high", "medium", or "low"
+        """
+        if pattern in _HIGH_SEVERITY_PATTERNS:
+            return "high"
         
         # Medium severity for file/network access
-        if any(keyword in pattern for keyword in ['/etc/', '/proc/', 'net\.', 'http\.']):
+        if any(keyword in pattern for keyword in _MEDIUM_SEVERITY_KEYWORDS):
             return "medium"
         
         return "low"
     
-    def validate_file_size(self, file_path: str) -> List[Dict]:
+    def validate_file_size(self, file_path: str) -> List[Issue]:
         """
         Check if generated file size is reasonable.
         
         Args:
             file_path: Path to the file
             
+        Returns:
+            List of size-related issues
+        """
+        try:
+            file_size = os.stat(file_path).st_size
+        except Exception as e:
+            return [Issue(
+                type="file_access_error",
+                file_path=file_path,
+                error=str(e),
+                severity="medium",
+            )]
+        
+        return self._check_size(file_size, file_path)
+    
+    def _check_size(self, file_size: int, file_path: str) -> List[Issue]:
+        """
+        Check a known file size against the size limits.
+        
+        Args:
+            file_size: Size of the file in bytes
+            file_path: Path to the file, for reporting
+            
         Returns:
             List of size-related issues
         """
         issues = []
         
-        try:
-            file_size = Path(file_path).stat().st_size
-            
-            # Flag extremely large files (>10MB)
-            if file_size > 10 * 1024 * 1024:
-                issues.append({
-                    "type": "large_file",
-                    "file_path": file_path,
-                    "size_bytes": file_size,
-                    "severity": "medium",
-                    "description": "Generated file is unusually large",
-                })
-            
-            # Flag empty files
-            if file_size == 0:
-                issues.append({
-                    "type": "empty_file",
-                    "file_path": file_path,
-                    "severity": "low",
-                    "description": "Generated file is empty",
-                })
+        # Flag extremely large files (>10MB)
+        if file_size > 10 * 1024 * 1024:
+            issues.append(Issue(
+                type="large_file",
+                file_path=file_path,
+                size_bytes=file_size,
+                severity="medium",
+                description="Generated file is unusually large",
+            ))
         
-        except Exception as e:
-            issues.append({
-                "type": "file_access_error",
-                "file_path": file_path,
-                "error": str(e),
-                "severity": "medium",
-            })
+        # Flag empty files
+        if file_size == 0:
+            issues.append(Issue(
+                type="empty_file",
+                file_path=file_path,
+                severity="low",
+                description="Generated file is empty",
+            ))
         
         return issues
     
-    def validate_file(self, file_path: str, language: str) -> Dict:
+    def validate_file(self, file_path: str, language: str,
+                      early_exit: bool = False) -> Dict:
         """
         Validate a single generated file for security issues.
         
         Args:
             file_path: Path to the file to validate
             language: Programming language of the file
+            early_exit: Stop scanning at the first high severity issue; the
+                issue lists are then incomplete for a failing file
             
         Returns:
             Dictionary containing validation results
         """
         issues = []
         
+        if self.strict_extensions and not _matches_language(file_path, language):
+            self.log(f"Skipping {file_path}: not a {language} file")
+            return {
+                "file_path": file_path,
+                "language": language,
+                "skipped": True,
+                "issues": [],
+                "high_severity_count": 0,
+                "medium_severity_count": 0,
+                "low_severity_count": 0,
+                "total_issues": 0,
+                "passed": True,
+            }
+        
         try:
-            # Read file content
-            with open(file_path, 'r', encoding='utf-8', errors='ignore') as f:
-                content = f.read()
+            with open(file_path, 'rb') as f:
+                # Large files for the regex-only languages are scanned
+                # straight from a read-only mapping; the AST needs a bytes
+                # copy anyway, so Python files are always read. RE2 is only
+                # given bytes.
+                file_size = os.fstat(f.fileno()).st_size
+                if (language != "python" and file_size >= _MMAP_THRESHOLD
+                        and language in self.rules
+                        and all(isinstance(rule.regex, re.Pattern)
+                                for rule in self.rules[language])):
+                    content = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+                else:
+                    content = f.read()
+                    file_size = len(content)
             
-            # Validate file size
-            issues.extend(self.validate_file_size(file_path))
-            
-            # Validate code content based on language
-            if language == "python":
-                issues.extend(self.validate_python_code(content))
-            else:
-                issues.extend(self.validate_generic_code(content, language))
+            try:
+                cache_path = cached = None
+                if self.cache_dir is not None:
+                    cache_path = self._cache_path(content, language, early_exit)
+                    cached = self._load_cached(cache_path, file_path)
+                
+                if cached is not None:
+                    self.log(f"Using cached result for {file_path}")
+                    issues = cached
+                else:
+                    # Validate file size
+                    issues.extend(self._check_size(file_size, file_path))
+                    
+                    # Validate code content based on language
+                    newlines = _newline_offsets(content)
+                    if language == "python":
+                        issues.extend(self.validate_python_code(
+                            content, newlines, early_exit=early_exit))
+                    else:
+                        issues.extend(self.validate_generic_code(
+                            content, language, newlines, early_exit=early_exit))
+                    
+                    if cache_path is not None:
+                        self._store_cached(cache_path, issues)
+            finally:
+                if isinstance(content, mmap.mmap):
+                    content.close()
             
             # Categorize by severity
-            high_severity = [issue for issue in issues if issue.get("severity") == "high"]
-            medium_severity = [issue for issue in issues if issue.get("severity") == "medium"]
-            low_severity = [issue for issue in issues if issue.get("severity") == "low"]
+            high_severity = [issue for issue in issues if issue.severity == "high"]
+            medium_severity = [issue for issue in issues if issue.severity == "medium"]
+            low_severity = [issue for issue in issues if issue.severity == "low"]
             
             return {
                 "file_path": file_path,
@@ -357,6 +906,7 @@ class CodeSecurityValidator:
                 "high_severity_issues": high_severity,
                 "medium_severity_issues": medium_severity,
                 "low_severity_issues": low_severity,
+                "stopped_early": early_exit and bool(high_severity),
             }
         
         except Exception as e:
@@ -367,45 +917,350 @@ class CodeSecurityValidator:
                 "passed": False,
             }
     
-    def validate_multiple_files(self, file_paths: List[str], language: str) -> Dict:
+    def _cache_path(self, content: Union[bytes, mmap.mmap], language: str,
+                    early_exit: bool) -> Path:
+        """
+        Return the cache file for a file's validation result.
+        
+        The key covers the content, the language, the fail-fast mode and the
+        validator version and patterns, so any change to those misses.
+        
+        Args:
+            content: File content
+            language: Programming language
+            early_exit: Whether the scan stops at the first high severity issue
+            
+        Returns:
+            Path of the cache entry
+        """
+        digest = hashlib.sha256(self.rules_digest)
+        digest.update(b'\x01' if early_exit else b'\x00')
+        digest.update(content)
+        return self.cache_dir / f"{digest.hexdigest()}-{language}.json"
+    
+    def _load_cached(self, cache_path: Path, file_path: str) -> Optional[List[Issue]]:
+        """
+        Load cached issues, rewriting file-level issues to file_path.
+        
+        Args:
+            cache_path: Path of the cache entry
+            file_path: Path of the file being validated
+            
+        Returns:
+            Cached issues, or None on a miss or unreadable entry
+        """
+        try:
+            data = _loads(cache_path.read_bytes())
+            issues = [Issue(**entry) for entry in data["issues"]]
+        except FileNotFoundError:
+            return None
+        except Exception as e:
+            self.log(f"Ignoring unreadable cache entry {cache_path}: {e}")
+            return None
+        
+        # The modification time records the last use, for prune_cache
+        try:
+            os.utime(cache_path)
+        except OSError:
+            pass
+        return [issue._replace(file_path=file_path) if issue.file_path is not None else issue
+                for issue in issues]
+    
+    def _store_cached(self, cache_path: Path, issues: List[Issue]) -> None:
+        """
+        Store issues in the cache, atomically; failures are only logged.
+        
+        Args:
+            cache_path: Path of the cache entry
+            issues: Issues found in the file
+        """
+        try:
+            cache_path.parent.mkdir(parents=True, exist_ok=True)
+            temp_path = cache_path.with_name(f"{cache_path.name}.{os.getpid()}.tmp")
+            temp_path.write_bytes(_dumps({"issues": [_issue_to_dict(issue) for issue in issues]}))
+            os.replace(temp_path, cache_path)
+        except OSError as e:
+            self.log(f"Failed to write cache entry {cache_path}: {e}")
+    
+    def prune_cache(self, max_bytes: int = CACHE_MAX_BYTES,
+                    max_age: float = CACHE_MAX_AGE_SECONDS) -> int:
+        """
+        Evict cache entries unused for max_age seconds, then the least
+        recently used ones until the cache fits in max_bytes.
+        
+        Args:
+            max_bytes: Maximum total size of the cache entries
+            max_age: Maximum time since an entry was last used, in seconds
+            
+        Returns:
+            Number of entries removed
+        """
+        if self.cache_dir is None:
+            return 0
+        
+        try:
+            entries = []
+            with os.scandir(self.cache_dir) as it:
+                for entry in it:
+                    if entry.is_file() and entry.name.endswith((".json", ".tmp")):
+                        stat = entry.stat()
+                        entries.append((stat.st_mtime, stat.st_size, entry.path))
+        except OSError as e:
+            self.log(f"Failed to list cache directory {self.cache_dir}: {e}")
+            return 0
+        
+        # Oldest first
+        entries.sort()
+        cutoff = time.time() - max_age
+        total = sum(size for _, size, _ in entries)
+        removed = 0
+        for mtime, size, path in entries:
+            if mtime >= cutoff and total <= max_bytes:
+                break
+            try:
+                os.unlink(path)
+            except OSError:
+                continue
+            total -= size
+            removed += 1
+        
+        if removed:
+            self.log(f"Pruned {removed} cache entries from {self.cache_dir}")
+        return removed
+    
+    def _worker_options(self) -> Dict[str, Any]:
+        """Return the constructor arguments for validators in worker processes."""
+        return {
+            "verbose": self.verbose,
+            "strict_extensions": self.strict_extensions,
+            "cache_dir": self.cache_dir,
+        }
+    
+    def validate_multiple_files(self, file_paths: List[str], language: str,
+                                early_exit: bool = False) -> Dict:
         """
         Validate multiple generated files for security issues.
         
         Args:
             file_paths: List of file paths to validate
             language: Programming language of the files
+            early_exit: Stop at the first high severity issue; files not
+                yet validated by then are left out of the results
             
         Returns:
             Dictionary containing comprehensive validation results
         """
-        all_results = []
-        overall_issues = []
-        
-        for file_path in file_paths:
-            result = self.validate_file(file_path, language)
-            all_results.append(result)
-            
-            if "issues" in result:
-                overall_issues.extend(result["issues"])
-        
-        # Calculate overall statistics
-        high_severity_count = sum(result.get("high_severity_count", 0) for result in all_results)
-        medium_severity_count = sum(result.get("medium_severity_count", 0) for result in all_results)
-        low_severity_count = sum(result.get("low_severity_count", 0) for result in all_results)
+        workers = min(len(file_paths), os.cpu_count() or 1)
+        if workers > 1 and not early_exit:
+            # Files are independent and the scan is CPU-bound (the AST pass
+            # holds the GIL), so spread them across processes.
+            self.log(f"Validating {len(file_paths)} files with {workers} processes")
+            chunksize = max(1, len(file_paths) // (workers * 4))
+            with ProcessPoolExecutor(max_workers=workers) as executor:
+                all_results = list(executor.map(
+                    _validate_one, file_paths, repeat(language),
+                    repeat(self._worker_options()), chunksize=chunksize,
+                ))
+        else:
+            indexed = dict(self.iter_file_results(file_paths, language, early_exit))
+            all_results = [indexed[index] for index in sorted(indexed)]
         
+        # The issues themselves stay in file_results rather than being
+        # copied into a second list
         return {
             "language": language,
             "file_count": len(file_paths),
             "file_results": all_results,
-            "overall_issues": overall_issues,
-            "high_severity_count": high_severity_count,
-            "medium_severity_count": medium_severity_count,
-            "low_severity_count": low_severity_count,
-            "total_issues": len(overall_issues),
-            "passed": high_severity_count == 0,
-            "files_passed": sum(1 for result in all_results if result.get("passed", False)),
-            "files_failed": sum(1 for result in all_results if not result.get("passed", True)),
+            **_summarize(all_results, len(file_paths)),
         }
+    
+    def iter_file_results(self, file_paths: List[str], language: str,
+                          early_exit: bool = False) -> Iterator[Tuple[int, Dict]]:
+        """
+        Validate files, yielding each result as soon as it is ready.
+        
+        With more than one CPU the files are validated in a process pool and
+        results arrive in completion order.
+        
+        Args:
+            file_paths: List of file paths to validate
+            language: Programming language of the files
+            early_exit: Stop after the first file with a high severity issue;
+                pending files are cancelled
+            
+        Yields:
+            Tuples of (index into file_paths, validation result)
+        """
+        workers = min(len(file_paths), os.cpu_count() or 1)
+        if workers <= 1:
+            for index, file_path in enumerate(file_paths):
+                result = self.validate_file(file_path, language, early_exit)
+                yield index, result
+                if early_exit and result.get("high_severity_count", 0):
+                    return
+            return
+        
+        self.log(f"Validating {len(file_paths)} files with {workers} processes")
+        with ProcessPoolExecutor(max_workers=workers) as executor:
+            futures = {
+                executor.submit(_validate_one, file_path, language,
+                                self._worker_options(), early_exit): index
+                for index, file_path in enumerate(file_paths)
+            }
+            for future in as_completed(futures):
+                result = future.result()
+                yield futures[future], result
+                if early_exit and result.get("high_severity_count", 0):
+                    self.log(f"High severity issue in {result['file_path']}, stopping")
+                    executor.shutdown(wait=True, cancel_futures=True)
+                    return
+
+
+def _summarize(results: Iterable[Dict], file_count: int) -> Dict:
+    """
+    Aggregate per-file results into the report totals in one pass.
+    
+    Args:
+        results: Per-file validation results
+        file_count: Number of files requested
+        
+    Returns:
+        Dictionary of overall counts and the pass/fail verdict
+    """
+    high = medium = low = total = passed = failed = validated = 0
+    for result in results:
+        validated += 1
+        high += result.get("high_severity_count", 0)
+        medium += result.get("medium_severity_count", 0)
+        low += result.get("low_severity_count", 0)
+        total += result.get("total_issues", 0)
+        if result.get("passed", False):
+            passed += 1
+        else:
+            failed += 1
+    
+    return {
+        "high_severity_count": high,
+        "medium_severity_count": medium,
+        "low_severity_count": low,
+        "total_issues": total,
+        "passed": high == 0,
+        "files_passed": passed,
+        "files_failed": failed,
+        "stopped_early": validated < file_count,
+    }
+
+
+def _validate_one(file_path: str, language: str, options: Dict[str, Any],
+                  early_exit: bool = False) -> Dict:
+    """Validate one file in a worker process."""
+    return CodeSecurityValidator(**options).validate_file(file_path, language, early_exit)
+
+
+def _loads(data: bytes) -> Any:
+    """Parse JSON bytes, with orjson when available."""
+    if ORJSON_AVAILABLE:
+        return orjson.loads(data)
+    return json.loads(data)
+
+
+def _dumps(obj: Any, pretty: bool = False) -> bytes:
+    """Serialize obj to JSON bytes, with orjson when available."""
+    if ORJSON_AVAILABLE:
+        return orjson.dumps(obj, option=orjson.OPT_INDENT_2 if pretty else 0)
+    if pretty:
+        return json.dumps(obj, indent=2).encode('utf-8')
+    return json.dumps(obj, separators=(',', ':')).encode('utf-8')
+
+
+# Per-file result keys holding lists of Issue
+_ISSUE_LIST_KEYS = ("issues", "high_severity_issues", "medium_severity_issues",
+                    "low_severity_issues")
+
+
+def _file_result_to_json(result: Dict) -> Dict:
+    """Return a per-file result with its issues converted to dicts."""
+    converted = dict(result)
+    for key in _ISSUE_LIST_KEYS:
+        if key in converted:
+            converted[key] = [_issue_to_dict(issue) for issue in converted[key]]
+    return converted
+
+
+def _write_report(result: Dict, output_path: Path, pretty: bool = False) -> None:
+    """
+    Write a validation report as JSON.
+    
+    file_results, the bulk of a large report, is serialized one file result
+    at a time instead of as one tree.
+    
+    Args:
+        result: Report from validate_multiple_files
+        output_path: Output file path
+        pretty: Indent the output
+    """
+    separator = b',\n' if pretty else b','
+    with open(output_path, 'wb') as f:
+        f.write(b'{')
+        for index, (key, value) in enumerate(result.items()):
+            if index:
+                f.write(separator)
+            f.write(_dumps(key) + b':')
+            if key == "file_results":
+                f.write(b'[')
+                for item_index, item in enumerate(value):
+                    if item_index:
+                        f.write(separator)
+                    f.write(_dumps(_file_result_to_json(item), pretty))
+                f.write(b']')
+            else:
+                f.write(_dumps(value, pretty))
+        f.write(b'}\n' if pretty else b'}')
+
+
+def _scan_timestamp() -> str:
+    """Return the current UTC time as an ISO 8601 timestamp."""
+    return datetime.now(timezone.utc).strftime('%Y-%m-%dT%H:%M:%SZ')
+
+
+def _stream_report(validator: "CodeSecurityValidator", file_paths: List[str],
+                   language: str, output_path: Path, early_exit: bool = False) -> Dict:
+    """
+    Validate files and write a JSON Lines report as results arrive.
+    
+    Each line is one file's result, in completion order. Results are
+    written and folded into the totals one at a time, so none are kept in
+    memory; the totals are written as JSON to output_path + ".summary".
+    
+    Args:
+        validator: Validator to use
+        file_paths: List of file paths to validate
+        language: Programming language of the files
+        output_path: JSON Lines output path
+        early_exit: Stop at the first high severity issue
+        
+    Returns:
+        The summary
+    """
+    def written_results():
+        for _, file_result in validator.iter_file_results(file_paths, language, early_exit):
+            f.write(_dumps(_file_result_to_json(file_result)) + b'\n')
+            f.flush()
+            yield file_result
+    
+    with open(output_path, 'wb') as f:
+        totals = _summarize(written_results(), len(file_paths))
+    
+    summary = {
+        "language": language,
+        "file_count": len(file_paths),
+        **totals,
+        "validator_version": VALIDATOR_VERSION,
+        "scan_timestamp": _scan_timestamp(),
+    }
+    summary_path = output_path.with_name(output_path.name + ".summary")
+    summary_path.write_bytes(_dumps(summary))
+    return summary
 
 
 def main():
@@ -413,27 +1268,49 @@ def main():
     parser = argparse.ArgumentParser(description="Validate generated code for security issues")
     parser.add_argument("--language", required=True, help="Programming language of the code")
     parser.add_argument("--input", action="append", required=True, help="Input file path (can be repeated)")
-    parser.add_argument("--output", required=True, help="Output security report file")
+    parser.add_argument("--output", required=True,
+                        help="Output security report file; a .jsonl path streams one line "
+                             "per file and writes the totals to <output>.summary")
     parser.add_argument("--verbose", "-v", action="store_true", help="Enable verbose output")
+    parser.add_argument("--fail-fast", action="store_true",
+                        help="Stop at the first high severity issue (the report is then partial)")
+    parser.add_argument("--cache-dir", type=Path,
+                        help="Directory for caching per-file results by content hash; "
+                             "results are not cached unless this is given")
+    parser.add_argument("--strict-ext", action=argparse.BooleanOptionalAction, default=True,
+                        help="Skip inputs whose extension or shebang is not of --language "
+                             "(default: on)")
     
     args = parser.parse_args()
     
     try:
-        validator = CodeSecurityValidator(verbose=args.verbose)
-        
-        # Validate files
-        result = validator.validate_multiple_files(args.input, args.language)
-        
-        # Add metadata
-        result["validator_version"] = "1.0.0"
-        result["scan_timestamp"] = "$(date -u +%Y-%m-%dT%H:%M:%SZ)"
+        validator = CodeSecurityValidator(
+            verbose=args.verbose,
+            strict_extensions=args.strict_ext,
+            cache_dir=args.cache_dir,
+        )
         
-        # Write results to output file
         output_path = Path(args.output)
         output_path.parent.mkdir(parents=True, exist_ok=True)
         
-        with open(output_path, 'w') as f:
-            json.dump(result, f, indent=2)
+        if output_path.suffix == ".jsonl":
+            # Stream one line per file as results arrive and keep only the
+            # totals; the summary goes next to the output
+            result = _stream_report(validator, args.input, args.language,
+                                    output_path, early_exit=args.fail_fast)
+        else:
+            # Validate files
+            result = validator.validate_multiple_files(
+                args.input, args.language, early_exit=args.fail_fast)
+            
+            # Add metadata
+            result["validator_version"] = VALIDATOR_VERSION
+            result["scan_timestamp"] = _scan_timestamp()
+            
+            # Write results to output file
+            _write_report(result, output_path, pretty=args.verbose)
+        
+        validator.prune_cache()
         
         # Exit with appropriate code
         if result.get("passed", False):
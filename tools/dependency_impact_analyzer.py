@@ -8,15 +8,27 @@ proactive coordination and migration planning.
 """
 
 import argparse
+import contextlib
 import json
 import os
+import sqlite3
+import sys
+import tempfile
 import time
 import uuid
-from dataclasses import dataclass, asdict, field
+from collections import deque
+from dataclasses import dataclass, field
 from pathlib import Path
 from typing import Dict, List, Optional, Set, Union, Any, Tuple
 import logging
 
+try:
+    import orjson
+    ORJSON_AVAILABLE = True
+except ImportError:
+    ORJSON_AVAILABLE = False
+    orjson = None
+
 # Local imports
 from .bsr_auth import BSRAuthenticator, BSRCredentials
 from .bsr_teams import BSRTeamManager, Team
@@ -27,8 +39,18 @@ from .schema_governance_engine import SchemaChange
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
+# Impact levels in increasing order of severity
+_LEVEL_NAME = ["none", "low", "medium", "high", "critical"]
+_LEVEL_CODE = {name: code for code, name in enumerate(_LEVEL_NAME)}
+
+# Shared default for catalog lookups that miss; never mutated
+_EMPTY: Dict[str, Any] = {}
+
+# Slotted dataclasses need Python 3.10+
+_DATACLASS_SLOTS = {'slots': True} if sys.version_info >= (3, 10) else {}
 
-@dataclass
+
+@dataclass(**_DATACLASS_SLOTS)
 class ServiceDependency:
     """Represents a service dependency on a schema."""
     service_name: str
@@ -41,9 +63,24 @@ class ServiceDependency:
     contact_info: Optional[Dict[str, str]] = None
     migration_complexity: str = "unknown"  # "trivial", "simple", "moderate", "complex", "critical"
     last_updated: str = field(default_factory=lambda: time.strftime('%Y-%m-%dT%H:%M:%SZ'))
+    
+    def to_dict(self) -> Dict[str, Any]:
+        """Convert to dictionary for serialization."""
+        return {
+            'service_name': self.service_name,
+            'service_repository': self.service_repository,
+            'dependency_type': self.dependency_type,
+            'usage_pattern': self.usage_pattern,
+            'schema_files': list(self.schema_files),
+            'dependency_strength': self.dependency_strength,
+            'team_owner': self.team_owner,
+            'contact_info': dict(self.contact_info) if self.contact_info is not None else None,
+            'migration_complexity': self.migration_complexity,
+            'last_updated': self.last_updated,
+        }
 
 
-@dataclass
+@dataclass(**_DATACLASS_SLOTS)
 class DependencyGraph:
     """Represents a complete dependency graph for schema analysis."""
     schema_target: str
@@ -55,7 +92,7 @@ class DependencyGraph:
     generated_at: str = field(default_factory=lambda: time.strftime('%Y-%m-%dT%H:%M:%SZ'))
 
 
-@dataclass
+@dataclass(**_DATACLASS_SLOTS)
 class TeamImpact:
     """Represents the impact of a change on a specific team."""
     team_name: str
@@ -69,7 +106,7 @@ class TeamImpact:
     contact_priority: str = "normal"  # "low", "normal", "high", "urgent"
 
 
-@dataclass
+@dataclass(**_DATACLASS_SLOTS)
 class CrossSystemImpact:
     """Represents impact across different systems and boundaries."""
     affected_systems: List[str] = field(default_factory=list)
@@ -79,7 +116,7 @@ class CrossSystemImpact:
     coordination_requirements: List[str] = field(default_factory=list)
 
 
-@dataclass
+@dataclass(**_DATACLASS_SLOTS)
 class MigrationPlan:
     """Comprehensive migration plan for schema changes."""
     change_id: str
@@ -91,6 +128,112 @@ class MigrationPlan:
     communication_plan: Dict[str, Any] = field(default_factory=dict)
     timeline: Dict[str, str] = field(default_factory=dict)
     risk_assessment: Dict[str, Any] = field(default_factory=dict)
+    
+    def to_dict(self) -> Dict[str, Any]:
+        """Convert to dictionary for serialization."""
+        return {
+            'change_id': self.change_id,
+            'migration_strategy': self.migration_strategy,
+            'phases': self.phases,
+            'dependencies_order': self.dependencies_order,
+            'rollback_plan': self.rollback_plan,
+            'testing_strategy': self.testing_strategy,
+            'communication_plan': self.communication_plan,
+            'timeline': self.timeline,
+            'risk_assessment': self.risk_assessment,
+        }
+
+
+def _loads(data: Union[str, bytes]) -> Any:
+    """Parse JSON, with orjson when available."""
+    if ORJSON_AVAILABLE:
+        return orjson.loads(data)
+    return json.loads(data)
+
+
+def _dumps(obj: Any, pretty: bool = False) -> bytes:
+    """Serialize obj to JSON bytes, with orjson when available."""
+    if ORJSON_AVAILABLE:
+        option = orjson.OPT_NON_STR_KEYS
+        if pretty:
+            option |= orjson.OPT_INDENT_2
+        return orjson.dumps(obj, option=option)
+    if pretty:
+        return json.dumps(obj, indent=2).encode('utf-8')
+    return json.dumps(obj, separators=(',', ':')).encode('utf-8')
+
+
+def _toposort(matrix: Dict[str, List[str]]) -> List[str]:
+    """
+    Order the nodes of a dependency matrix so each node precedes its edges.
+    
+    Uses Kahn's algorithm. When a cycle leaves no node with in-degree zero,
+    the unplaced node with the fewest edges from other unplaced nodes is
+    placed next, and the sort continues from there. Ties go to the node
+    seen first, so the order is deterministic.
+    """
+    nodes: Dict[str, None] = {}
+    for node, edges in matrix.items():
+        nodes[node] = None
+        for target in edges:
+            nodes[target] = None
+    
+    in_degree = dict.fromkeys(nodes, 0)
+    for edges in matrix.values():
+        for target in edges:
+            in_degree[target] += 1
+    
+    ready = deque(node for node in nodes if in_degree[node] == 0)
+    placed: Set[str] = set()
+    order = []
+    while len(order) < len(nodes):
+        if not ready:
+            # Cycle: break it at the least constrained remaining node
+            ready.append(min(
+                (node for node in nodes if node not in placed),
+                key=in_degree.__getitem__
+            ))
+        
+        node = ready.popleft()
+        if node in placed:
+            continue
+        placed.add(node)
+        order.append(node)
+        
+        for target in matrix.get(node, ()):
+            in_degree[target] -= 1
+            if in_degree[target] == 0 and target not in placed:
+                ready.append(target)
+    
+    return order
+
+
+def _atomic_write(path: Path, data: bytes) -> None:
+    """
+    Replace path with data so readers never see a partially written file.
+    
+    The data goes to a temporary file in the same directory, which is then
+    renamed over path. The temporary file is given the mode of the file it
+    replaces (or the umask default for a new file) since mkstemp creates it
+    owner-only.
+    """
+    try:
+        mode = os.stat(path).st_mode & 0o7777
+    except FileNotFoundError:
+        umask = os.umask(0)
+        os.umask(umask)
+        mode = 0o666 & ~umask
+    fd, temp_path = tempfile.mkstemp(
+        dir=path.parent, prefix=f".{path.stem}-", suffix=f"{path.suffix}.tmp"
+    )
+    try:
+        os.fchmod(fd, mode)
+        with os.fdopen(fd, 'wb') as f:
+            f.write(data)
+        os.replace(temp_path, path)
+    except BaseException:
+        Path(temp_path).unlink(missing_ok=True)
+        raise
 
 
 class DependencyAnalysisError(Exception):
@@ -131,6 +274,7 @@ class DependencyImpactAnalyzer:
         self.verbose = verbose
         
         # Storage files
+        self.dependency_db_file = self.storage_dir / "deps.db"
         self.dependency_registry_file = self.storage_dir / "dependency_registry.json"
         self.service_catalog_file = self.storage_dir / "service_catalog.json"
         self.analysis_cache_file = self.storage_dir / "analysis_cache.json"
@@ -146,61 +290,164 @@ class DependencyImpactAnalyzer:
         self.dependency_registry = self._load_dependency_registry()
         self.service_catalog = self._load_service_catalog()
         
+        # Maps a service name or repository to the (schema_target, dependency)
+        # registrations that mention it, for reverse dependency lookups.
+        self._reverse_index: Dict[str, List[Tuple[str, ServiceDependency]]] = {}
+        for schema_target, dependencies in self.dependency_registry.items():
+            for dependency in dependencies:
+                self._index_dependency(schema_target, dependency)
+        
+        # Analysis results are memoized per registry version; every mutator
+        # bumps the version and drops the stale entries.
+        self._registry_version = 0
+        self._graph_cache: Dict[Tuple[str, int], DependencyGraph] = {}
+        self._affected_services_cache: Dict[Tuple[str, bool, int], List[Dict[str, Any]]] = {}
+        self._team_impacts_cache: Dict[Tuple[str, bool, int], List[TeamImpact]] = {}
+        
         logger.info(f"Dependency Impact Analyzer initialized")
 
     def _init_storage(self) -> None:
         """Initialize storage files."""
-        for file_path in [self.dependency_registry_file, self.service_catalog_file,
-                         self.analysis_cache_file, self.migration_plans_file]:
-            if not file_path.exists():
-                with open(file_path, 'w') as f:
-                    json.dump({}, f)
+        existing = {path.name for path in self.storage_dir.iterdir()}
+        for file_path in (self.service_catalog_file, self.analysis_cache_file,
+                          self.migration_plans_file):
+            if file_path.name not in existing:
+                file_path.write_bytes(b'{}')
+        
+        if self.dependency_db_file.name not in existing:
+            with self._connect() as conn:
+                conn.execute("""
+                    CREATE TABLE IF NOT EXISTS deps (
+                        schema_target TEXT NOT NULL,
+                        service_name TEXT NOT NULL,
+                        payload TEXT NOT NULL,
+                        PRIMARY KEY (schema_target, service_name)
+                    )
+                """)
+        
+        self._import_legacy_registry(existing)
+
+    def _import_legacy_registry(self, existing: Set[str]) -> None:
+        """Move a registry left by the old JSON store into the database."""
+        if self.dependency_registry_file.name not in existing:
+            return
+        
+        try:
+            registry_data = _loads(self.dependency_registry_file.read_bytes())
+            rows = [
+                (schema_target, dep_data["service_name"],
+                 _dumps(dep_data).decode('utf-8'))
+                for schema_target, dependencies_data in registry_data.items()
+                for dep_data in dependencies_data
+            ]
+        except (json.JSONDecodeError, AttributeError, KeyError, TypeError) as e:
+            # Keep the unreadable registry around for manual recovery
+            backup_file = self.dependency_registry_file.with_name(
+                self.dependency_registry_file.name + ".bak"
+            )
+            self.dependency_registry_file.replace(backup_file)
+            logger.error(
+                f"Could not import {self.dependency_registry_file}: {e}; "
+                f"moved it to {backup_file}"
+            )
+            return
+        
+        try:
+            with self._connect() as conn:
+                conn.executemany(
+                    "INSERT OR IGNORE INTO deps (schema_target, service_name, payload) "
+                    "VALUES (?, ?, ?)",
+                    rows
+                )
+        except sqlite3.Error as e:
+            logger.error(f"Failed to import {self.dependency_registry_file}: {e}")
+            return
+        
+        logger.info(f"Imported {len(rows)} dependencies from {self.dependency_registry_file}")
+        self.dependency_registry_file.unlink()
+
+    @contextlib.contextmanager
+    def _connect(self):
+        """
+        Open the dependency database for one transaction.
+        
+        Commits on success, rolls back on error and always closes the
+        connection, which sqlite3's own context manager does not do.
+        """
+        with contextlib.closing(sqlite3.connect(self.dependency_db_file)) as conn:
+            with conn:
+                yield conn
 
     def _load_dependency_registry(self) -> Dict[str, List[ServiceDependency]]:
         """Load dependency registry from storage."""
+        registry = {}
         try:
-            with open(self.dependency_registry_file, 'r') as f:
-                registry_data = json.load(f)
-            
-            registry = {}
-            for schema_target, dependencies_data in registry_data.items():
-                dependencies = []
-                for dep_data in dependencies_data:
-                    dependencies.append(ServiceDependency(**dep_data))
-                registry[schema_target] = dependencies
-            
-            return registry
-        except (FileNotFoundError, json.JSONDecodeError):
+            with self._connect() as conn:
+                for schema_target, payload in conn.execute(
+                    "SELECT schema_target, payload FROM deps ORDER BY rowid"
+                ):
+                    registry.setdefault(schema_target, []).append(
+                        ServiceDependency(**_loads(payload))
+                    )
+        except (sqlite3.Error, json.JSONDecodeError) as e:
+            logger.error(f"Failed to load dependency registry: {e}")
             return {}
+        
+        return registry
 
-    def _save_dependency_registry(self, registry: Dict[str, List[ServiceDependency]]) -> None:
-        """Save dependency registry to storage."""
+    def _upsert_dependency(self, schema_target: str, dependency: ServiceDependency) -> None:
+        """Write a single dependency row to storage."""
         try:
-            registry_data = {}
-            for schema_target, dependencies in registry.items():
-                registry_data[schema_target] = [asdict(dep) for dep in dependencies]
-            
-            with open(self.dependency_registry_file, 'w') as f:
-                json.dump(registry_data, f, indent=2)
-        except Exception as e:
+            payload = _dumps(dependency.to_dict()).decode('utf-8')
+            with self._connect() as conn:
+                conn.execute(
+                    "INSERT INTO deps (schema_target, service_name, payload) "
+                    "VALUES (?, ?, ?) "
+                    "ON CONFLICT (schema_target, service_name) "
+                    "DO UPDATE SET payload = excluded.payload",
+                    (schema_target, dependency.service_name, payload)
+                )
+        except sqlite3.Error as e:
             logger.error(f"Failed to save dependency registry: {e}")
 
     def _load_service_catalog(self) -> Dict[str, Dict[str, Any]]:
         """Load service catalog from storage."""
         try:
-            with open(self.service_catalog_file, 'r') as f:
-                return json.load(f)
+            return _loads(self.service_catalog_file.read_bytes())
         except (FileNotFoundError, json.JSONDecodeError):
             return {}
 
     def _save_service_catalog(self, catalog: Dict[str, Dict[str, Any]]) -> None:
         """Save service catalog to storage."""
         try:
-            with open(self.service_catalog_file, 'w') as f:
-                json.dump(catalog, f, indent=2)
+            _atomic_write(self.service_catalog_file, _dumps(catalog, pretty=self.verbose))
         except Exception as e:
             logger.error(f"Failed to save service catalog: {e}")
 
+    def _bump_registry_version(self) -> None:
+        """Invalidate memoized analysis after the registry or catalog changes."""
+        self._registry_version += 1
+        self._graph_cache.clear()
+        self._affected_services_cache.clear()
+        self._team_impacts_cache.clear()
+
+    def _index_dependency(self, schema_target: str, dependency: ServiceDependency) -> None:
+        """Add a registration to the reverse dependency index."""
+        entry = (schema_target, dependency)
+        for key in {dependency.service_name, dependency.service_repository}:
+            self._reverse_index.setdefault(key, []).append(entry)
+
+    def _unindex_dependency(self, schema_target: str, dependency: ServiceDependency) -> None:
+        """Remove a registration from the reverse dependency index."""
+        for key in {dependency.service_name, dependency.service_repository}:
+            entries = self._reverse_index.get(key, [])
+            entries[:] = [
+                (target, dep) for target, dep in entries
+                if not (target == schema_target and dep is dependency)
+            ]
+            if not entries:
+                self._reverse_index.pop(key, None)
+
     def register_service_dependency(self,
                                   schema_target: str,
                                   service_dependency: ServiceDependency) -> None:
@@ -222,13 +469,16 @@ class DependencyImpactAnalyzer:
                 break
         
         if existing_idx is not None:
+            self._unindex_dependency(schema_target, self.dependency_registry[schema_target][existing_idx])
             self.dependency_registry[schema_target][existing_idx] = service_dependency
             logger.info(f"Updated dependency: {service_dependency.service_name} -> {schema_target}")
         else:
             self.dependency_registry[schema_target].append(service_dependency)
             logger.info(f"Registered dependency: {service_dependency.service_name} -> {schema_target}")
         
-        self._save_dependency_registry(self.dependency_registry)
+        self._index_dependency(schema_target, service_dependency)
+        self._upsert_dependency(schema_target, service_dependency)
+        self._bump_registry_version()
 
     def register_service(self,
                         service_name: str,
@@ -240,13 +490,15 @@ class DependencyImpactAnalyzer:
             service_name: Name of the service
             service_info: Service metadata and configuration
         """
+        now = time.strftime('%Y-%m-%dT%H:%M:%SZ')
         self.service_catalog[service_name] = {
             **service_info,
-            "registered_at": time.strftime('%Y-%m-%dT%H:%M:%SZ'),
-            "last_updated": time.strftime('%Y-%m-%dT%H:%M:%SZ')
+            "registered_at": now,
+            "last_updated": now
         }
         
         self._save_service_catalog(self.service_catalog)
+        self._bump_registry_version()
         logger.info(f"Registered service: {service_name}")
 
     def analyze_dependency_graph(self, schema_target: str) -> DependencyGraph:
@@ -257,13 +509,19 @@ class DependencyImpactAnalyzer:
             schema_target: Schema target to analyze
             
         Returns:
-            Complete dependency graph
+            Complete dependency graph. The result is shared between callers
+            until the registry changes and must not be modified.
         """
+        cache_key = (schema_target, self._registry_version)
+        cached = self._graph_cache.get(cache_key)
+        if cached is not None:
+            return cached
+        
         graph = DependencyGraph(schema_target=schema_target)
         
         # Get direct dependencies
         direct_deps = self.dependency_registry.get(schema_target, [])
-        graph.direct_dependencies = direct_deps
+        graph.direct_dependencies = list(direct_deps)
         
         # Analyze transitive dependencies
         graph.transitive_dependencies = self._analyze_transitive_dependencies(schema_target, direct_deps)
@@ -274,14 +532,24 @@ class DependencyImpactAnalyzer:
         # Build dependency matrix for visualization
         graph.dependency_matrix = self._build_dependency_matrix(schema_target, graph)
         
-        # Add analysis metadata
+        # Add analysis metadata, counting teams and critical dependencies in one pass
+        teams = set()
+        critical_deps = 0
+        for dep in graph.direct_dependencies:
+            if dep.team_owner:
+                teams.add(dep.team_owner)
+            if dep.dependency_strength == "critical":
+                critical_deps += 1
+        
         graph.analysis_metadata = {
             "total_affected_services": len(graph.direct_dependencies) + len(graph.transitive_dependencies),
-            "critical_dependencies": len([d for d in graph.direct_dependencies if d.dependency_strength == "critical"]),
-            "teams_affected": len(set([d.team_owner for d in graph.direct_dependencies if d.team_owner])),
-            "complexity_score": self._calculate_complexity_score(graph)
+            "critical_dependencies": critical_deps,
+            "teams_affected": len(teams),
+            "complexity_score": self._calculate_complexity_score(graph, critical_deps, len(teams)),
+            "topological_order": _toposort(graph.dependency_matrix)
         }
         
+        self._graph_cache[cache_key] = graph
         return graph
 
     def identify_affected_services(self, 
@@ -295,8 +563,15 @@ class DependencyImpactAnalyzer:
             breaking_changes: List of breaking changes (if any)
             
         Returns:
-            List of affected services with impact details
+            List of affected services with impact details. The list is a new
+            copy but the service entries are shared and must not be modified.
         """
+        # Service impact only depends on whether there are breaking changes
+        cache_key = (schema_target, bool(breaking_changes), self._registry_version)
+        cached = self._affected_services_cache.get(cache_key)
+        if cached is not None:
+            return list(cached)
+        
         affected_services = []
         
         # Get dependency graph
@@ -310,10 +585,10 @@ class DependencyImpactAnalyzer:
             affected_services.append(service_impact)
         
         # Sort by impact severity
-        severity_order = {"critical": 0, "high": 1, "medium": 2, "low": 3, "none": 4}
-        affected_services.sort(key=lambda s: severity_order.get(s.get("impact_level", "none"), 4))
+        affected_services.sort(key=lambda s: -_LEVEL_CODE.get(s.get("impact_level", "none"), 0))
         
-        return affected_services
+        self._affected_services_cache[cache_key] = affected_services
+        return list(affected_services)
 
     def analyze_team_impacts(self,
                            schema_target: str,
@@ -326,9 +601,16 @@ class DependencyImpactAnalyzer:
             breaking_changes: List of breaking changes
             
         Returns:
-            List of team impacts
+            List of team impacts. The list is a new copy but the team impacts
+            are shared and must not be modified.
         """
+        cache_key = (schema_target, bool(breaking_changes), self._registry_version)
+        cached = self._team_impacts_cache.get(cache_key)
+        if cached is not None:
+            return list(cached)
+        
         team_impacts = {}
+        team_levels: Dict[str, int] = {}
         
         # Get affected services
         affected_services = self.identify_affected_services(schema_target, breaking_changes)
@@ -344,6 +626,7 @@ class DependencyImpactAnalyzer:
                     team_name=team_name,
                     impact_level="none"
                 )
+                team_levels[team_name] = 0
             
             team_impact = team_impacts[team_name]
             
@@ -351,10 +634,9 @@ class DependencyImpactAnalyzer:
             team_impact.affected_services.append(service_info["service_name"])
             
             # Update impact level (take highest)
-            current_level = team_impact.impact_level
-            service_level = service_info.get("impact_level", "none")
-            if self._compare_impact_levels(service_level, current_level) > 0:
-                team_impact.impact_level = service_level
+            service_code = _LEVEL_CODE.get(service_info.get("impact_level", "none"), 0)
+            if service_code > team_levels[team_name]:
+                team_levels[team_name] = service_code
             
             # Add required actions
             if service_info.get("migration_required"):
@@ -375,7 +657,8 @@ class DependencyImpactAnalyzer:
                 ])
         
         # Generate mitigation strategies for each team
-        for team_impact in team_impacts.values():
+        for team_name, team_impact in team_impacts.items():
+            team_impact.impact_level = _LEVEL_NAME[team_levels[team_name]]
             team_impact.mitigation_strategies = self._generate_mitigation_strategies(team_impact)
             
             # Set contact priority based on impact
@@ -384,6 +667,7 @@ class DependencyImpactAnalyzer:
             elif team_impact.impact_level == "medium":
                 team_impact.contact_priority = "high"
         
+        self._team_impacts_cache[cache_key] = list(team_impacts.values())
         return list(team_impacts.values())
 
     def analyze_cross_system_impact(self,
@@ -405,11 +689,11 @@ class DependencyImpactAnalyzer:
         dependency_graph = self.analyze_dependency_graph(schema_target)
         
         # Identify affected systems
+        catalog = self.service_catalog
+        catalog_get = catalog.get
         systems = set()
         for dependency in dependency_graph.direct_dependencies + dependency_graph.transitive_dependencies:
-            service_info = self.service_catalog.get(dependency.service_name, {})
-            system = service_info.get("system", "unknown")
-            systems.add(system)
+            systems.add(catalog_get(dependency.service_name, _EMPTY).get("system", "unknown"))
         
         impact.affected_systems = list(systems)
         
@@ -426,7 +710,7 @@ class DependencyImpactAnalyzer:
         # Identify external dependencies (services not in our catalog)
         external_deps = []
         for dependency in dependency_graph.direct_dependencies:
-            if dependency.service_name not in self.service_catalog:
+            if dependency.service_name not in catalog:
                 external_deps.append(dependency.service_name)
         
         impact.external_dependencies = external_deps
@@ -553,49 +837,55 @@ class DependencyImpactAnalyzer:
                                        schema_target: str,
                                        direct_deps: List[ServiceDependency]) -> List[ServiceDependency]:
         """Analyze transitive dependencies."""
-        transitive_deps = []
+        # Keyed by service name so services reachable through several schemas
+        # are reported once. Services already depending directly are skipped.
+        transitive_deps: Dict[str, ServiceDependency] = {}
+        direct_names = {dep.service_name for dep in direct_deps}
+        now = time.strftime('%Y-%m-%dT%H:%M:%SZ')
+        catalog_get = self.service_catalog.get
+        registry_get = self.dependency_registry.get
         
         # For each direct dependency, check if it has dependencies on other schemas
         for dep in direct_deps:
-            service_info = self.service_catalog.get(dep.service_name, {})
-            service_dependencies = service_info.get("schema_dependencies", [])
+            service_dependencies = catalog_get(dep.service_name, _EMPTY).get("schema_dependencies", ())
             
             for schema_dep in service_dependencies:
                 if schema_dep != schema_target:  # Avoid circular references
                     # Check if this schema has dependencies
-                    indirect_deps = self.dependency_registry.get(schema_dep, [])
+                    indirect_deps = registry_get(schema_dep, ())
                     for indirect_dep in indirect_deps:
-                        if indirect_dep.service_name != dep.service_name:  # Avoid self-reference
-                            transitive_dep = ServiceDependency(
-                                service_name=indirect_dep.service_name,
-                                service_repository=indirect_dep.service_repository,
-                                dependency_type="transitive",
-                                usage_pattern=indirect_dep.usage_pattern,
-                                dependency_strength="weak",  # Transitive deps are typically weaker
-                                team_owner=indirect_dep.team_owner
-                            )
-                            transitive_deps.append(transitive_dep)
-        
-        return transitive_deps
+                        name = indirect_dep.service_name
+                        if name in direct_names or name in transitive_deps:
+                            continue
+                        transitive_deps[name] = ServiceDependency(
+                            service_name=name,
+                            service_repository=indirect_dep.service_repository,
+                            dependency_type="transitive",
+                            usage_pattern=indirect_dep.usage_pattern,
+                            dependency_strength="weak",  # Transitive deps are typically weaker
+                            team_owner=indirect_dep.team_owner,
+                            last_updated=now
+                        )
+        
+        return list(transitive_deps.values())
 
     def _analyze_reverse_dependencies(self, schema_target: str) -> List[ServiceDependency]:
         """Analyze reverse dependencies (what this schema depends on)."""
         reverse_deps = []
-        
-        # Look through all dependency registrations to find what this schema depends on
-        for target, dependencies in self.dependency_registry.items():
-            for dep in dependencies:
-                if dep.service_name in schema_target or schema_target in dep.service_repository:
-                    # This is a potential reverse dependency
-                    reverse_dep = ServiceDependency(
-                        service_name=target,
-                        service_repository=target,
-                        dependency_type="reverse",
-                        usage_pattern="producer",  # This schema produces for others
-                        dependency_strength=dep.dependency_strength,
-                        team_owner=dep.team_owner
-                    )
-                    reverse_deps.append(reverse_dep)
+        now = time.strftime('%Y-%m-%dT%H:%M:%SZ')
+        
+        # Registrations whose service name or repository is this schema
+        for target, dep in self._reverse_index.get(schema_target, ()):
+            reverse_dep = ServiceDependency(
+                service_name=target,
+                service_repository=target,
+                dependency_type="reverse",
+                usage_pattern="producer",  # This schema produces for others
+                dependency_strength=dep.dependency_strength,
+                team_owner=dep.team_owner,
+                last_updated=now
+            )
+            reverse_deps.append(reverse_dep)
         
         return reverse_deps
 
@@ -607,15 +897,28 @@ class DependencyImpactAnalyzer:
         matrix[schema_target] = [dep.service_name for dep in graph.direct_dependencies]
         
         # Add transitive relationships
+        catalog_get = self.service_catalog.get
         for dep in graph.direct_dependencies:
-            service_info = self.service_catalog.get(dep.service_name, {})
-            service_deps = service_info.get("schema_dependencies", [])
-            matrix[dep.service_name] = service_deps
+            matrix[dep.service_name] = list(
+                catalog_get(dep.service_name, _EMPTY).get("schema_dependencies", ())
+            )
         
         return matrix
 
-    def _calculate_complexity_score(self, graph: DependencyGraph) -> int:
-        """Calculate complexity score based on dependency graph."""
+    def _ordered_direct_dependencies(self, graph: DependencyGraph) -> List[ServiceDependency]:
+        """Return direct dependencies in the graph's topological order."""
+        order = graph.analysis_metadata.get("topological_order", ())
+        position = {node: index for index, node in enumerate(order)}
+        return sorted(
+            graph.direct_dependencies,
+            key=lambda dep: position.get(dep.service_name, len(position))
+        )
+
+    def _calculate_complexity_score(self,
+                                  graph: DependencyGraph,
+                                  critical_deps: int,
+                                  teams_affected: int) -> int:
+        """Calculate complexity score based on dependency graph and its counters."""
         score = 0
         
         # Base score from number of dependencies
@@ -623,12 +926,10 @@ class DependencyImpactAnalyzer:
         score += len(graph.transitive_dependencies) * 0.5
         
         # Add score for critical dependencies
-        critical_deps = len([d for d in graph.direct_dependencies if d.dependency_strength == "critical"])
         score += critical_deps * 2
         
         # Add score for team diversity
-        teams = set([d.team_owner for d in graph.direct_dependencies if d.team_owner])
-        score += len(teams) * 0.5
+        score += teams_affected * 0.5
         
         return int(score)
 
@@ -664,11 +965,6 @@ class DependencyImpactAnalyzer:
         
         return impact
 
-    def _compare_impact_levels(self, level1: str, level2: str) -> int:
-        """Compare two impact levels. Returns >0 if level1 > level2."""
-        levels = {"none": 0, "low": 1, "medium": 2, "high": 3, "critical": 4}
-        return levels.get(level1, 0) - levels.get(level2, 0)
-
     def _generate_mitigation_strategies(self, team_impact: TeamImpact) -> List[str]:
         """Generate mitigation strategies for team impact."""
         strategies = []
@@ -756,13 +1052,14 @@ class DependencyImpactAnalyzer:
                                migration_strategy: str) -> List[Dict[str, Any]]:
         """Create migration phases based on strategy and dependencies."""
         phases = []
+        ordered_deps = self._ordered_direct_dependencies(dependency_graph)
         
         if migration_strategy == "immediate":
             phases.append({
                 "phase": 1,
                 "name": "Immediate Migration",
                 "description": "Deploy all changes simultaneously",
-                "services": [dep.service_name for dep in dependency_graph.direct_dependencies],
+                "services": [dep.service_name for dep in ordered_deps],
                 "duration": "1-2 hours",
                 "parallel": True
             })
@@ -770,17 +1067,17 @@ class DependencyImpactAnalyzer:
         elif migration_strategy == "phased":
             # Group services by impact level and dependency strength
             critical_services = [
-                dep.service_name for dep in dependency_graph.direct_dependencies
+                dep.service_name for dep in ordered_deps
                 if dep.dependency_strength == "critical"
             ]
             
             high_impact_services = [
-                dep.service_name for dep in dependency_graph.direct_dependencies
+                dep.service_name for dep in ordered_deps
                 if dep.dependency_strength in ["strong", "medium"] and dep.service_name not in critical_services
             ]
             
             low_impact_services = [
-                dep.service_name for dep in dependency_graph.direct_dependencies
+                dep.service_name for dep in ordered_deps
                 if dep.dependency_strength == "weak" and dep.service_name not in critical_services + high_impact_services
             ]
             
@@ -817,7 +1114,7 @@ class DependencyImpactAnalyzer:
         elif migration_strategy == "coordinated":
             # Group by teams for coordinated migration
             team_services = {}
-            for dep in dependency_graph.direct_dependencies:
+            for dep in ordered_deps:
                 if dep.team_owner:
                     if dep.team_owner not in team_services:
                         team_services[dep.team_owner] = []
@@ -840,10 +1137,11 @@ class DependencyImpactAnalyzer:
                                  dependency_graph: DependencyGraph,
                                  team_impacts: List[TeamImpact]) -> List[str]:
         """Calculate optimal migration order."""
-        # Sort by dependency strength and impact level
+        # Sort by dependency strength and impact level; ties keep the
+        # topological order
         services = []
         
-        for dep in dependency_graph.direct_dependencies:
+        for dep in self._ordered_direct_dependencies(dependency_graph):
             priority_score = 0
             
             # Score based on dependency strength
@@ -854,8 +1152,7 @@ class DependencyImpactAnalyzer:
             if dep.team_owner:
                 team_impact = next((t for t in team_impacts if t.team_name == dep.team_owner), None)
                 if team_impact:
-                    impact_scores = {"critical": 4, "high": 3, "medium": 2, "low": 1, "none": 0}
-                    priority_score += impact_scores.get(team_impact.impact_level, 0)
+                    priority_score += _LEVEL_CODE.get(team_impact.impact_level, 0)
             
             services.append((dep.service_name, priority_score))
         
@@ -928,7 +1225,7 @@ class DependencyImpactAnalyzer:
             plan["stakeholders"].append({
                 "team": team_impact.team_name,
                 "contact_priority": team_impact.contact_priority,
-                "notification_requirements": team_impact.required_actions
+                "notification_requirements": list(team_impact.required_actions)
             })
         
         # Add notification timeline
@@ -1044,16 +1341,14 @@ class DependencyImpactAnalyzer:
         try:
             # Load existing plans
             try:
-                with open(self.migration_plans_file, 'r') as f:
-                    plans = json.load(f)
+                plans = _loads(self.migration_plans_file.read_bytes())
             except (FileNotFoundError, json.JSONDecodeError):
                 plans = {}
             
             # Save new plan
-            plans[change_id] = asdict(plan)
+            plans[change_id] = plan.to_dict()
             
-            with open(self.migration_plans_file, 'w') as f:
-                json.dump(plans, f, indent=2)
+            _atomic_write(self.migration_plans_file, _dumps(plans, pretty=self.verbose))
             
             logger.info(f"Saved migration plan for change {change_id}")
             
@@ -1201,7 +1496,7 @@ def main():
             
             if args.output:
                 with open(args.output, 'w') as f:
-                    json.dump(asdict(plan), f, indent=2)
+                    json.dump(plan.to_dict(), f, indent=2)
                 print(f"📋 Migration plan saved to {args.output}")
             else:
                 print(f"📋 Migration Plan for {args.schema}")
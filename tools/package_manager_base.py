@@ -7,6 +7,7 @@ integrations, with standardized error handling and fallback mechanisms.
 """
 
 import os
+import stat
 import sys
 import tempfile
 import shutil
@@ -20,6 +21,14 @@ from dataclasses import dataclass
 from package_manager_detector import PackageManagerDetector, PackageManagerInfo
 
 
+def _is_regular_file(path: Path) -> bool:
+    """Check that a path is a regular file with a single stat call."""
+    try:
+        return stat.S_ISREG(os.stat(path).st_mode)
+    except OSError:
+        return False
+
+
 @dataclass
 class PluginSpec:
     """Specification for a plugin installation."""
@@ -113,19 +122,29 @@ class BasePackageManagerInstaller(ABC):
             
         Returns:
             Tuple of (success, stdout, stderr)
+        
+        Note:
+            A bare executable name is resolved to an absolute path and
+            ``close_fds`` is left off so that, without a ``cwd``, subprocess
+            can launch via ``posix_spawn`` instead of forking the
+            interpreter. Python file descriptors are non-inheritable by
+            default, so nothing leaks into the child.
         """
         try:
             self.log(f"Running command: {' '.join(command)}")
             if cwd:
                 self.log(f"Working directory: {cwd}")
             
+            executable = self._resolve_executable(command[0], cwd, env)
+            
             result = subprocess.run(
-                command,
+                [executable] + list(command[1:]),
                 capture_output=True,
                 text=True,
                 timeout=timeout,
                 cwd=cwd,
                 env=env,
+                close_fds=False,
                 check=False
             )
             
@@ -151,6 +170,30 @@ class BasePackageManagerInstaller(ABC):
             self.log(f"Error running command: {e}")
             return False, "", str(e)
     
+    @staticmethod
+    def _resolve_executable(program: str, cwd: Optional[Path] = None,
+                            env: Optional[Dict[str, str]] = None) -> str:
+        """
+        Resolve a bare program name against PATH for posix_spawn.
+        
+        Programs given with a path, and any program run in another working
+        directory, are returned unchanged: resolving them here would look
+        them up relative to our own working directory instead of ``cwd``,
+        and subprocess forks for a ``cwd`` anyway.
+        
+        Args:
+            program: Program name or path from the command
+            cwd: Working directory the command will run in
+            env: Environment the command will run with
+            
+        Returns:
+            The absolute program path, or the program unchanged
+        """
+        if cwd or os.sep in program or (os.altsep and os.altsep in program):
+            return program
+        search_path = env.get("PATH") if env else None
+        return shutil.which(program, path=search_path) or program
+    
     def is_available(self) -> bool:
         """Check if the package manager is available."""
         manager_info = self.get_manager_info()
@@ -176,7 +219,7 @@ class BasePackageManagerInstaller(ABC):
                 
             # Check for direct binary
             binary_path = cached_dir / potential_name
-            if binary_path.exists() and binary_path.is_file():
+            if _is_regular_file(binary_path):
                 if os.access(binary_path, os.X_OK):
                     self.log(f"Found cached binary: {binary_path}")
                     self.metrics["cache_hits"] += 1
@@ -184,7 +227,7 @@ class BasePackageManagerInstaller(ABC):
             
             # Check for wrapper script
             wrapper_path = cached_dir / "bin" / potential_name
-            if wrapper_path.exists() and wrapper_path.is_file():
+            if _is_regular_file(wrapper_path):
                 if os.access(wrapper_path, os.X_OK):
                     self.log(f"Found cached wrapper: {wrapper_path}")
                     self.metrics["cache_hits"] += 1
@@ -240,11 +283,13 @@ exec "{target_executable}" {args_str} "$@"
         Returns:
             True if installation is valid, False otherwise
         """
-        if not binary_path.exists():
+        try:
+            st = os.stat(binary_path)
+        except OSError:
             self.log(f"Binary not found: {binary_path}")
             return False
         
-        if not binary_path.is_file():
+        if not stat.S_ISREG(st.st_mode):
             self.log(f"Not a file: {binary_path}")
             return False
         
@@ -450,7 +495,7 @@ exec "{target_executable}" {args_str} "$@"
                         item / f"protoc-gen-{plugin_name}",
                         item / "bin" / f"protoc-gen-{plugin_name}",
                     ]:
-                        if potential_path.exists() and potential_path.is_file():
+                        if _is_regular_file(potential_path):
                             binary_path = potential_path
                             break
                     
@@ -487,10 +487,10 @@ class TeamPerformanceOptimizer:
 
     def _estimate_active_developers(self, team_name: str, analysis_period: str) -> int:
         """Estimate number of active developers."""
-        team_info = self.team_manager.get_team_info(team_name)
-        if team_info:
+        if team_name in self.team_manager.teams:
+            member_count, _ = self.team_manager.get_team_counts(team_name)
             # Assume 80% of team members are active in a given period
-            return int(team_info['member_count'] * 0.8)
+            return int(member_count * 0.8)
         return 1
 
     def _determine_cache_strategy_type(self, usage_pattern: UsagePattern) -> str:
@@ -7,9 +7,13 @@ team creation, member management, repository access configuration, and
 permission validation.
 """
 
+import io
 import json
 import os
+import socket
+import sys
 import tempfile
+import threading
 import time
 import unittest
 import yaml
@@ -18,8 +22,9 @@ from unittest.mock import Mock, patch
 
 # Local imports
 from .bsr_teams import (
-    BSRTeamManager, Team, TeamMember, TeamRepository,
-    TeamConfigurationError
+    AccessLevel, BSRTeamManager, Team, TeamMember, TeamRepository,
+    TeamConfigurationError, EXIT_DENY, EXIT_ERR, EXIT_OK, main,
+    create_validation_server, default_daemon_socket_path, validate_via_daemon
 )
 from .bsr_auth import BSRAuthenticator
 
@@ -90,6 +95,14 @@ class TestTeamRepository(unittest.TestCase):
                 access_level="invalid_access"
             )
 
+    def test_access_level_parse(self):
+        """Test converting access level and action names to ordered levels."""
+        self.assertEqual(AccessLevel.parse("write"), AccessLevel.WRITE)
+        self.assertEqual(AccessLevel.parse("ADMIN"), AccessLevel.ADMIN)
+        self.assertGreater(AccessLevel.ADMIN, AccessLevel.MANAGE)
+        self.assertIsNone(AccessLevel.parse("invalid"))
+        self.assertIsNone(AccessLevel.parse(None))
+
 
 class TestTeam(unittest.TestCase):
     """Test Team class functionality."""
@@ -272,7 +285,26 @@ class TestBSRTeamManager(unittest.TestCase):
         
         # Child team should still exist but with no parent
         self.assertIsNone(self.team_manager.teams["child"].parent_team)
-    
+
+    def test_team_hierarchy_closure(self):
+        """Test precomputed ancestor and descendant lookups."""
+        self.team_manager.create_team("org", "Organization")
+        self.team_manager.create_team("eng", "Engineering", parent_team="org")
+        self.team_manager.create_team("backend", "Backend", parent_team="eng")
+
+        self.assertEqual(self.team_manager.get_team_ancestors("backend"), ("eng", "org"))
+        self.assertEqual(self.team_manager.get_team_descendants("org"), {"eng", "backend"})
+        self.assertEqual(self.team_manager.get_team_ancestors("nonexistent"), ())
+
+        # Closure survives a reload from storage
+        reloaded = BSRTeamManager(config_dir=self.config_dir, bsr_authenticator=self.mock_auth)
+        self.assertEqual(reloaded.get_team_ancestors("backend"), ("eng", "org"))
+
+        # Deleting a middle team reparents its children
+        self.team_manager.delete_team("eng", force=True)
+        self.assertEqual(self.team_manager.get_team_ancestors("backend"), ("org",))
+        self.assertEqual(self.team_manager.get_team_descendants("org"), {"backend"})
+
     def test_configure_team_access(self):
         """Test configuring team access to repositories."""
         # Create team
@@ -424,7 +456,39 @@ class TestBSRTeamManager(unittest.TestCase):
             repository="buf.build/auth/schemas",
             username="nonexistent"
         ))
-    
+
+    def test_validate_team_permissions_with_override(self):
+        """Test that repository role overrides take precedence in validation."""
+        self.team_manager.create_team("override-team", "Override team")
+        self.team_manager.manage_team_members(
+            "override-team", [{"username": "viewer", "role": "viewer"}], "add"
+        )
+        repo = "buf.build/override/schemas"
+        self.team_manager.configure_team_access("override-team", [repo], "write")
+
+        self.assertFalse(self.team_manager.validate_team_permissions(
+            "override-team", repo, "viewer", "write"
+        ))
+
+        self.team_manager.organize_team_repositories(
+            "override-team", {repo: {"team_permissions": {"viewer": "contributor"}}}
+        )
+        self.assertTrue(self.team_manager.validate_team_permissions(
+            "override-team", repo, "viewer", "write"
+        ))
+
+        # Overrides are indexed on reload as well
+        reloaded = BSRTeamManager(config_dir=self.config_dir, bsr_authenticator=self.mock_auth)
+        self.assertTrue(reloaded.validate_team_permissions(
+            "override-team", repo, "viewer", "write"
+        ))
+
+        # Re-adding the repository resets its overrides
+        self.team_manager.configure_team_access("override-team", [repo], "write")
+        self.assertFalse(self.team_manager.validate_team_permissions(
+            "override-team", repo, "viewer", "write"
+        ))
+
     def test_propagate_permission_changes(self):
         """Test propagating permission changes."""
         # Set up team
@@ -517,6 +581,77 @@ class TestBSRTeamManager(unittest.TestCase):
             team.repositories["buf.build/persistent/repo"].access_level,
             "admin"
         )
+
+        # Saves are atomic and leave no temporary files behind
+        leftovers = [p.name for p in self.config_dir.iterdir() if p.name.endswith(".tmp")]
+        self.assertEqual(leftovers, [])
+
+    def test_save_preserves_file_mode(self):
+        """Test that atomic saves keep the permissions of teams.yaml."""
+        self.team_manager.create_team("mode-team", "Mode team")
+        teams_file = self.config_dir / "teams.yaml"
+        umask = os.umask(0)
+        os.umask(umask)
+        self.assertEqual(teams_file.stat().st_mode & 0o777, 0o666 & ~umask)
+
+        os.chmod(teams_file, 0o640)
+        self.team_manager.create_team("mode-team-2", "Second mode team")
+        self.assertEqual(teams_file.stat().st_mode & 0o777, 0o640)
+
+    def test_registry_cache(self):
+        """Test that unchanged registries load from the SQLite sidecar cache."""
+        self.team_manager.create_team("cached-team", "Cached team")
+        self.assertTrue((self.config_dir / "teams-cache.sqlite").exists())
+
+        # Fresh cache: the YAML file is not parsed again
+        with patch("yaml.load") as mock_load:
+            cached_manager = BSRTeamManager(
+                config_dir=self.config_dir,
+                bsr_authenticator=self.mock_auth
+            )
+            mock_load.assert_not_called()
+        self.assertIn("cached-team", cached_manager.teams)
+
+        # External edits to teams.yaml invalidate the cache
+        config_file = self.config_dir / "teams.yaml"
+        teams_data = yaml.safe_load(config_file.read_text())
+        teams_data["cached-team"]["description"] = "Edited by hand with a longer description"
+        config_file.write_text(yaml.dump(teams_data))
+
+        reloaded = BSRTeamManager(config_dir=self.config_dir, bsr_authenticator=self.mock_auth)
+        self.assertEqual(
+            reloaded.teams["cached-team"].description,
+            "Edited by hand with a longer description"
+        )
+
+    def test_registry_cache_detects_same_size_edits(self):
+        """Test that edits keeping the size and mtime still invalidate the cache."""
+        self.team_manager.create_team("cached-team", "Cached team")
+        config_file = self.config_dir / "teams.yaml"
+        original = config_file.stat()
+
+        config_file.write_text(config_file.read_text().replace("Cached team", "Cached TEAM"))
+        os.utime(config_file, ns=(original.st_atime_ns, original.st_mtime_ns))
+        self.assertEqual(config_file.stat().st_size, original.st_size)
+
+        reloaded = BSRTeamManager(config_dir=self.config_dir, bsr_authenticator=self.mock_auth)
+        self.assertEqual(reloaded.teams["cached-team"].description, "Cached TEAM")
+
+    def test_registry_cache_ignores_concurrent_replacement(self):
+        """Test that a save never stamps another writer's file with its own data."""
+        config_file = self.config_dir / "teams.yaml"
+        replace = os.replace
+
+        def _replace_then_overwrite(src, dst):
+            replace(src, dst)
+            # Another writer swaps in its own registry right after ours
+            config_file.write_text(yaml.dump({}))
+
+        with patch("os.replace", side_effect=_replace_then_overwrite):
+            self.team_manager.create_team("lost-team", "Overwritten team")
+
+        reloaded = BSRTeamManager(config_dir=self.config_dir, bsr_authenticator=self.mock_auth)
+        self.assertEqual(reloaded.teams, {})
     
     def test_get_team_info(self):
         """Test getting comprehensive team information."""
@@ -570,7 +705,21 @@ class TestBSRTeamManager(unittest.TestCase):
         self.assertEqual(len(teams), 2)
         self.assertIn("team1", teams)
         self.assertIn("team2", teams)
-    
+
+    def test_iter_team_counts(self):
+        """Test listing team member and repository counts."""
+        self.team_manager.create_team("team1", "First team")
+        self.team_manager.manage_team_members(
+            "team1", [{"username": "alice", "role": "admin"}], "add"
+        )
+        self.team_manager.configure_team_access(
+            "team1", ["buf.build/test/a", "buf.build/test/b"], "read"
+        )
+
+        self.assertEqual(list(self.team_manager.iter_team_counts()), [("team1", 1, 2)])
+        self.assertEqual(self.team_manager.get_team_counts("team1"), (1, 2))
+        self.assertEqual(self.team_manager.get_team_counts("nonexistent"), (0, 0))
+
     def test_get_user_teams(self):
         """Test getting teams for a specific user."""
         # Create teams and add user to some of them
@@ -598,6 +747,18 @@ class TestBSRTeamManager(unittest.TestCase):
         
         # Test non-existent user
         self.assertEqual(len(self.team_manager.get_user_teams("nonexistent")), 0)
+        
+        # Index follows member removal and team deletion
+        self.team_manager.manage_team_members(
+            "team-a",
+            [{"username": "testuser"}],
+            "remove"
+        )
+        self.team_manager.delete_team("team-c")
+        self.assertEqual(self.team_manager.get_user_teams("testuser"), [])
+        self.assertFalse(self.team_manager.validate_team_permissions(
+            "team-a", "buf.build/any/repo", "testuser"
+        ))
     
     def test_get_repository_teams(self):
         """Test getting teams that have access to a repository."""
@@ -781,5 +942,294 @@ class TestIntegration(unittest.TestCase):
         self.assertIn("backend-team", engineering_info["child_teams"])
 
 
+
+class TestCommandLine(unittest.TestCase):
+    """Test the team management command line interface."""
+    
+    def setUp(self):
+        """Set up a configured team for CLI tests."""
+        self.temp_dir = tempfile.mkdtemp()
+        self.config_dir = Path(self.temp_dir) / "cli-config"
+        
+        auth_patcher = patch(f"{BSRTeamManager.__module__}.BSRAuthenticator")
+        auth_patcher.start()
+        self.addCleanup(auth_patcher.stop)
+        
+        team_manager = BSRTeamManager(config_dir=self.config_dir)
+        team_manager.create_team("cli-team", "CLI team")
+        team_manager.manage_team_members(
+            "cli-team", [{"username": "alice", "role": "contributor"}], "add"
+        )
+        team_manager.configure_team_access("cli-team", ["buf.build/cli/repo"], "write")
+    
+    def tearDown(self):
+        """Clean up CLI test environment."""
+        import shutil
+        shutil.rmtree(self.temp_dir)
+    
+    def run_cli(self, *argv, stdin=""):
+        """Run main() with the given arguments and return (exit_code, stdout)."""
+        stdout = io.StringIO()
+        with patch.object(sys, "argv", ["bsr_teams", "--config-dir", str(self.config_dir), *argv]), \
+             patch.object(sys, "stdin", io.StringIO(stdin)), \
+             patch.object(sys, "stdout", stdout):
+            exit_code = main()
+        return exit_code, stdout.getvalue()
+    
+    def test_validate_batch(self):
+        """Test validating several permissions from stdin in one invocation."""
+        checks = [
+            {"team": "cli-team", "repository": "buf.build/cli/repo", "username": "alice", "action": "write"},
+            {"team": "cli-team", "repository": "buf.build/cli/repo", "action": "read"},
+        ]
+        exit_code, output = self.run_cli(
+            "validate-batch", stdin="\n".join(json.dumps(c) for c in checks) + "\n"
+        )
+        self.assertEqual(exit_code, 0)
+        self.assertEqual(output, "ok\nok\n")
+        
+        checks.append({"team": "cli-team", "repository": "buf.build/cli/repo", "username": "alice", "action": "admin"})
+        exit_code, output = self.run_cli(
+            "validate-batch", stdin="\n".join(json.dumps(c) for c in checks)
+        )
+        self.assertEqual(exit_code, 1)
+        self.assertEqual(output, "ok\nok\ndeny\n")
+
+    
+    def test_info(self):
+        """Test the team info report."""
+        exit_code, output = self.run_cli("info", "--team", "cli-team")
+        self.assertEqual(exit_code, 0)
+        self.assertIn("Team: cli-team\nDescription: CLI team\nMembers: 1\n", output)
+        self.assertIn("\n\nMembers:\n  alice (contributor)\n", output)
+        self.assertTrue(output.endswith("\n\nRepositories:\n  buf.build/cli/repo (write)\n"))
+
+    
+    def test_list(self):
+        """Test listing teams with their counts."""
+        exit_code, output = self.run_cli("list")
+        self.assertEqual(exit_code, 0)
+        self.assertEqual(output, "Configured teams (1):\n  cli-team: 1 members, 1 repositories\n")
+
+    
+    def test_add_members(self):
+        """Test adding members in bulk from a JSON file."""
+        members_file = Path(self.temp_dir) / "members.json"
+        members_file.write_text(json.dumps([
+            {"username": "bob", "role": "viewer"},
+            {"username": "carol", "role": "maintainer", "email": "carol@example.com"},
+        ]))
+        
+        with patch.object(BSRTeamManager, "_save_teams_config", autospec=True,
+                          side_effect=BSRTeamManager._save_teams_config) as mock_save:
+            exit_code, output = self.run_cli(
+                "add-members", "--team", "cli-team", "--file", str(members_file)
+            )
+        self.assertEqual(exit_code, 0)
+        self.assertEqual(output, "✅ Added 2 members to team 'cli-team'\n")
+        self.assertEqual(mock_save.call_count, 1)
+        
+        team_manager = BSRTeamManager(config_dir=self.config_dir)
+        self.assertEqual(team_manager.get_team_counts("cli-team"), (3, 1))
+        self.assertEqual(team_manager.teams["cli-team"].members["carol"].role, "maintainer")
+
+    
+    def test_add_repo_multiple(self):
+        """Test granting access to several repositories in one invocation."""
+        exit_code, output = self.run_cli(
+            "add-repo", "--team", "cli-team",
+            "--repositories", "buf.build/cli/a, buf.build/cli/b", "--access", "write"
+        )
+        self.assertEqual(exit_code, 0)
+        self.assertEqual(output, "✅ Added 2 repositories to team 'cli-team' with write access\n")
+        
+        team_manager = BSRTeamManager(config_dir=self.config_dir)
+        self.assertEqual(team_manager.get_team_counts("cli-team"), (1, 3))
+    
+    def test_exit_codes(self):
+        """Test exit codes for allowed, denied, and failed commands."""
+        exit_code, output = self.run_cli(
+            "validate", "--team", "cli-team", "--repository", "buf.build/cli/repo",
+            "--username", "alice", "--action", "write"
+        )
+        self.assertEqual(exit_code, EXIT_OK)
+        self.assertEqual(
+            output,
+            "✅ Permission 'write' valid for team 'cli-team' on repository 'buf.build/cli/repo' for user alice\n"
+        )
+        
+        exit_code, output = self.run_cli("validate", "--team", "cli-team", "--repository", "buf.build/other/repo")
+        self.assertEqual(exit_code, EXIT_DENY)
+        self.assertEqual(
+            output,
+            "❌ Permission 'read' denied for team 'cli-team' on repository 'buf.build/other/repo'\n"
+        )
+        
+        exit_code, output = self.run_cli("add-member", "--team", "missing", "--username", "bob")
+        self.assertEqual(exit_code, EXIT_ERR)
+        self.assertTrue(output.startswith("ERROR:"))
+    
+    def test_fast_exit_on_denial(self):
+        """Test that BSR_FAST_EXIT skips interpreter shutdown on denials."""
+        with patch.dict(os.environ, {"BSR_FAST_EXIT": "1"}), \
+             patch.object(os, "_exit", side_effect=SystemExit) as mock_exit:
+            with self.assertRaises(SystemExit):
+                self.run_cli("validate", "--team", "cli-team", "--repository", "buf.build/other/repo")
+            mock_exit.assert_called_once_with(EXIT_DENY)
+            
+            exit_code, _ = self.run_cli("validate", "--team", "cli-team", "--repository", "buf.build/cli/repo")
+            self.assertEqual(exit_code, EXIT_OK)
+
+
+
+class TestValidationDaemon(unittest.TestCase):
+    """Test the long-running validation daemon."""
+    
+    def setUp(self):
+        """Start a daemon over a configured team."""
+        self.temp_dir = tempfile.mkdtemp()
+        self.config_dir = Path(self.temp_dir) / "daemon-config"
+        self.socket_path = Path(self.temp_dir) / "teams.sock"
+        self.mock_auth = Mock(spec=BSRAuthenticator)
+        
+        self.team_manager = BSRTeamManager(
+            config_dir=self.config_dir,
+            bsr_authenticator=self.mock_auth
+        )
+        self.team_manager.create_team("daemon-team", "Daemon team")
+        self.team_manager.configure_team_access("daemon-team", ["buf.build/daemon/repo"], "read")
+        
+        self.server = create_validation_server(self.team_manager, self.socket_path)
+        self.thread = threading.Thread(target=self.server.serve_forever, daemon=True)
+        self.thread.start()
+    
+    def tearDown(self):
+        """Stop the daemon and clean up."""
+        self.server.shutdown()
+        self.server.server_close()
+        self.thread.join()
+        import shutil
+        shutil.rmtree(self.temp_dir)
+    
+    def test_validate_via_daemon(self):
+        """Test permission checks answered over the socket."""
+        self.assertTrue(validate_via_daemon(self.socket_path, "daemon-team", "buf.build/daemon/repo"))
+        self.assertFalse(validate_via_daemon(
+            self.socket_path, "daemon-team", "buf.build/daemon/repo", action="write"
+        ))
+    
+    def test_daemon_reloads_changed_registry(self):
+        """Test that the daemon picks up registry changes made by other processes."""
+        other_manager = BSRTeamManager(config_dir=self.config_dir, bsr_authenticator=self.mock_auth)
+        other_manager.configure_team_access("daemon-team", ["buf.build/daemon/new"], "write")
+        
+        self.assertTrue(validate_via_daemon(
+            self.socket_path, "daemon-team", "buf.build/daemon/new", action="write"
+        ))
+    
+    def test_no_daemon(self):
+        """Test that a missing daemon is reported as None for fallback."""
+        self.assertIsNone(validate_via_daemon(
+            Path(self.temp_dir) / "missing.sock", "daemon-team", "buf.build/daemon/repo"
+        ))
+    
+    def test_config_dir_mismatch(self):
+        """Test that a daemon only answers for the config dir it serves."""
+        self.assertTrue(validate_via_daemon(
+            self.socket_path, "daemon-team", "buf.build/daemon/repo", config_dir=self.config_dir
+        ))
+        self.assertIsNone(validate_via_daemon(
+            self.socket_path, "daemon-team", "buf.build/daemon/repo",
+            config_dir=Path(self.temp_dir) / "other-config"
+        ))
+
+    def test_malformed_requests(self):
+        """Test that malformed requests get an error reply without dropping the connection."""
+        requests = [
+            b'["daemon-team"]',
+            b'{"team": "daemon-team", "repository": "buf.build/daemon/repo", "action": 1}',
+            b'{"team": "daemon-team"}',
+            b'not json',
+            b'{"team": "daemon-team", "repository": "buf.build/daemon/repo"}',
+        ]
+        with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as sock:
+            sock.settimeout(5.0)
+            sock.connect(str(self.socket_path))
+            sock.sendall(b"\n".join(requests) + b"\n")
+            sock.shutdown(socket.SHUT_WR)
+            replies = sock.makefile("rb").read().split()
+
+        self.assertEqual(replies, [b"%d" % EXIT_ERR] * 4 + [b"%d" % EXIT_OK])
+
+    def test_refuses_second_daemon(self):
+        """Test that a live daemon on the same socket is not replaced."""
+        with self.assertRaises(TeamConfigurationError):
+            create_validation_server(self.team_manager, self.socket_path)
+
+    def test_refuses_to_replace_other_files(self):
+        """Test that a daemon does not unlink files that are not its socket."""
+        other_path = Path(self.temp_dir) / "not-a-socket"
+        other_path.write_text("keep me")
+        with self.assertRaises(TeamConfigurationError):
+            create_validation_server(self.team_manager, other_path)
+        self.assertEqual(other_path.read_text(), "keep me")
+
+    def test_socket_is_private(self):
+        """Test that only the current user can connect to the daemon."""
+        self.assertEqual(self.socket_path.stat().st_mode & 0o777, 0o600)
+
+    def test_default_socket_path_is_per_user(self):
+        """Test that the default socket lives in a per-user directory."""
+        with patch.dict(os.environ, {"XDG_RUNTIME_DIR": "/run/user/1000"}):
+            self.assertEqual(
+                default_daemon_socket_path(self.config_dir),
+                Path("/run/user/1000/buck2-protobuf/bsr-teams.sock")
+            )
+        with patch.dict(os.environ):
+            os.environ.pop("XDG_RUNTIME_DIR", None)
+            socket_path = default_daemon_socket_path(self.config_dir)
+        self.assertEqual(socket_path, self.config_dir / "run" / "bsr-teams.sock")
+
+        server = create_validation_server(self.team_manager, socket_path)
+        server.server_close()
+        self.assertEqual(socket_path.parent.stat().st_mode & 0o777, 0o700)
+
+    def test_client_rejects_untrusted_sockets(self):
+        """Test that the client only talks to its own user's daemon socket."""
+        regular_file = Path(self.temp_dir) / "regular.sock"
+        regular_file.write_text("")
+        self.assertIsNone(validate_via_daemon(regular_file, "daemon-team", "buf.build/daemon/repo"))
+
+        with patch("os.getuid", return_value=os.getuid() + 1):
+            self.assertIsNone(validate_via_daemon(
+                self.socket_path, "daemon-team", "buf.build/daemon/repo"
+            ))
+
+        with patch(f"{__package__}.bsr_teams._peer_uid", return_value=os.getuid() + 1):
+            self.assertIsNone(validate_via_daemon(
+                self.socket_path, "daemon-team", "buf.build/daemon/repo"
+            ))
+
+    def test_client_sends_resolved_config_dir(self):
+        """Test that the client sends an absolute config dir for the daemon to compare."""
+        cwd = os.getcwd()
+        os.chdir(self.temp_dir)
+        self.addCleanup(os.chdir, cwd)
+
+        sent = []
+
+        class _RecordingSocket(socket.socket):
+            def sendall(self, data, *args):
+                sent.append(data)
+                return super().sendall(data, *args)
+
+        with patch("socket.socket", _RecordingSocket):
+            self.assertTrue(validate_via_daemon(
+                self.socket_path, "daemon-team", "buf.build/daemon/repo", config_dir="daemon-config"
+            ))
+
+        self.assertEqual(json.loads(sent[0])["config_dir"], str(self.config_dir.resolve()))
+
+
 if __name__ == "__main__":
     unittest.main()
@@ -0,0 +1,370 @@
+#!/usr/bin/env python3
+"""
+Test suite for the BSR semantic version manager.
+"""
+
+import io
+import json
+import os
+import shutil
+import subprocess
+import sys
+import tempfile
+import time
+import unittest
+from pathlib import Path
+from unittest.mock import MagicMock, patch
+
+# Add current directory to Python path for imports
+current_dir = Path(__file__).parent
+sys.path.insert(0, str(current_dir))
+
+try:
+    import bsr_version_manager
+    from bsr_version_manager import (
+        BSRVersionManager, ChangeType, SchemaChange, VersionIncrement, VersionInfo
+    )
+    IMPORTS_AVAILABLE = True
+except ImportError as e:
+    print(f"Import error: {e}")
+    IMPORTS_AVAILABLE = False
+
+
+class VersionManagerTestCase(unittest.TestCase):
+    """Base class creating a version manager with a mocked BSR client."""
+    
+    def setUp(self):
+        """Set up a version manager over a temporary cache directory."""
+        if not IMPORTS_AVAILABLE:
+            self.skipTest("Required imports not available")
+        
+        self.temp_dir = Path(tempfile.mkdtemp())
+        self.cache_dir = self.temp_dir / "cache"
+        
+        # The real client requires the buf CLI
+        for name in ("BSRClient", "BSRAuthenticator"):
+            patcher = patch.object(bsr_version_manager, name)
+            patcher.start()
+            self.addCleanup(patcher.stop)
+        
+        self.manager = BSRVersionManager(cache_dir=self.cache_dir)
+    
+    def tearDown(self):
+        """Clean up test environment."""
+        shutil.rmtree(self.temp_dir, ignore_errors=True)
+
+
+class TestSemanticVersions(VersionManagerTestCase):
+    """Test semantic version parsing, formatting and ordering."""
+    
+    def test_parse_semantic_version(self):
+        """Test parsing plain, prerelease and build versions."""
+        self.assertEqual(self.manager.parse_semantic_version("v1.2.3"), (1, 2, 3, "", ""))
+        self.assertEqual(self.manager.parse_semantic_version("10.20.30"), (10, 20, 30, "", ""))
+        self.assertEqual(
+            self.manager.parse_semantic_version("v1.2.3-alpha.1+build.5"),
+            (1, 2, 3, "alpha.1", "build.5")
+        )
+        self.assertEqual(self.manager.parse_semantic_version("1.0.0+exp"), (1, 0, 0, "", "exp"))
+        
+        for invalid in ("1.2", "v1.2.x", "1.2.3.4", "latest", "1.2.3-", ""):
+            self.assertIsNone(self.manager.parse_semantic_version(invalid), invalid)
+    
+    def test_format_round_trip(self):
+        """Test that formatted versions parse back to their components."""
+        for components in ((1, 2, 3, "", ""), (0, 1, 0, "rc.1", ""), (2, 0, 0, "beta", "sha.abc")):
+            version = self.manager.format_semantic_version(*components)
+            self.assertEqual(self.manager.parse_semantic_version(version), components)
+    
+    def test_latest_version_orders_numerically(self):
+        """Test that the latest tag is chosen by numeric, not string, order."""
+        self.manager.bsr_client.get_repository_info.return_value = {
+            "tags": ["v1.9.0", "main", "v1.10.0", "v1.2.30", "v1.10.0-rc.1"]
+        }
+        
+        self.assertEqual(self.manager.get_latest_version("buf.build/acme/api"), "v1.10.0")
+    
+    def test_latest_version_without_tags(self):
+        """Test that repositories without semantic version tags have no latest version."""
+        self.manager.bsr_client.get_repository_info.return_value = {"tags": ["main", "dev"]}
+        
+        self.assertIsNone(self.manager.get_latest_version("buf.build/acme/api"))
+    
+    def test_generate_next_version(self):
+        """Test applying each increment type."""
+        self.assertEqual(self.manager.generate_next_version("v1.9.9", VersionIncrement.MAJOR), "v2.0.0")
+        self.assertEqual(self.manager.generate_next_version("v1.9.9", VersionIncrement.MINOR), "v1.10.0")
+        self.assertEqual(self.manager.generate_next_version("v1.9.9", VersionIncrement.PATCH), "v1.9.10")
+        self.assertEqual(self.manager.generate_next_version("v1.9.9", VersionIncrement.NONE), "v1.9.9")
+        self.assertEqual(self.manager.generate_next_version(None, VersionIncrement.PATCH), "v1.0.0")
+        self.assertEqual(
+            self.manager.generate_next_version("v1.2.3", VersionIncrement.MINOR, prerelease="rc.1"),
+            "v1.3.0-rc.1"
+        )
+    
+    def test_version_consistency(self):
+        """Test that a proposed version must be newer than each registry's latest."""
+        self.manager.bsr_client.get_repository_info.side_effect = lambda repository: {
+            "buf.build/acme/api": {"tags": ["v1.10.0"]},
+            "buf.build/acme/new": {"tags": []},
+        }.get(repository)
+        
+        consistency = self.manager.validate_version_consistency(
+            "v1.9.0", {"primary": "buf.build/acme/api", "fresh": "buf.build/acme/new"}
+        )
+        
+        self.assertEqual(consistency, {"primary": False, "fresh": True})
+        self.assertTrue(
+            self.manager.validate_version_consistency("v1.11.0", {"primary": "buf.build/acme/api"})["primary"]
+        )
+
+
+class TestRepositoryInfoCache(VersionManagerTestCase):
+    """Test the in-memory and on-disk repository info cache."""
+    
+    def setUp(self):
+        """Set up a client returning fixed repository info."""
+        super().setUp()
+        self.repo_info = {"name": "api", "tags": ["v1.0.0"]}
+        self.client = self.manager.bsr_client
+        self.client.get_repository_info.return_value = self.repo_info
+    
+    def test_memory_cache_within_ttl(self):
+        """Test that repeated lookups within the TTL query the registry once."""
+        self.assertEqual(self.manager._get_repository_info("buf.build/acme/api"), self.repo_info)
+        self.assertEqual(self.manager._get_repository_info("buf.build/acme/api"), self.repo_info)
+        
+        self.client.get_repository_info.assert_called_once_with("buf.build/acme/api")
+    
+    def test_disk_cache_shared_between_managers(self):
+        """Test that a fresh manager reuses repository info cached on disk."""
+        self.manager._get_repository_info("buf.build/acme/api")
+        
+        other = BSRVersionManager(cache_dir=self.cache_dir)
+        other.bsr_client = MagicMock()
+        self.assertEqual(other._get_repository_info("buf.build/acme/api"), self.repo_info)
+        other.bsr_client.get_repository_info.assert_not_called()
+    
+    def test_expired_entries_are_refetched(self):
+        """Test that memory and disk entries older than the TTL are ignored."""
+        self.manager._get_repository_info("buf.build/acme/api")
+        
+        expired = time.time() - self.manager.repo_info_ttl - 1
+        self.manager._repo_info_cache["buf.build/acme/api"] = (expired, {"stale": True})
+        for cache_file in self.cache_dir.glob("repoinfo_*.json"):
+            os.utime(cache_file, (expired, expired))
+        
+        self.client.get_repository_info.return_value = {"name": "api", "tags": ["v2.0.0"]}
+        self.assertEqual(self.manager._get_repository_info("buf.build/acme/api")["tags"], ["v2.0.0"])
+        self.assertEqual(self.client.get_repository_info.call_count, 2)
+    
+    def test_corrupt_disk_entry_is_refetched(self):
+        """Test that an unreadable cache file falls back to the registry."""
+        self.manager._get_repository_info("buf.build/acme/api")
+        for cache_file in self.cache_dir.glob("repoinfo_*.json"):
+            cache_file.write_text("{not json")
+        
+        other = BSRVersionManager(cache_dir=self.cache_dir)
+        other.bsr_client = MagicMock()
+        other.bsr_client.get_repository_info.return_value = self.repo_info
+        self.assertEqual(other._get_repository_info("buf.build/acme/api"), self.repo_info)
+        other.bsr_client.get_repository_info.assert_called_once()
+    
+    def test_missing_repository_not_cached(self):
+        """Test that failed lookups are retried instead of cached."""
+        self.client.get_repository_info.return_value = None
+        
+        self.assertIsNone(self.manager._get_repository_info("buf.build/acme/missing"))
+        self.assertIsNone(self.manager._get_repository_info("buf.build/acme/missing"))
+        self.assertEqual(self.client.get_repository_info.call_count, 2)
+        self.assertEqual(list(self.cache_dir.glob("repoinfo_*.json")), [])
+
+
+class TestGitInfo(VersionManagerTestCase):
+    """Test reading the current commit and tag from git."""
+    
+    def _run_result(self, stdout: str, returncode: int = 0) -> subprocess.CompletedProcess:
+        return subprocess.CompletedProcess(args=["git"], returncode=returncode, stdout=stdout, stderr="")
+    
+    def test_commit_and_tag(self):
+        """Test parsing a commit decorated with tags."""
+        stdout = "0123abcd\0HEAD -> main, tag: v1.2.3, tag: v1.2.3-rc.1, origin/main\n"
+        with patch.object(bsr_version_manager.subprocess, "run", return_value=self._run_result(stdout)):
+            self.assertEqual(self.manager._get_git_info(), ("0123abcd", "v1.2.3"))
+    
+    def test_commit_without_tag(self):
+        """Test parsing a commit without tags."""
+        with patch.object(bsr_version_manager.subprocess, "run",
+                          return_value=self._run_result("0123abcd\0HEAD -> main\n")):
+            self.assertEqual(self.manager._get_git_info(), ("0123abcd", None))
+    
+    def test_git_failures(self):
+        """Test that git errors and a missing git binary yield no metadata."""
+        with patch.object(bsr_version_manager.subprocess, "run",
+                          return_value=self._run_result("", returncode=128)):
+            self.assertEqual(self.manager._get_git_info(), (None, None))
+        
+        with patch.object(bsr_version_manager.subprocess, "run", side_effect=FileNotFoundError):
+            self.assertEqual(self.manager._get_git_info(), (None, None))
+    
+    def test_real_repository(self):
+        """Test against a real git repository with a tagged commit."""
+        if shutil.which("git") is None:
+            self.skipTest("git not available")
+        
+        repo = self.temp_dir / "repo"
+        repo.mkdir()
+        git = ["git", "-c", "user.name=Test", "-c", "user.email=test@example.com",
+               "-c", "commit.gpgsign=false", "-c", "tag.gpgsign=false"]
+        subprocess.run(git + ["init", "-q"], cwd=repo, check=True)
+        subprocess.run(git + ["commit", "-q", "--allow-empty", "-m", "initial"], cwd=repo, check=True)
+        subprocess.run(git + ["tag", "v0.1.0"], cwd=repo, check=True)
+        head = subprocess.run(["git", "rev-parse", "HEAD"], cwd=repo, check=True,
+                              capture_output=True, text=True).stdout.strip()
+        
+        previous_cwd = os.getcwd()
+        os.chdir(repo)
+        try:
+            self.assertEqual(self.manager._get_git_info(), (head, "v0.1.0"))
+        finally:
+            os.chdir(previous_cwd)
+
+
+class TestVersionInfoPersistence(VersionManagerTestCase):
+    """Test saving and loading version info with enum fields."""
+    
+    def _version_info(self) -> VersionInfo:
+        return VersionInfo(
+            version="v2.0.0",
+            increment_type=VersionIncrement.MAJOR,
+            base_version="v1.4.2",
+            changes=[
+                SchemaChange(ChangeType.BREAKING, "major", "Removed field", "api.proto",
+                             line_number=12, field_name="id"),
+                SchemaChange(ChangeType.FEATURE, "minor", "Added new proto file: new.proto", "new.proto"),
+            ],
+            change_summary="1 breaking changes, 1 new features",
+            created_at=1700000000.5,
+            git_commit="0123abcd",
+            git_tag="v2.0.0"
+        )
+    
+    def _assert_round_trip(self):
+        version_info = self._version_info()
+        file_path = self.manager.save_version_info(version_info, "buf.build/acme/api")
+        
+        self.assertEqual(file_path.parent, self.cache_dir)
+        self.assertEqual(file_path.name, "buf.build_acme_api_v2.0.0_1700000000.json")
+        
+        data = json.loads(file_path.read_text())
+        self.assertEqual(data["increment_type"], "major")
+        self.assertEqual(data["changes"][0]["change_type"], "breaking")
+        
+        loaded = self.manager.load_version_info(file_path)
+        self.assertEqual(loaded, version_info)
+        self.assertIs(loaded.increment_type, VersionIncrement.MAJOR)
+        self.assertIs(loaded.changes[1].change_type, ChangeType.FEATURE)
+    
+    def test_round_trip(self):
+        """Test a save/load round trip with the default encoder."""
+        self._assert_round_trip()
+    
+    def test_round_trip_stdlib_json(self):
+        """Test a save/load round trip without orjson."""
+        with patch.object(bsr_version_manager, "ORJSON_AVAILABLE", False):
+            self._assert_round_trip()
+    
+    def test_load_invalid_file(self):
+        """Test that unreadable or invalid files load as None."""
+        bad_enum = self.cache_dir / "bad_enum.json"
+        bad_enum.write_text(json.dumps({"increment_type": "huge", "changes": []}))
+        not_json = self.cache_dir / "not_json.json"
+        not_json.write_text("{")
+        
+        self.assertIsNone(self.manager.load_version_info(bad_enum))
+        self.assertIsNone(self.manager.load_version_info(not_json))
+        self.assertIsNone(self.manager.load_version_info(self.cache_dir / "missing.json"))
+
+
+class TestBufResultMemo(VersionManagerTestCase):
+    """Test memoization of buf breaking change results."""
+    
+    def setUp(self):
+        """Create current and baseline proto sets."""
+        super().setUp()
+        self.current = self.temp_dir / "current"
+        self.baseline = self.temp_dir / "baseline"
+        for directory, body in ((self.current, "message A { int32 id = 2; }"),
+                                (self.baseline, "message A { int32 id = 1; }")):
+            directory.mkdir()
+            (directory / "api.proto").write_text(body)
+        self.current_protos = [self.current / "api.proto"]
+        self.baseline_protos = [self.baseline / "api.proto"]
+    
+    def _fake_buf(self, output: str, returncode: int) -> MagicMock:
+        def _popen(cmd, **kwargs):
+            proc = MagicMock()
+            proc.stdout = io.StringIO(output)
+            proc.wait.return_value = returncode
+            return proc
+        return MagicMock(side_effect=_popen)
+    
+    def test_unchanged_inputs_skip_buf(self):
+        """Test that a second comparison of unchanged inputs reuses the result."""
+        issue = json.dumps({"path": "api.proto", "start_line": 1, "message": "Field changed number"})
+        popen = self._fake_buf(issue + "\n", 1)
+        
+        with patch.object(bsr_version_manager.subprocess, "Popen", popen):
+            first = self.manager._detect_buf_breaking_changes(self.current_protos, self.baseline_protos)
+            second = self.manager._detect_buf_breaking_changes(self.current_protos, self.baseline_protos)
+        
+        self.assertEqual(popen.call_count, 1)
+        self.assertEqual([c.description for c in first], ["Field changed number"])
+        self.assertEqual(second, first)
+        self.assertIsNot(second, first)
+    
+    def test_memo_lookup_reads_no_contents(self):
+        """Test that the memo key comes from stat data alone."""
+        key = self.manager._proto_set_digest(self.current_protos)
+        
+        with patch.object(BSRVersionManager, "_file_digest", side_effect=AssertionError("read")):
+            self.assertEqual(self.manager._proto_set_digest(self.current_protos), key)
+    
+    def test_modified_inputs_rerun_buf(self):
+        """Test that modifying a proto invalidates the memoized result."""
+        popen = self._fake_buf("", 0)
+        
+        with patch.object(bsr_version_manager.subprocess, "Popen", popen):
+            self.manager._detect_buf_breaking_changes(self.current_protos, self.baseline_protos)
+            proto = self.current_protos[0]
+            proto.write_text("message A { int64 id = 2; }")
+            stat = proto.stat()
+            os.utime(proto, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000_000))
+            self.manager._detect_buf_breaking_changes(self.current_protos, self.baseline_protos)
+        
+        self.assertEqual(popen.call_count, 2)
+    
+    def test_identical_sets_skip_buf(self):
+        """Test that comparing a proto set with itself never runs buf."""
+        popen = self._fake_buf("", 0)
+        
+        with patch.object(bsr_version_manager.subprocess, "Popen", popen):
+            self.assertEqual(
+                self.manager._detect_buf_breaking_changes(self.current_protos, self.current_protos), []
+            )
+        
+        popen.assert_not_called()
+    
+    def test_inconclusive_runs_not_memoized(self):
+        """Test that failed buf runs are retried."""
+        popen = self._fake_buf("", 2)
+        
+        with patch.object(bsr_version_manager.subprocess, "Popen", popen):
+            self.manager._detect_buf_breaking_changes(self.current_protos, self.baseline_protos)
+            self.manager._detect_buf_breaking_changes(self.current_protos, self.baseline_protos)
+        
+        self.assertEqual(popen.call_count, 2)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,445 @@
+#!/usr/bin/env python3
+"""
+Tests for the generated code security validator.
+
+These tests pin the validator's findings to the behavior of the original
+one-regex-per-pattern scanner, so scanning optimizations cannot silently
+drop issues.
+"""
+
+import json
+import os
+import sys
+import tempfile
+import time
+import unittest
+from pathlib import Path
+from unittest.mock import patch
+
+# Add current directory to Python path for imports
+current_dir = Path(__file__).parent
+sys.path.insert(0, str(current_dir))
+
+from code_security_validator import CodeSecurityValidator, _stream_report
+
+
+def _findings(issues):
+    """Reduce issues to comparable (pattern, match, line, severity) tuples."""
+    return sorted((issue.pattern, issue.match, issue.line, issue.severity) for issue in issues)
+
+
+class _StubPrefilter:
+    """Stands in for a Hyperscan database that reports fixed pattern ids."""
+    
+    def __init__(self, hits):
+        self.hits = hits
+    
+    def scan(self, content, match_event_handler):
+        for pattern_id in sorted(self.hits):
+            match_event_handler(pattern_id, 0, 0, 0, None)
+
+
+# Sample sources with the findings the original validator reported for them
+BASELINE_SAMPLES = {
+    "go": (
+        'package main\n\nimport "os/exec"\n\nfunc run() {\n\texec.Command("ls")\n'
+        '\tresp, _ := http.Get(url)\n\tp := unsafe.Pointer(&x)\n}\n',
+        [
+            (r'exec\.Command', 'exec.Command', 6, "low"),
+            (r'http\.Get', 'http.Get', 7, "medium"),
+            (r'unsafe\.', 'unsafe.', 8, "low"),
+        ],
+    ),
+    "cpp": (
+        'char buf[8];\nstrcpy(buf, src);\nint r = system("ls");\nint v = arr[i + 1];\n',
+        [
+            (r'\[\s*[^]]*\s*\+[^]]*\]', '[i + 1]', 4, "low"),
+            (r'strcpy\s*\(', 'strcpy(', 2, "low"),
+            (r'system\s*\(', 'system(', 3, "high"),
+        ],
+    ),
+    "rust": (
+        'extern "C" { fn f(); }\nfn g() { unsafe { f() } }\n'
+        'let s = std::net::TcpStream::connect(a);\n',
+        [
+            (r'extern\s+[\'"]C[\'"]', 'extern "C"', 1, "low"),
+            (r'std::net::TcpStream', 'std::net::TcpStream', 3, "low"),
+            (r'unsafe\s*\{', 'unsafe {', 2, "high"),
+        ],
+    ),
+    "typescript": (
+        'el.innerHTML = html;\nfetch(url);\nconst cp = require("child_process");\n',
+        [
+            (r'fetch\s*\(', 'fetch(', 2, "low"),
+            (r'innerHTML\s*=', 'innerHTML =', 1, "high"),
+            (r'require\s*\([\'"]child_process[\'"]', 'require("child_process"', 3, "low"),
+        ],
+    ),
+}
+
+PYTHON_SAMPLE = (
+    'import socket, os\nx = eval(data)\ns = socket.socket()\nf = open("/etc/passwd")\n'
+    'exec(code)\ng = globals()\nobj.__dict__\nv = vars(o)\n'
+    'urllib.request.urlopen(u)\nc = compile(src, "f", "exec")\n'
+)
+
+
+class TestBaselineFindings(unittest.TestCase):
+    """Findings match those of the original validator."""
+    
+    def setUp(self):
+        self.validator = CodeSecurityValidator()
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.addCleanup(self.temp_dir.cleanup)
+        self.root = Path(self.temp_dir.name)
+    
+    def test_generic_languages_match_baseline(self):
+        """Every non-Python language reports exactly the baseline findings."""
+        for language, (source, expected) in BASELINE_SAMPLES.items():
+            with self.subTest(language=language):
+                issues = self.validator.validate_generic_code(source, language)
+                self.assertEqual(_findings(issues), sorted(expected))
+    
+    def test_text_bytes_and_file_agree(self):
+        """Text, bytes and file input give the same findings."""
+        source, expected = BASELINE_SAMPLES["go"]
+        path = self.root / "sample.go"
+        path.write_text(source)
+        
+        from_bytes = self.validator.validate_generic_code(source.encode('utf-8'), "go")
+        from_file = self.validator.validate_file(str(path), "go")["issues"]
+        
+        self.assertEqual(_findings(from_bytes), sorted(expected))
+        self.assertEqual(_findings(from_file), sorted(expected))
+    
+    def test_mapped_large_file_reports_correct_lines(self):
+        """Files scanned through mmap report the same findings and lines."""
+        source, expected = BASELINE_SAMPLES["cpp"]
+        padding = "// padding\n" * (1024 * 1024 // 11 + 1)
+        path = self.root / "large.cc"
+        path.write_text(padding + source)
+        offset = padding.count("\n")
+        
+        result = self.validator.validate_file(str(path), "cpp")
+        
+        self.assertEqual(_findings(result["issues"]), sorted(
+            (pattern, match, line + offset, severity)
+            for pattern, match, line, severity in expected
+        ))
+        self.assertFalse(result["passed"])
+    
+    def test_python_ast_path_keeps_baseline_verdicts(self):
+        """
+        Parseable Python is checked on the AST. eval/exec/compile are
+        reported once as dangerous functions instead of also as patterns;
+        every other baseline finding is kept, on the same line.
+        """
+        issues = self.validator.validate_python_code(PYTHON_SAMPLE)
+        
+        self.assertEqual(sorted((issue.type, issue.pattern or issue.function or issue.attribute,
+                                 issue.line, issue.severity) for issue in issues), sorted([
+            ("dangerous_function", "eval", 2, "high"),
+            ("dangerous_function", "exec", 5, "high"),
+            ("dangerous_function", "compile", 10, "high"),
+            ("dangerous_attribute", "__dict__", 7, "medium"),
+            ("dangerous_pattern", r'socket\.', 3, "high"),
+            ("dangerous_pattern", r'open\s*\([\'"][^\'"]*/etc/', 4, "high"),
+            ("dangerous_pattern", r'globals\s*\(\)', 6, "high"),
+            ("dangerous_pattern", r'vars\s*\(', 8, "high"),
+            ("dangerous_pattern", r'urllib\.request\.', 9, "high"),
+        ]))
+    
+    def test_python_ast_path_ignores_strings_and_comments(self):
+        """Pattern text inside strings or comments is not a call."""
+        issues = self.validator.validate_python_code(
+            '# eval(x) is not called here\ndoc = "exec(code)"\n')
+        
+        self.assertEqual(issues, [])
+    
+    def test_unparseable_python_uses_every_pattern(self):
+        """Without an AST every pattern is scanned, plus a parse error."""
+        issues = self.validator.validate_python_code("x = eval(data\n")
+        
+        self.assertEqual(sorted((issue.type, issue.severity) for issue in issues), [
+            ("dangerous_pattern", "high"),
+            ("parse_error", "medium"),
+        ])
+    
+    def test_file_size_checks(self):
+        """Empty files are reported with low severity."""
+        path = self.root / "empty.go"
+        path.write_text("")
+        
+        result = self.validator.validate_file(str(path), "go")
+        
+        self.assertEqual([issue.type for issue in result["issues"]], ["empty_file"])
+        self.assertTrue(result["passed"])
+    
+    def test_prefilter_limits_rescanned_patterns(self):
+        """Only the patterns a Hyperscan prefilter reports are rescanned."""
+        source, _ = BASELINE_SAMPLES["cpp"]
+        patterns = CodeSecurityValidator.security_patterns["cpp"]
+        
+        for hits, expected in (
+            (set(), []),
+            ({patterns.index(r'system\s*\(')}, [(r'system\s*\(', 'system(', 3, "high")]),
+        ):
+            with self.subTest(hits=hits):
+                self.validator.prefilter = {"cpp": _StubPrefilter(hits)}
+                issues = self.validator.validate_generic_code(source.encode('utf-8'), "cpp")
+                self.assertEqual(_findings(issues), expected)
+
+
+class TestMultipleFiles(unittest.TestCase):
+    """Validating many files gives the same results in every mode."""
+    
+    def setUp(self):
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.addCleanup(self.temp_dir.cleanup)
+        self.root = Path(self.temp_dir.name)
+        self.paths = []
+        for i, (language, (source, _)) in enumerate(BASELINE_SAMPLES.items()):
+            path = self.root / f"sample{i}.cc"
+            path.write_text(source if language == "cpp" else "int x = 0;\n")
+            self.paths.append(str(path))
+    
+    def _summary(self, result):
+        return {key: result[key] for key in (
+            "high_severity_count", "medium_severity_count", "low_severity_count",
+            "total_issues", "passed", "files_passed", "files_failed")}
+    
+    def test_process_pool_matches_sequential(self):
+        """Results from worker processes equal the sequential results."""
+        validator = CodeSecurityValidator()
+        sequential = validator.validate_multiple_files(self.paths, "cpp")
+        with patch.object(os, "cpu_count", return_value=2):
+            pooled = validator.validate_multiple_files(self.paths, "cpp")
+        
+        self.assertEqual(self._summary(pooled), self._summary(sequential))
+        self.assertEqual(
+            [(r["file_path"], _findings(r["issues"])) for r in pooled["file_results"]],
+            [(r["file_path"], _findings(r["issues"])) for r in sequential["file_results"]],
+        )
+        self.assertEqual(sequential["high_severity_count"], 1)
+        self.assertFalse(sequential["passed"])
+    
+    def test_fail_fast_stops_at_first_failing_file(self):
+        """A fail-fast run reports the failure and skips the rest."""
+        result = CodeSecurityValidator().validate_multiple_files(
+            self.paths, "cpp", early_exit=True)
+        
+        self.assertFalse(result["passed"])
+        self.assertTrue(result["stopped_early"])
+        self.assertLess(len(result["file_results"]), len(self.paths))
+    
+    def test_streamed_report_matches_full_report(self):
+        """The JSON Lines report holds every file and the same totals."""
+        validator = CodeSecurityValidator()
+        output = self.root / "report.jsonl"
+        
+        summary = _stream_report(validator, self.paths, "cpp", output)
+        full = validator.validate_multiple_files(self.paths, "cpp")
+        
+        lines = [json.loads(line) for line in output.read_text().splitlines()]
+        self.assertEqual(sorted(line["file_path"] for line in lines), sorted(self.paths))
+        self.assertEqual(self._summary(summary), self._summary(full))
+        on_disk = json.loads(output.with_name("report.jsonl.summary").read_text())
+        self.assertEqual(on_disk["total_issues"], full["total_issues"])
+
+
+class TestStrictExtensions(unittest.TestCase):
+    """Strict extension filtering skips files of other languages."""
+    
+    def setUp(self):
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.addCleanup(self.temp_dir.cleanup)
+        self.root = Path(self.temp_dir.name)
+    
+    def _write(self, name, content):
+        path = self.root / name
+        path.write_text(content)
+        return str(path)
+    
+    def test_other_extension_is_skipped(self):
+        """A .txt file is not validated as Go."""
+        path = self._write("notes.txt", 'exec.Command("ls")\n')
+        
+        result = CodeSecurityValidator(strict_extensions=True).validate_file(path, "go")
+        
+        self.assertTrue(result["skipped"])
+        self.assertEqual(result["issues"], [])
+        self.assertTrue(result["passed"])
+    
+    def test_without_strict_extensions_every_file_is_validated(self):
+        """The default validator scans a file whatever its extension."""
+        path = self._write("notes.txt", 'exec.Command("ls")\n')
+        
+        result = CodeSecurityValidator().validate_file(path, "go")
+        
+        self.assertNotIn("skipped", result)
+        self.assertEqual(result["total_issues"], 1)
+    
+    def test_extensionless_file_uses_shebang(self):
+        """An extensionless script is validated only with a matching shebang."""
+        script = self._write("tool", "#!/usr/bin/env python3\neval(x)\n")
+        other = self._write("data", "eval(x)\n")
+        validator = CodeSecurityValidator(strict_extensions=True)
+        
+        self.assertFalse(validator.validate_file(script, "python")["passed"])
+        self.assertTrue(validator.validate_file(other, "python")["skipped"])
+    
+    def test_matching_extension_is_case_insensitive(self):
+        """Upper case extensions still match their language."""
+        path = self._write("MAIN.CC", 'system("ls");\n')
+        
+        result = CodeSecurityValidator(strict_extensions=True).validate_file(path, "cpp")
+        
+        self.assertFalse(result["passed"])
+
+
+class TestOverlappingPatterns(unittest.TestCase):
+    """A match of one pattern must not hide an overlapping match of another."""
+    
+    def setUp(self):
+        self.validator = CodeSecurityValidator()
+    
+    def test_cpp_system_call_inside_bracket_expression(self):
+        """system( inside a pointer arithmetic bracket is still high severity."""
+        issues = self.validator.validate_generic_code(
+            'int f() { return arr[system("rm -rf /") + 1]; }\n', "cpp")
+        
+        self.assertEqual(_findings(issues), [
+            (r'\[\s*[^]]*\s*\+[^]]*\]', '[system("rm -rf /") + 1]', 1, "low"),
+            (r'system\s*\(', 'system(', 1, "high"),
+        ])
+    
+    def test_typescript_eval_inside_set_timeout_string(self):
+        """eval( inside a setTimeout string is still high severity."""
+        issues = self.validator.validate_generic_code(
+            "setTimeout('eval(payload)', 10);\n", "typescript")
+        
+        self.assertEqual(_findings(issues), [
+            (r'eval\s*\(', 'eval(', 1, "high"),
+            (r'setTimeout\s*\([\'"][^\'"]*[\'"]', "setTimeout('eval(payload)'", 1, "low"),
+        ])
+    
+    def test_fail_fast_finds_overlapped_high_severity_match(self):
+        """The fail-fast scan stops at the hidden high severity match."""
+        issues = self.validator.validate_generic_code(
+            "setTimeout('eval(payload)', 10);\n", "typescript", early_exit=True)
+        
+        self.assertEqual([issue.severity for issue in issues], ["high"])
+        self.assertEqual(issues[0].pattern, r'eval\s*\(')
+    
+    def test_fail_fast_scans_high_severity_patterns_first(self):
+        """Low severity patterns listed earlier are not scanned first."""
+        issues = self.validator.validate_generic_code(
+            'strcpy(buf, src);\nsystem("ls");\n', "cpp", early_exit=True)
+        
+        self.assertEqual(_findings(issues), [(r'system\s*\(', 'system(', 2, "high")])
+    
+    def test_overlapping_python_patterns_without_ast(self):
+        """Unparseable Python falls back to every pattern, overlaps included."""
+        issues = self.validator.validate_python_code("open('eval(/etc/passwd')\nif\n")
+        
+        patterns = {issue.pattern for issue in issues if issue.type == "dangerous_pattern"}
+        self.assertEqual(patterns, {r'eval\s*\(', r'open\s*\([\'"][^\'"]*/etc/'})
+
+
+class TestResultCache(unittest.TestCase):
+    """Per-file result caching is opt-in and bounded."""
+    
+    def setUp(self):
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.addCleanup(self.temp_dir.cleanup)
+        self.root = Path(self.temp_dir.name)
+        self.cache_dir = self.root / "cache"
+        self.source = self.root / "a.go"
+        self.source.write_text('package a\nfunc f() { exec.Command("ls") }\n')
+    
+    def test_no_cache_by_default(self):
+        """Without a cache directory nothing is written outside the outputs."""
+        validator = CodeSecurityValidator()
+        
+        self.assertIsNone(validator.cache_dir)
+        result = validator.validate_file(str(self.source), "go")
+        self.assertEqual(result["total_issues"], 1)
+        self.assertEqual(validator.prune_cache(), 0)
+    
+    def test_cache_hit_and_content_change(self):
+        """An unchanged file is served from the cache; a change misses it."""
+        validator = CodeSecurityValidator(cache_dir=self.cache_dir)
+        first = validator.validate_file(str(self.source), "go")
+        
+        with patch.object(validator, "validate_generic_code") as scan:
+            cached = validator.validate_file(str(self.source), "go")
+            scan.assert_not_called()
+        self.assertEqual(_findings(cached["issues"]), _findings(first["issues"]))
+        
+        self.source.write_text('package a\nfunc f() { http.Get(u); net.Dial(a) }\n')
+        changed = validator.validate_file(str(self.source), "go")
+        
+        self.assertEqual(sorted(issue.pattern for issue in changed["issues"]),
+                         sorted([r'http\.Get', r'net\.Dial']))
+        self.assertEqual(len(list(self.cache_dir.iterdir())), 2)
+    
+    def test_cache_hit_reports_the_requested_path(self):
+        """Identical content at another path reports that path."""
+        self.source.write_text("")
+        copy = self.root / "b.go"
+        copy.write_text("")
+        validator = CodeSecurityValidator(cache_dir=self.cache_dir)
+        validator.validate_file(str(self.source), "go")
+        
+        result = validator.validate_file(str(copy), "go")
+        
+        self.assertEqual([issue.file_path for issue in result["issues"]], [str(copy)])
+    
+    def test_cache_is_keyed_on_language_and_mode(self):
+        """The same content validated as another language is not a hit."""
+        validator = CodeSecurityValidator(cache_dir=self.cache_dir)
+        validator.validate_file(str(self.source), "go")
+        
+        result = validator.validate_file(str(self.source), "cpp")
+        
+        self.assertEqual(result["total_issues"], 0)
+    
+    def test_prune_removes_entries_past_max_age(self):
+        """Entries unused for longer than max_age are evicted."""
+        validator = CodeSecurityValidator(cache_dir=self.cache_dir)
+        validator.validate_file(str(self.source), "go")
+        entries = list(self.cache_dir.iterdir())
+        self.assertEqual(len(entries), 1)
+        
+        old = time.time() - 3600
+        os.utime(entries[0], (old, old))
+        
+        self.assertEqual(validator.prune_cache(max_age=60), 1)
+        self.assertEqual(list(self.cache_dir.iterdir()), [])
+    
+    def test_prune_keeps_most_recently_used_entries_within_size(self):
+        """Over the size limit, the least recently used entries go first."""
+        validator = CodeSecurityValidator(cache_dir=self.cache_dir)
+        sources = []
+        for i in range(3):
+            source = self.root / f"f{i}.go"
+            source.write_text(f'package f{i}\nfunc f() {{ exec.Command("{i}") }}\n')
+            validator.validate_file(str(source), "go")
+            sources.append(source)
+        
+        entries = sorted(self.cache_dir.iterdir())
+        now = time.time()
+        for age, entry in enumerate(entries):
+            os.utime(entry, (now - 100 * (age + 1), now - 100 * (age + 1)))
+        # A cache hit marks the entry as recently used
+        validator.validate_file(str(sources[0]), "go")
+        
+        entry_size = entries[0].stat().st_size
+        validator.prune_cache(max_bytes=entry_size)
+        
+        expected = validator._cache_path(sources[0].read_bytes(), "go", False)
+        self.assertEqual(list(self.cache_dir.iterdir()), [expected])
+
+
+if __name__ == "__main__":
+    unittest.main()
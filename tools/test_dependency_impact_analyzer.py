@@ -0,0 +1,292 @@
+#!/usr/bin/env python3
+"""
+Test suite for the dependency impact analyzer.
+"""
+
+import json
+import os
+import shutil
+import sqlite3
+import sys
+import tempfile
+import unittest
+from dataclasses import asdict
+from pathlib import Path
+from unittest.mock import patch
+
+# The analyzer uses package-relative imports
+repo_root = Path(__file__).parent.parent
+sys.path.insert(0, str(repo_root))
+
+try:
+    from tools.dependency_impact_analyzer import (
+        DependencyImpactAnalyzer, ServiceDependency, _toposort
+    )
+    IMPORTS_AVAILABLE = True
+except ImportError as e:
+    print(f"Import error: {e}")
+    IMPORTS_AVAILABLE = False
+
+
+def _dependency(name: str, **kwargs) -> "ServiceDependency":
+    """Build a direct consumer dependency for a service."""
+    defaults = {
+        "service_repository": f"github.com/acme/{name}",
+        "dependency_type": "direct",
+        "usage_pattern": "consumer",
+    }
+    defaults.update(kwargs)
+    return ServiceDependency(service_name=name, **defaults)
+
+
+class AnalyzerTestCase(unittest.TestCase):
+    """Base class creating an analyzer over a temporary storage directory."""
+    
+    def setUp(self):
+        """Set up test environment."""
+        if not IMPORTS_AVAILABLE:
+            self.skipTest("Required imports not available")
+        
+        self.temp_dir = Path(tempfile.mkdtemp())
+        self.storage_dir = self.temp_dir / "analysis"
+    
+    def tearDown(self):
+        """Clean up test environment."""
+        shutil.rmtree(self.temp_dir, ignore_errors=True)
+    
+    def make_analyzer(self) -> "DependencyImpactAnalyzer":
+        """Create an analyzer; the collaborators are unused by these tests."""
+        return DependencyImpactAnalyzer(
+            storage_dir=self.storage_dir,
+            team_manager=object(),
+            breaking_change_detector=object(),
+            bsr_authenticator=object()
+        )
+
+
+class TestDependencyStorage(AnalyzerTestCase):
+    """Test persisting dependencies in deps.db and importing legacy JSON."""
+    
+    def test_round_trip(self):
+        """Test that registered dependencies survive a reload in order."""
+        analyzer = self.make_analyzer()
+        analyzer.register_service_dependency("buf.build/acme/api", _dependency("billing"))
+        analyzer.register_service_dependency("buf.build/acme/api", _dependency("orders", team_owner="shop"))
+        analyzer.register_service_dependency(
+            "buf.build/acme/api", _dependency("billing", dependency_strength="critical")
+        )
+        
+        reloaded = self.make_analyzer().dependency_registry
+        self.assertEqual(list(reloaded), ["buf.build/acme/api"])
+        self.assertEqual(
+            [(dep.service_name, dep.dependency_strength, dep.team_owner)
+             for dep in reloaded["buf.build/acme/api"]],
+            [("billing", "critical", None), ("orders", "medium", "shop")]
+        )
+    
+    def test_legacy_registry_import(self):
+        """Test that a legacy JSON registry is moved into the database."""
+        self.storage_dir.mkdir()
+        legacy = {
+            "buf.build/acme/api": [asdict(_dependency("billing")), asdict(_dependency("orders"))],
+            "buf.build/acme/events": [asdict(_dependency("audit"))],
+        }
+        (self.storage_dir / "dependency_registry.json").write_text(json.dumps(legacy))
+        
+        analyzer = self.make_analyzer()
+        
+        self.assertFalse((self.storage_dir / "dependency_registry.json").exists())
+        self.assertEqual(
+            {target: [dep.service_name for dep in deps]
+             for target, deps in analyzer.dependency_registry.items()},
+            {"buf.build/acme/api": ["billing", "orders"], "buf.build/acme/events": ["audit"]}
+        )
+        self.assertEqual(
+            [dep.service_name for dep in self.make_analyzer().dependency_registry["buf.build/acme/api"]],
+            ["billing", "orders"]
+        )
+    
+    def test_unreadable_legacy_registry_is_kept(self):
+        """Test that a legacy registry that fails to parse is backed up, not deleted."""
+        self.storage_dir.mkdir()
+        (self.storage_dir / "dependency_registry.json").write_text('{"buf.build/acme/api": [')
+        
+        with self.assertLogs("tools.dependency_impact_analyzer", level="ERROR"):
+            analyzer = self.make_analyzer()
+        
+        self.assertEqual(analyzer.dependency_registry, {})
+        self.assertFalse((self.storage_dir / "dependency_registry.json").exists())
+        self.assertEqual(
+            (self.storage_dir / "dependency_registry.json.bak").read_text(),
+            '{"buf.build/acme/api": ['
+        )
+    
+    def test_connections_are_closed(self):
+        """Test that storage access closes every connection it opens."""
+        opened = []
+        connect = sqlite3.connect
+        
+        def _tracking_connect(*args, **kwargs):
+            conn = connect(*args, **kwargs)
+            opened.append(conn)
+            return conn
+        
+        with patch.object(sqlite3, "connect", side_effect=_tracking_connect):
+            analyzer = self.make_analyzer()
+            analyzer.register_service_dependency("buf.build/acme/api", _dependency("billing"))
+        
+        self.assertEqual(len(opened), 3)
+        for conn in opened:
+            with self.assertRaises(sqlite3.ProgrammingError):
+                conn.execute("SELECT 1")
+    
+    def test_saves_preserve_file_mode(self):
+        """Test that atomic saves keep the permissions of existing files."""
+        analyzer = self.make_analyzer()
+        catalog_file = analyzer.service_catalog_file
+        os.chmod(catalog_file, 0o640)
+        
+        analyzer.register_service("billing", {"schema_dependencies": []})
+        
+        self.assertEqual(catalog_file.stat().st_mode & 0o777, 0o640)
+        self.assertIn("billing", json.loads(catalog_file.read_text()))
+
+
+class TestAnalysisCache(AnalyzerTestCase):
+    """Test memoized analysis results."""
+    
+    def setUp(self):
+        """Register a schema with a single consumer."""
+        super().setUp()
+        self.analyzer = self.make_analyzer()
+        self.analyzer.register_service_dependency("buf.build/acme/api", _dependency("billing"))
+    
+    def test_register_dependency_invalidates(self):
+        """Test that new dependencies show up in later analyses."""
+        before = self.analyzer.identify_affected_services("buf.build/acme/api")
+        self.analyzer.register_service_dependency("buf.build/acme/api", _dependency("orders"))
+        after = self.analyzer.identify_affected_services("buf.build/acme/api")
+        
+        self.assertEqual([s["service_name"] for s in before], ["billing"])
+        self.assertEqual(sorted(s["service_name"] for s in after), ["billing", "orders"])
+    
+    def test_register_service_invalidates(self):
+        """Test that catalog changes show up in later dependency graphs."""
+        self.analyzer.register_service_dependency("buf.build/acme/events", _dependency("audit"))
+        graph = self.analyzer.analyze_dependency_graph("buf.build/acme/api")
+        self.assertEqual(graph.transitive_dependencies, [])
+        
+        self.analyzer.register_service("billing", {"schema_dependencies": ["buf.build/acme/events"]})
+        graph = self.analyzer.analyze_dependency_graph("buf.build/acme/api")
+        
+        self.assertEqual([dep.service_name for dep in graph.transitive_dependencies], ["audit"])
+        self.assertEqual(graph.dependency_matrix["billing"], ["buf.build/acme/events"])
+    
+    def test_repeat_calls_share_results(self):
+        """Test that memoized results are reused without deep copies."""
+        graph = self.analyzer.analyze_dependency_graph("buf.build/acme/api")
+        self.assertIs(self.analyzer.analyze_dependency_graph("buf.build/acme/api"), graph)
+        self.assertIsNot(graph.direct_dependencies, self.analyzer.dependency_registry["buf.build/acme/api"])
+        
+        services = self.analyzer.identify_affected_services("buf.build/acme/api")
+        services.append({"service_name": "intruder"})
+        again = self.analyzer.identify_affected_services("buf.build/acme/api")
+        self.assertEqual([s["service_name"] for s in again], ["billing"])
+        self.assertIs(again[0], services[0])
+
+
+class TestTopologicalOrder(unittest.TestCase):
+    """Test ordering dependency matrices."""
+    
+    def test_acyclic(self):
+        """Test that every node precedes the nodes it points to."""
+        matrix = {"api": ["billing", "orders"], "billing": ["events"], "orders": ["events"], "events": []}
+        order = _toposort(matrix)
+        
+        self.assertEqual(sorted(order), sorted(matrix))
+        for node, edges in matrix.items():
+            for target in edges:
+                self.assertLess(order.index(node), order.index(target))
+    
+    def test_cycle(self):
+        """Test that cycles are broken deterministically and every node is placed once."""
+        matrix = {"s": ["a", "b"], "a": ["s2"], "b": ["s"], "s2": ["a"]}
+        
+        self.assertEqual(_toposort(matrix), ["s", "b", "a", "s2"])
+        self.assertEqual(_toposort({"x": ["y"], "y": ["x"]}), ["x", "y"])
+    
+    def test_edges_to_unlisted_nodes(self):
+        """Test that edge targets without their own row are still placed."""
+        self.assertEqual(_toposort({"api": ["billing"]}), ["api", "billing"])
+
+
+class TestDependencyLookups(AnalyzerTestCase):
+    """Test transitive and reverse dependency lookups."""
+    
+    def setUp(self):
+        """Create an analyzer for lookups."""
+        super().setUp()
+        self.analyzer = self.make_analyzer()
+    
+    def test_transitive_dependencies_deduplicated(self):
+        """Test that services reachable several ways are reported once."""
+        analyzer = self.analyzer
+        analyzer.register_service_dependency("buf.build/acme/api", _dependency("billing"))
+        analyzer.register_service_dependency("buf.build/acme/api", _dependency("orders"))
+        analyzer.register_service_dependency("buf.build/acme/events", _dependency("audit"))
+        analyzer.register_service_dependency("buf.build/acme/events", _dependency("orders"))
+        analyzer.register_service_dependency("buf.build/acme/ledger", _dependency("audit"))
+        analyzer.register_service(
+            "billing", {"schema_dependencies": ["buf.build/acme/events", "buf.build/acme/ledger"]}
+        )
+        analyzer.register_service("orders", {"schema_dependencies": ["buf.build/acme/events"]})
+        
+        graph = analyzer.analyze_dependency_graph("buf.build/acme/api")
+        
+        # orders depends directly, so it is not repeated as transitive
+        self.assertEqual(
+            [(dep.service_name, dep.dependency_type) for dep in graph.transitive_dependencies],
+            [("audit", "transitive")]
+        )
+        self.assertEqual(graph.analysis_metadata["total_affected_services"], 3)
+    
+    def test_reverse_lookup_is_exact(self):
+        """Test that reverse dependencies match names and repositories exactly."""
+        analyzer = self.analyzer
+        analyzer.register_service_dependency(
+            "buf.build/acme/orders-api",
+            _dependency("payments", service_repository="buf.build/acme/api")
+        )
+        analyzer.register_service_dependency("buf.build/acme/billing-api", _dependency("api"))
+        analyzer.register_service_dependency(
+            "buf.build/acme/other", _dependency("api-gateway", service_repository="buf.build/acme/api-v2")
+        )
+        
+        reverse = analyzer.analyze_dependency_graph("buf.build/acme/api").reverse_dependencies
+        self.assertEqual([dep.service_name for dep in reverse], ["buf.build/acme/orders-api"])
+        
+        reverse = analyzer.analyze_dependency_graph("api").reverse_dependencies
+        self.assertEqual([dep.service_name for dep in reverse], ["buf.build/acme/billing-api"])
+    
+    def test_reverse_index_follows_updates(self):
+        """Test that re-registering a dependency replaces its reverse index entry."""
+        analyzer = self.analyzer
+        analyzer.register_service_dependency(
+            "buf.build/acme/orders-api",
+            _dependency("payments", service_repository="buf.build/acme/api")
+        )
+        analyzer.register_service_dependency(
+            "buf.build/acme/orders-api",
+            _dependency("payments", service_repository="buf.build/acme/payments")
+        )
+        
+        self.assertEqual(analyzer.analyze_dependency_graph("buf.build/acme/api").reverse_dependencies, [])
+        self.assertEqual(
+            [dep.service_name for dep in
+             analyzer.analyze_dependency_graph("buf.build/acme/payments").reverse_dependencies],
+            ["buf.build/acme/orders-api"]
+        )
+
+
+if __name__ == "__main__":
+    unittest.main()
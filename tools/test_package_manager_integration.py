@@ -6,7 +6,9 @@ This script tests the complete package manager → ORAS → HTTP fallback strate
 for protoc plugin installation.
 """
 
+import json
 import os
+import subprocess
 import sys
 import tempfile
 import unittest
@@ -20,7 +22,7 @@ sys.path.insert(0, str(current_dir))
 try:
     from package_manager_detector import PackageManagerDetector, PackageManagerInfo
     from package_manager_base import PluginSpec, InstallationResult, BasePackageManagerInstaller
-    from cargo_plugin_installer import CargoPluginInstaller
+    from cargo_plugin_installer import CargoPluginInstaller, _needs_registry_access
     from npm_plugin_installer import NPMPluginInstaller
     from oras_plugins import PluginOrasDistributor
     IMPORTS_AVAILABLE = True
@@ -92,6 +94,11 @@ class TestCargoIntegration(unittest.TestCase):
         
         self.temp_dir = tempfile.mkdtemp()
         self.installer = CargoPluginInstaller(self.temp_dir, verbose=True)
+
+        # Keep Cargo lookups away from the real $CARGO_HOME
+        env_patcher = patch.dict(os.environ, {"CARGO_HOME": os.path.join(self.temp_dir, "cargo-home")})
+        env_patcher.start()
+        self.addCleanup(env_patcher.stop)
     
     def tearDown(self):
         """Clean up test environment."""
@@ -124,6 +131,230 @@ class TestCargoIntegration(unittest.TestCase):
         for plugin in plugins:
             print(f"  - {plugin['name']}: {plugin['description']}")
 
+    def test_install_plugins_batch(self):
+        """Test that crates.io plugins share one cargo install run."""
+        commands = []
+
+        def fake_run(command, cwd=None, timeout=300, env=None):
+            commands.append(command)
+            return True, "", ""
+
+        specs = [
+            PluginSpec(name="prost-build", version="0.12.3"),
+            PluginSpec(name="protobuf-codegen", version="3.4.0"),
+            PluginSpec(name="buf-build-connect-rs", version="0.1.0"),
+            PluginSpec(name="not-a-plugin", version="1.0.0"),
+        ]
+
+        with patch.object(self.installer, "run_command_safely", side_effect=fake_run), \
+             patch.object(self.installer, "_run_streaming",
+                          side_effect=lambda command, timeout: fake_run(command)), \
+             patch.object(self.installer, "find_installed_binary",
+                          side_effect=lambda name: Path("/fake/bin") / name):
+            results = self.installer.install_plugins_batch(specs)
+
+        self.assertEqual([r.success for r in results], [True, True, True, False])
+        self.assertEqual(results[0].binary_path, Path("/fake/bin/protoc-gen-prost"))
+        self.assertIsNone(results[0].wrapper_path)
+
+        install_commands = [c for c in commands if c[:2] == ["cargo", "install"] and "--list" not in c]
+        self.assertEqual(len(install_commands), 2)
+        self.assertEqual(install_commands[0],
+                         ["cargo", "install", "--force", "--offline", "prost-build@0.12.3", "protobuf-codegen@3.4.0"])
+        self.assertIn("--git", install_commands[1])
+
+        # The installed crates are listed once up front
+        self.assertEqual(commands.count(["cargo", "install", "--list"]), 1)
+
+    def test_install_plugins_batch_offline_fallback(self):
+        """Test that crates missing from the local cache are fetched online."""
+        commands = []
+        installed = {}
+
+        def fake_run(command, cwd=None, timeout=300, env=None):
+            commands.append(command)
+            if "--list" in command:
+                return True, "".join(f"{name} v{version}:\n" for name, version in installed.items()), ""
+            if "--offline" in command:
+                installed["prost-build"] = "0.12.3"
+                return False, "", "error: could not find `protobuf-codegen` in registry `crates-io`"
+            installed["protobuf-codegen"] = "3.4.0"
+            return True, "", ""
+
+        specs = [
+            PluginSpec(name="prost-build", version="0.12.3"),
+            PluginSpec(name="protobuf-codegen", version="3.4.0"),
+        ]
+
+        with patch.object(self.installer, "run_command_safely", side_effect=fake_run), \
+             patch.object(self.installer, "_run_streaming",
+                          side_effect=lambda command, timeout: fake_run(command)), \
+             patch.object(self.installer, "find_installed_binary",
+                          side_effect=lambda name: Path("/fake/bin") / name if installed else None):
+            results = self.installer.install_plugins_batch(specs)
+
+        self.assertTrue(all(r.success for r in results))
+        install_commands = [c for c in commands if "--list" not in c]
+        self.assertEqual(install_commands, [
+            ["cargo", "install", "--force", "--offline", "prost-build@0.12.3", "protobuf-codegen@3.4.0"],
+            ["cargo", "install", "--force", "protobuf-codegen@3.4.0"],
+        ])
+
+    def test_offline_retry_only_on_cache_miss(self):
+        """Test that only cargo's offline cache-miss errors trigger an online retry."""
+        offline = ["cargo", "install", "--offline", "prost-build"]
+        misses = [
+            "error: could not find `prost-build` in registry `crates-io` with version `=0.12.3`",
+            "error: no matching package named `prost` found",
+            "error: failed to load source for dependency `prost`\n"
+            "Caused by: attempting to make an HTTP request, but --offline was specified",
+        ]
+        for stderr in misses:
+            self.assertTrue(_needs_registry_access(offline, stderr), stderr)
+
+        self.assertFalse(_needs_registry_access(offline, "error: linking with `cc` failed: offline build"))
+        self.assertFalse(_needs_registry_access(offline[:2] + offline[3:], misses[0]))
+
+    def test_run_streaming_replaces_undecodable_output(self):
+        """Test that non-UTF-8 cargo output does not abort the run."""
+        command = [sys.executable, "-c", "import sys; sys.stdout.buffer.write(b'bad \\xff byte'); sys.exit(1)"]
+        self.assertEqual(self.installer._run_streaming(command, timeout=30), (False, "", "bad \ufffd byte"))
+
+    def test_run_streaming_kills_process_on_error(self):
+        """Test that cargo is not left running when reading its output fails."""
+        procs = []
+        popen = subprocess.Popen
+
+        def _tracking_popen(*args, **kwargs):
+            procs.append(popen(*args, **kwargs))
+            return procs[-1]
+
+        command = ["sh", "-c", "echo started; sleep 30"]
+        with patch("subprocess.Popen", side_effect=_tracking_popen), \
+             patch.object(self.installer, "log", side_effect=[None, RuntimeError("log failed")]):
+            with self.assertRaises(RuntimeError):
+                self.installer._run_streaming(command, timeout=30)
+
+        self.assertIsNotNone(procs[0].poll())
+
+    def test_installed_crates_cache(self):
+        """Test that cargo install --list runs once until something changes."""
+        listing = "prost-build v0.12.3:\n    protoc-gen-prost\n"
+
+        with patch.object(self.installer, "run_command_safely",
+                          return_value=(True, listing, "")) as run:
+            self.assertEqual(self.installer.get_installed_crates(), {"prost-build": "0.12.3"})
+            self.installer.get_installed_crates()
+            self.assertEqual(run.call_count, 1)
+
+            self.installer.get_installed_crates(force_refresh=True)
+            self.assertEqual(run.call_count, 2)
+
+            self.installer.uninstall_plugin("prost-build", "0.12.3")
+            self.installer.get_installed_crates()
+            self.assertEqual(run.call_count, 4)
+
+    def test_installed_crates_from_crates2_json(self):
+        """Test reading installed crates from Cargo's tracking file."""
+        cargo_home = Path(os.environ["CARGO_HOME"])
+        cargo_home.mkdir(parents=True)
+        (cargo_home / ".crates2.json").write_text(json.dumps({"installs": {
+            "prost-build 0.12.3 (registry+https://github.com/rust-lang/crates.io-index)": {},
+            "buf-build-connect-rs 0.1.0 (git+https://github.com/bufbuild/connect-rust#abc)": {},
+        }}))
+
+        with patch.object(self.installer, "run_command_safely") as run:
+            self.assertEqual(self.installer.get_installed_crates(),
+                             {"prost-build": "0.12.3", "buf-build-connect-rs": "0.1.0"})
+            run.assert_not_called()
+
+    def test_update_plugin_up_to_date(self):
+        """Test that updating to the installed version does not run cargo install."""
+        with patch.object(self.installer, "get_installed_crates",
+                          return_value={"prost-build": "0.12.3"}), \
+             patch.object(self.installer, "find_installed_binary",
+                          return_value=Path("/fake/bin/protoc-gen-prost")), \
+             patch.object(self.installer, "install_plugins_batch") as install:
+            result = self.installer.update_plugin("prost-build", "0.12.3")
+
+        self.assertTrue(result.success)
+        self.assertEqual(result.method, "cargo_existing")
+        install.assert_not_called()
+
+    def test_list_installed_plugins_without_wrappers(self):
+        """Test that plugins installed without wrappers report Cargo's binary."""
+        spec = PluginSpec(name="prost-build", version="0.12.3")
+        self.installer.get_install_dir(spec).mkdir(parents=True)
+
+        with patch.object(self.installer, "find_installed_binary",
+                          return_value=Path("/fake/bin/protoc-gen-prost")) as find:
+            plugins = self.installer.list_installed_plugins()
+
+        self.assertEqual([(p["name"], p["version"], p["binary_path"]) for p in plugins],
+                         [("prost-build", "0.12.3", "/fake/bin/protoc-gen-prost")])
+        find.assert_called_once_with("protoc-gen-prost")
+
+    def test_update_plugin_up_to_date_creates_wrapper(self):
+        """Test that an up-to-date update still creates the requested wrapper."""
+        self.installer.create_wrappers = True
+        with patch.object(self.installer, "get_installed_crates",
+                          return_value={"prost-build": "0.12.3"}), \
+             patch.object(self.installer, "find_installed_binary",
+                          return_value=Path("/fake/bin/protoc-gen-prost")):
+            result = self.installer.update_plugin("prost-build", "0.12.3")
+
+        self.assertEqual(result.method, "cargo_existing")
+        self.assertIsNotNone(result.wrapper_path)
+        self.assertIn("/fake/bin/protoc-gen-prost", Path(result.wrapper_path).read_text())
+
+    def test_is_plugin_installed_without_binary(self):
+        """Test that a missing binary skips the cargo crate listing."""
+        spec = PluginSpec(name="prost-build", version="0.12.3")
+
+        with patch.object(self.installer, "find_installed_binary", return_value=None), \
+             patch.object(self.installer, "run_command_safely") as run:
+            self.assertIsNone(self.installer.is_plugin_installed(spec))
+            run.assert_not_called()
+
+    def test_find_installed_binary_cache(self):
+        """Test that binary lookups are cached until the bin directory changes."""
+        cargo_home = Path(self.temp_dir) / "cargo-home"
+        bin_dir = cargo_home / "bin"
+        bin_dir.mkdir(parents=True)
+        (bin_dir / "protoc-gen-prost").write_text("")
+
+        with patch.dict(os.environ, {"CARGO_HOME": str(cargo_home)}):
+            self.assertEqual(self.installer.find_installed_binary("protoc-gen-prost"),
+                             bin_dir / "protoc-gen-prost")
+
+            with patch("os.scandir") as scandir:
+                self.installer.find_installed_binary("protoc-gen-prost")
+                scandir.assert_not_called()
+
+            (bin_dir / "protoc-gen-prost").unlink()
+            os.utime(bin_dir, ns=(0, 0))
+            self.assertNotEqual(self.installer.find_installed_binary("protoc-gen-prost"),
+                                bin_dir / "protoc-gen-prost")
+
+    def test_resolve_executable(self):
+        """Test that only bare names run in our own directory are resolved."""
+        with patch("shutil.which", return_value="/usr/bin/cargo") as which:
+            self.assertEqual(self.installer._resolve_executable("cargo"), "/usr/bin/cargo")
+            self.assertEqual(self.installer._resolve_executable("cargo", cwd=Path(self.temp_dir)), "cargo")
+            self.assertEqual(self.installer._resolve_executable("./cargo"), "./cargo")
+            self.assertEqual(self.installer._resolve_executable("bin/cargo"), "bin/cargo")
+            self.assertEqual(which.call_count, 1)
+
+    def test_run_command_relative_to_cwd(self):
+        """Test that a relative program path is looked up in the command's cwd."""
+        script = Path(self.temp_dir) / "tool.sh"
+        script.write_text("#!/bin/sh\necho from-cwd\n")
+        script.chmod(0o755)
+
+        success, stdout, _ = self.installer.run_command_safely(["./tool.sh"], cwd=Path(self.temp_dir))
+        self.assertTrue(success)
+        self.assertEqual(stdout, "from-cwd")
+
 
 class TestNPMIntegration(unittest.TestCase):
     """Test NPM plugin installer."""